@@ -0,0 +1,61 @@
+# src/benchmarks/sim_step.py
+"""
+Headless fixed-step simülasyon hızını ölçer: World.step(n) gerçek zamandan
+bağımsız, olabildiğince hızlı koşar. Display / pygame saati gerekmez.
+
+Kullanım (src klasöründen):
+    python -m benchmarks.sim_step
+    python -m benchmarks.sim_step --ticks 20000 --seed 7
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import random
+import time
+
+from core.config import GameConfig
+from model.world import World
+
+
+def run_ticks(config: GameConfig, ticks: int, seed: int) -> tuple[float, World]:
+    """
+    Sabit seed'le bir World kurup ticks kadar adım atar; player'lar her
+    saniye rastgele yön değiştirir. (geçen süre sn, world) döner.
+    """
+    random.seed(seed)
+    # World debug print'leri ölçümü kirletmesin
+    with contextlib.redirect_stdout(io.StringIO()):
+        world = World(config)
+        turn_every = world.tick_rate
+        dirs = [(1, 0), (-1, 0), (0, 1), (0, -1), (0, 0)]
+
+        t0 = time.perf_counter()
+        done = 0
+        while done < ticks:
+            for p in world.iter_players():
+                p.move_dir.update(*random.choice(dirs))
+            done += world.step(min(turn_every, ticks - done))
+        elapsed = time.perf_counter() - t0
+    return elapsed, world
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Headless World.step benchmark")
+    parser.add_argument("--ticks", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    config = GameConfig.get_instance()
+    elapsed, world = run_ticks(config, args.ticks, args.seed)
+
+    sim_seconds = world.tick / world.tick_rate
+    print(f"ticks={world.tick} sim={sim_seconds:.1f}s wall={elapsed:.3f}s "
+          f"-> {world.tick / elapsed:.0f} ticks/s ({sim_seconds / elapsed:.1f}x realtime)")
+    print(f"enemies={len(world.enemies)} walls={len(world.walls)} "
+          f"alive_players={world.alive_player_count()}")
+
+
+if __name__ == "__main__":
+    main()
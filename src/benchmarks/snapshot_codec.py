@@ -0,0 +1,108 @@
+# src/benchmarks/snapshot_codec.py
+"""
+SNAPSHOT encode/decode maliyetini JSON ve binary (bin5) codec için karşılaştırır:
+keyframe ve tipik bir delta (birkaç tick geride ack'lenmiş baseline) için frame başına
+süre ve byte.
+
+Kullanım (src klasöründen):
+    python -m benchmarks.snapshot_codec
+    python -m benchmarks.snapshot_codec --sizes 15x13 51x51 --ticks 300 --repeat 500
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import time
+
+from core.config import GameConfig
+from model.world import World
+from net.protocol import decode_payload
+from net.snapshot import SnapshotFrames
+from net.snapshot_delta import SnapshotHistory
+from net.snapshot_codec import CODEC_BINARY, CODEC_JSON
+
+
+DEFAULT_SIZES = ["15x13", "31x31", "51x51"]
+
+
+def _parse_size(text: str) -> tuple[int, int]:
+    w, h = text.lower().split("x")
+    return int(w), int(h)
+
+
+# Delta baseline'ı: client'ın ack'i bu kadar tick geride (≈ RTT)
+ACK_LAG = 6
+
+
+def _build_world(config: GameConfig, ticks: int) -> World:
+    # Boş olmayan bir snapshot için: birkaç bomba, patlama ve powerup birikene kadar koştur
+    with contextlib.redirect_stdout(io.StringIO()):
+        world = World(config)
+        for i in range(ticks):
+            if i % 30 == 0:
+                for p in world.players.values():
+                    if p.alive:
+                        world.place_bomb(p)
+            world.step(1)
+    return world
+
+
+def time_codec(frames: SnapshotFrames, codec: str, base, repeat: int) -> tuple[float, float, int]:
+    """(encode us/frame, decode us/frame, frame bytes) döner."""
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        frames._frames.clear()
+        frames.history._messages.clear()
+        frame = frames.frame(codec, base)
+    encode = (time.perf_counter() - t0) / repeat
+
+    payload = memoryview(frame)[4:]
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        decode_payload(payload)
+    decode = (time.perf_counter() - t0) / repeat
+    return encode * 1e6, decode * 1e6, len(frame)
+
+
+def _capture(config: GameConfig, ticks: int) -> tuple[SnapshotFrames, int]:
+    world = _build_world(config, ticks)
+    history = SnapshotHistory(world)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(ACK_LAG):
+            history.capture()
+            world.step(1)
+    state = history.capture()
+    return SnapshotFrames(history, state), state.seq - ACK_LAG
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="JSON vs binary snapshot codec benchmark (keyframe + delta)")
+    parser.add_argument("--sizes", nargs="+", default=DEFAULT_SIZES, help="GxH grid boyutları")
+    parser.add_argument("--ticks", type=int, default=240, help="snapshot alınmadan önce koşulan tick")
+    parser.add_argument("--repeat", type=int, default=300)
+    args = parser.parse_args()
+
+    config = GameConfig.get_instance()
+    old_w, old_h = config.GRID_WIDTH, config.GRID_HEIGHT
+
+    print(f"{'grid':>9} {'kind':>8} {'codec':>6} {'enc us':>9} {'dec us':>9} {'bytes':>8}")
+    try:
+        for text in args.sizes:
+            config.GRID_WIDTH, config.GRID_HEIGHT = _parse_size(text)
+            frames, base = _capture(config, args.ticks)
+            for kind, kind_base in (("keyframe", None), ("delta", base)):
+                results = {}
+                for codec in (CODEC_JSON, CODEC_BINARY):
+                    results[codec] = time_codec(frames, codec, kind_base, args.repeat)
+                    enc, dec, size = results[codec]
+                    print(f"{text:>9} {kind:>8} {codec:>6} {enc:9.1f} {dec:9.1f} {size:8d}")
+                j, b = results[CODEC_JSON], results[CODEC_BINARY]
+                print(f"{'':>9} {'':>8} {'ratio':>6} {j[0] / b[0]:8.1f}x {j[1] / b[1]:8.1f}x "
+                      f"{j[2] / b[2]:7.1f}x")
+    finally:
+        config.GRID_WIDTH, config.GRID_HEIGHT = old_w, old_h
+
+
+if __name__ == "__main__":
+    main()
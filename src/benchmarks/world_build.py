@@ -0,0 +1,68 @@
+# src/benchmarks/world_build.py
+"""
+World(config) kurulum süresini farklı grid boyutlarında ölçer.
+
+Kullanım (src klasöründen):
+    python -m benchmarks.world_build
+    python -m benchmarks.world_build --sizes 15x13 51x51 101x101 --repeat 20
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import time
+
+from core.config import GameConfig
+from model.world import World
+
+
+DEFAULT_SIZES = ["15x13", "31x31", "51x51", "101x101"]
+
+
+def _parse_size(text: str) -> tuple[int, int]:
+    w, h = text.lower().split("x")
+    return int(w), int(h)
+
+
+def time_world_build(config: GameConfig, gw: int, gh: int, repeat: int) -> tuple[list[float], int]:
+    """
+    Verilen grid boyutunda World'ü repeat kere kurar.
+    (süreler saniye cinsinden, son world'deki duvar sayısı) döner.
+    """
+    old_w, old_h = config.GRID_WIDTH, config.GRID_HEIGHT
+    config.GRID_WIDTH, config.GRID_HEIGHT = gw, gh
+    samples: list[float] = []
+    walls = 0
+    try:
+        for _ in range(repeat):
+            # World debug print'leri ölçümü kirletmesin
+            with contextlib.redirect_stdout(io.StringIO()):
+                t0 = time.perf_counter()
+                world = World(config)
+                samples.append(time.perf_counter() - t0)
+            walls = len(world.walls)
+    finally:
+        config.GRID_WIDTH, config.GRID_HEIGHT = old_w, old_h
+    return samples, walls
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="World(config) build benchmark")
+    parser.add_argument("--sizes", nargs="+", default=DEFAULT_SIZES, help="WxH, örn: 101x101")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    config = GameConfig.get_instance()
+
+    print(f"{'grid':>9} {'walls':>7} {'best ms':>9} {'mean ms':>9}")
+    for text in args.sizes:
+        gw, gh = _parse_size(text)
+        samples, walls = time_world_build(config, gw, gh, args.repeat)
+        best = min(samples) * 1000.0
+        mean = sum(samples) / len(samples) * 1000.0
+        print(f"{text:>9} {walls:>7} {best:>9.2f} {mean:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
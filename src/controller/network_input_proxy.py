@@ -1,30 +1,58 @@
 from __future__ import annotations
 import pygame
 from net.client import GameClient
+from net.input_command import DIR_DOWN, DIR_LEFT, DIR_RIGHT, DIR_UP
+
+
+_KEY_DIRS = {
+    pygame.K_w: DIR_UP, pygame.K_UP: DIR_UP,
+    pygame.K_s: DIR_DOWN, pygame.K_DOWN: DIR_DOWN,
+    pygame.K_a: DIR_LEFT, pygame.K_LEFT: DIR_LEFT,
+    pygame.K_d: DIR_RIGHT, pygame.K_RIGHT: DIR_RIGHT,
+}
 
 
 class NetworkInputProxy:
+    """
+    Client klavye input'unu server'a iletir.
+    Key event'leri frame boyunca biriktirilir (basılı tuşlar + bomba basıldı mı); yön maskesi
+    basılı tuşlardan türetilir, böylece aynı yönün iki tuşundan (W/UP) biri bırakılınca
+    diğeri basılıysa hareket sürer.
+    flush() frame başına en fazla bir CMD gönderir, değişiklik yoksa hiç göndermez. Gönderilmemiş
+    bir basış aynı frame'de bırakılırsa (tap) bırakmadan önce o basış ayrıca gönderilir.
+    """
+
     def __init__(self, client: GameClient):
         self.client = client
+        self._held: set[int] = set()
+        self._sent_dirs = 0
+        self._bomb = False
+
+    @property
+    def _dirs(self) -> int:
+        dirs = 0
+        for key in self._held:
+            dirs |= _KEY_DIRS[key]
+        return dirs
 
     def handle_event(self, event: pygame.event.Event) -> None:
         if event.type == pygame.KEYDOWN:
-            if event.key in (pygame.K_w, pygame.K_UP):
-                self.client.send_input("MOVE", {"dx": 0, "dy": -1})
-            elif event.key in (pygame.K_s, pygame.K_DOWN):
-                self.client.send_input("MOVE", {"dx": 0, "dy": 1})
-            elif event.key in (pygame.K_a, pygame.K_LEFT):
-                self.client.send_input("MOVE", {"dx": -1, "dy": 0})
-            elif event.key in (pygame.K_d, pygame.K_RIGHT):
-                self.client.send_input("MOVE", {"dx": 1, "dy": 0})
+            if event.key in _KEY_DIRS:
+                self._held.add(event.key)
             elif event.key == pygame.K_SPACE:
-                self.client.send_input("BOMB", {})
+                self._bomb = True
 
         elif event.type == pygame.KEYUP:
-            if event.key in (pygame.K_w, pygame.K_UP, pygame.K_s, pygame.K_DOWN):
-                self.client.send_input("STOP_MOVE", {"axis": "y"})
-            elif event.key in (pygame.K_a, pygame.K_LEFT, pygame.K_d, pygame.K_RIGHT):
-                self.client.send_input("STOP_MOVE", {"axis": "x"})
-                
-                
-        
\ No newline at end of file
+            if event.key in self._held:
+                # Tap: server basışı hiç görmeden bırakma gelmesin
+                self.flush()
+                self._held.discard(event.key)
+
+    def flush(self) -> None:
+        """Frame sonunda bir kez: biriken değişiklikleri tek komut olarak gönderir."""
+        dirs = self._dirs
+        if dirs == self._sent_dirs and not self._bomb:
+            return
+        self.client.send_command(dirs, self._bomb)
+        self._sent_dirs = dirs
+        self._bomb = False
@@ -29,6 +29,8 @@ class GameConfig:
         # Oyun ayarları
         # -------------------------
         self.FPS = 60
+        # Sabit simülasyon adımı (tick/sn); World render FPS'inden bağımsız bu hızda ilerler
+        self.TICK_RATE = 60
         self.PLAYER_SPEED = 4 * self.TILE_SIZE
 
         #bombalar
@@ -36,6 +38,9 @@ class GameConfig:
         self.MAX_BOMBS = 3
         self.BOMB_POWER=2 #Patlama menzili(tile sayısı)
         self.BOMB_DAMAGE=1 #Oyuncuya verilen hasar
+
+        # Enemy AI: danger map ile blast alanından kaçınma (BombAwareStrategy)
+        self.ENEMY_BOMB_AWARE = True
         
         # --- PowerUp ayarları ---
         self.POWERUP_SPAWN_CHANCE = 0.07        # %7 (0.35 çok fazlaydı)
@@ -52,6 +57,37 @@ class GameConfig:
 # Görsel küçültme (0.55 = tile’ın %55’i kadar çiz)
         self.POWERUP_DRAW_SCALE = 0.45
 
+        # -------------------------
+        # Level üretimi
+        # -------------------------
+        self.LEVEL_LAYOUT = "classic"           # "classic", "maze", "open_arena"
+        self.LEVEL_SEED = 0                     # None -> her oyunda farklı map
+        self.LEVEL_BREAKABLE_CHANCE = 0.45      # classic: boş tile'a kırılabilir duvar ihtimali
+        self.LEVEL_MAZE_LOOP_CHANCE = 0.1       # maze: ekstra açılan geçiş oranı
+        self.LEVEL_OPEN_BREAKABLE_CHANCE = 0.15 # open_arena: seyrek kırılabilir duvar
+        self.LEVEL_POOL_SIZE = 3                # LEVEL_SEED None iken önceden üretilen level sayısı
+        self.LEVEL_CACHE_SIZE = 32              # (layout, seed, w, h) -> LevelGrid cache boyutu
+
+        # -------------------------
+        # Room server (DP_MODE=rooms): tek process'te çok maç
+        # -------------------------
+        self.ROOM_SIZE = 2                      # room başına oyuncu (World 2 player kuruyor)
+        self.MAX_ROOMS = 256                    # aynı anda açık room sınırı
+
+        # -------------------------
+        # Ağ
+        # -------------------------
+        self.NET_SNAPSHOT_CODEC = "bin5"        # client'ın tercih ettiği snapshot codec'i ("bin5" / "json")
+        self.NET_SEND_RATE = 20                 # server'ın snapshot gönderme hızı (Hz); TICK_RATE'ten bağımsız
+        self.NET_INTERP_DELAY = 0.1             # client: entity'ler bu kadar geriden, snapshot'lar arası interpolasyonla çizilir (sn)
+        self.NET_SNAPSHOT_HISTORY = 64          # delta baseline'ı olarak saklanan son tick sayısı
+        self.NET_PREDICTION = True              # client: local player input'ları hemen uygulanır, snapshot'la uzlaştırılır
+        self.NET_SEND_QUEUE_SNAPSHOTS = 8       # server: client kuyruğunda birikebilecek snapshot; aşınca eskiler atılır
+        self.NET_SEND_QUEUE_MAX_BYTES = 1 << 20 # server: bunu aşan bekleyen veri -> client atılır
+        self.NET_SLOW_CLIENT_TIMEOUT = 5.0      # server: kuyruğu bu kadar süre boşalmayan client atılır (sn)
+        self.NET_UDP = False                    # snapshot + input için UDP kanalı (handshake / maç sonu TCP'de kalır)
+        self.NET_UDP_LOSS = 0.0                 # test: giden UDP datagram'larını bu olasılıkla düşür (localhost kayıp simülasyonu)
+
         # -------------------------
         # Aktif tema
         # -------------------------
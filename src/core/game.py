@@ -7,6 +7,7 @@ import os
 from typing import TYPE_CHECKING
 from core.config import GameConfig
 from model.world import World
+from model.level_cache import LevelPool
 from view.renderer import Renderer
 from data.users_repo import UsersRepo
 from data.preferences_repo import PreferencesRepo
@@ -67,11 +68,17 @@ class Game:
         self.net_proxy = None
 
         if self.mode == "server":
-            self.server = GameServer(self.net_host, self.net_port)
+            self.server = GameServer(self.net_host, self.net_port, self.config)
             self.server.start()  # 2 client bağlanana kadar bekler
   
         elif self.mode == "client":
-            self.client = GameClient(self.net_host, self.net_port)
+            self.client = GameClient(
+                self.net_host,
+                self.net_port,
+                codec=getattr(self.config, "NET_SNAPSHOT_CODEC", "bin5"),
+                udp=bool(getattr(self.config, "NET_UDP", False)),
+                udp_loss=float(getattr(self.config, "NET_UDP_LOSS", 0.0)),
+            )
             self.client.connect()
 
             self.player_id = getattr(self.client, "player_id", None)
@@ -126,8 +133,15 @@ class Game:
         self.clock = pygame.time.Clock()
         self.running = True
 
+        # Hazır level havuzu: maç restart'ında level yeniden üretilmez
+        self.level_pool = LevelPool(
+            self.config,
+            World.reserved_level_cells(self.config.GRID_WIDTH, self.config.GRID_HEIGHT),
+            size=int(getattr(self.config, "LEVEL_POOL_SIZE", 3)),
+        )
+
         # Model & View (PlayingState kullanacak)
-        self.world = World(self.config)
+        self.world = World(self.config, level=self.level_pool.take())
         self.renderer = Renderer(self.screen)
         self.command_invoker=CommandInvoker()
         self.command_mapper = CommandMapper()
@@ -158,7 +172,7 @@ class Game:
     
     def start_new_game(self) -> None:
         self.score = 0
-        self.world = World(self.config)
+        self.world = World(self.config, level=self.level_pool.take())
 
     def on_win(self) -> None:
         from states.win import WinState
@@ -184,6 +198,7 @@ class Game:
                 except Exception as e:
                     print("[Server] FATAL in update:", repr(e))
                     self.running = False
+            self.level_pool.close()
             pygame.quit()
             return
 
@@ -204,5 +219,6 @@ class Game:
             self.current_state.render(self.screen)
             pygame.display.flip()
             
+        self.level_pool.close()
         pygame.quit()
 
@@ -1,9 +1,17 @@
+import os
+
 from core.game import Game
 from data.db import init_db
 init_db()
 
 
 def main():
+    # Çok maçlı headless server: pygame ekranı / Game state'leri yok
+    if os.environ.get("DP_MODE") == "rooms":
+        from net.room_server import RoomServer
+        RoomServer.from_env().serve_forever()
+        return
+
     game = Game()
     game.run()
 
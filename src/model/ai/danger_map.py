@@ -0,0 +1,100 @@
+# src/model/ai/danger_map.py
+from __future__ import annotations
+
+import heapq
+import math
+from typing import TYPE_CHECKING
+
+from model.grid_changes import GridChange, GridChangeKind
+
+if TYPE_CHECKING:
+    from model.world import World
+
+
+GridPos = tuple[int, int]
+
+
+class DangerMap:
+    """
+    Canlı bombalardan tile -> patlama anı (World.time cinsinden) haritası.
+    - Blast alanı bombanın kendi ExplosionStrategy'si ile hesaplanır (resolver ile aynı)
+    - Zincirleme: başka bir bombanın blast'ına giren bomba daha erken patlar
+    - Mutlak zaman tutulduğu için sadece bomba/duvar değişince yeniden hesaplanır;
+      aradaki tick'lerde sorgu = dict lookup + çıkarma. Enemy başına simülasyon yok.
+    """
+
+    def __init__(self, world: "World"):
+        self.world = world
+        self._detonate_at: dict[GridPos, float] = {}
+        self._dirty = True
+        world.grid_changes.subscribe(self._on_grid_change)
+
+    def _on_grid_change(self, change: GridChange) -> None:
+        if change.kind not in (GridChangeKind.TARGET_MOVED, GridChangeKind.WALL_DAMAGED):
+            self._dirty = True
+
+    def refresh(self) -> None:
+        if not self._dirty:
+            return
+        self._dirty = False
+        self._rebuild()
+
+    def _rebuild(self) -> None:
+        world = self.world
+        ts = world.config.TILE_SIZE
+        now = world.time
+        out: dict[GridPos, float] = {}
+
+        live = [b for b in world.bombs if not b.exploded]
+        if not live:
+            self._detonate_at = out
+            return
+
+        by_tile: dict[GridPos, list[int]] = {}
+        when: list[float] = []
+        for i, b in enumerate(live):
+            by_tile.setdefault((b.rect.x // ts, b.rect.y // ts), []).append(i)
+            when.append(now + max(0.0, b.timer))
+
+        # En erken patlayandan başla; blast'ına giren bombaların zamanını öne çek
+        heap = [(t, i) for i, t in enumerate(when)]
+        heapq.heapify(heap)
+        done = [False] * len(live)
+        while heap:
+            t, i = heapq.heappop(heap)
+            if done[i] or t > when[i]:
+                continue
+            done[i] = True
+            b = live[i]
+            tiles = b.explosion_strategy.compute_tiles(
+                origin=(b.rect.x // ts, b.rect.y // ts),
+                power=b.power,
+                is_blocking=world.is_blocking,
+                is_breakable=world.is_breakable,
+            )
+            for tile in tiles:
+                if t < out.get(tile, math.inf):
+                    out[tile] = t
+                for j in by_tile.get(tile, ()):
+                    if not done[j] and t < when[j]:
+                        when[j] = t
+                        heapq.heappush(heap, (t, j))
+
+        self._detonate_at = out
+
+    # ---------- sorgu ----------
+    def time_to_blast(self, gx: int, gy: int) -> float:
+        """Bu tile'ı vuracak ilk patlamaya kalan süre (sn); tehlike yoksa inf."""
+        self.refresh()
+        at = self._detonate_at.get((gx, gy))
+        if at is None:
+            return math.inf
+        return max(0.0, at - self.world.time)
+
+    def is_dangerous(self, gx: int, gy: int) -> bool:
+        self.refresh()
+        return (gx, gy) in self._detonate_at
+
+    def danger_tiles(self) -> set[GridPos]:
+        self.refresh()
+        return set(self._detonate_at)
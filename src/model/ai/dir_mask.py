@@ -0,0 +1,34 @@
+# src/model/ai/dir_mask.py
+from __future__ import annotations
+
+"""
+4 yön için bitmask yardımcıları (enemy AI).
+Bit sırası Enemy.valid_dirs ile aynı: sağ, sol, aşağı, yukarı.
+"""
+
+Dir = tuple[int, int]
+
+DIRS: tuple[Dir, ...] = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
+RIGHT, LEFT, DOWN, UP = 1, 2, 4, 8
+
+DIR_BIT: dict[Dir, int] = {
+    (1, 0): RIGHT,
+    (-1, 0): LEFT,
+    (0, 1): DOWN,
+    (0, -1): UP,
+}
+
+# Ters yönün biti: (dx, dy) -> (-dx, -dy)
+REVERSE_BIT: dict[Dir, int] = {
+    (1, 0): LEFT,
+    (-1, 0): RIGHT,
+    (0, 1): UP,
+    (0, -1): DOWN,
+    (0, 0): 0,
+}
+
+# mask -> o mask'teki yönler (DIRS sırasıyla). valid_dirs allocation yapmadan buradan okur.
+DIRS_BY_MASK: tuple[tuple[Dir, ...], ...] = tuple(
+    tuple(d for d in DIRS if mask & DIR_BIT[d]) for mask in range(16)
+)
@@ -0,0 +1,159 @@
+# src/model/ai/flow_field.py
+from __future__ import annotations
+
+from collections import deque
+from typing import TYPE_CHECKING, Optional
+
+from model.grid_changes import GridChange, GridChangeKind
+
+if TYPE_CHECKING:
+    from model.world import World
+
+
+Dir = tuple[int, int]
+
+_DIRS: tuple[Dir, ...] = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
+# Sadece tile açan değişiklikler: mesafeler yalnızca azalabilir -> incremental
+_OPENING = (GridChangeKind.WALL_REMOVED, GridChangeKind.BOMB_REMOVED)
+
+
+class FlowField:
+    """
+    Canlı player'lardan multi-source BFS ile tile mesafe haritası.
+    - Her tile için en yakın player'a mesafe + o yöne atılacak ilk adım tutulur
+    - Duvar ve bombalar engel sayılır
+    - World.grid_changes'e abone: değişiklikte sadece dirty işaretlenir,
+      hesap bir sonraki sorguda yapılır (lazy). Değişiklik yoksa maliyet sıfır.
+    - Duvar kırılması / bomba patlaması (tile açılması) incremental işlenir,
+      diğer değişikliklerde (bomba konması, hedef tile değişimi) tam BFS
+    - next_dir() O(1): 50 chaser da 1 chaser ile aynı BFS'i paylaşır
+    """
+
+    def __init__(self, world: "World"):
+        self.world = world
+        self._gh = 0
+        self._dist: list[int] = []
+        self._step: list[Optional[Dir]] = []
+        self._blocked_bombs: set[tuple[int, int]] = set()
+
+        self._needs_rebuild = True
+        self._opened: list[tuple[int, int]] = []
+        world.grid_changes.subscribe(self._on_grid_change)
+
+    # ---------- invalidation ----------
+    def _on_grid_change(self, change: GridChange) -> None:
+        if self._needs_rebuild:
+            return
+        if change.kind is GridChangeKind.WALL_DAMAGED:
+            return  # hp değişti, geçilebilirlik aynı
+        if change.kind in _OPENING:
+            self._opened.extend(change.tiles)
+        else:
+            self._needs_rebuild = True
+            self._opened.clear()
+
+    def refresh(self) -> bool:
+        """Dirty ise günceller; bir iş yapıldıysa True döner."""
+        if self._needs_rebuild:
+            self._rebuild()
+            self._needs_rebuild = False
+            self._opened.clear()
+            return True
+        if self._opened:
+            opened = self._opened
+            self._opened = []
+            self._relax(opened)
+            return True
+        return False
+
+    # ---------- hesap ----------
+    def _targets(self) -> list[tuple[int, int]]:
+        ts = self.world.config.TILE_SIZE
+        return [
+            (p.rect.centerx // ts, p.rect.centery // ts)
+            for p in self.world.iter_players()
+            if getattr(p, "alive", False)
+        ]
+
+    def _passable(self, gx: int, gy: int) -> bool:
+        return self.world._wall_grid[gx][gy] is None and (gx, gy) not in self._blocked_bombs
+
+    def _rebuild(self) -> None:
+        gw, gh = self.world.config.GRID_WIDTH, self.world.config.GRID_HEIGHT
+        self._blocked_bombs = self.world.live_bomb_tiles()
+        n = gw * gh
+        self._gh = gh
+        self._dist = [-1] * n
+        self._step = [None] * n
+
+        seeds: list[int] = []
+        for gx, gy in self._targets():
+            if 0 <= gx < gw and 0 <= gy < gh:
+                i = gx * gh + gy
+                if self._dist[i] == -1:
+                    self._dist[i] = 0
+                    seeds.append(i)
+        self._propagate(deque(seeds))
+
+    def _relax(self, opened: list[tuple[int, int]]) -> None:
+        """Açılan tile'lar için: komşulardan mesafe al, azalan mesafeleri yay."""
+        gw, gh = self.world.config.GRID_WIDTH, self.world.config.GRID_HEIGHT
+        self._blocked_bombs = self.world.live_bomb_tiles()
+        dist, step = self._dist, self._step
+        q: deque[int] = deque()
+
+        for gx, gy in opened:
+            if not (0 <= gx < gw and 0 <= gy < gh) or not self._passable(gx, gy):
+                continue
+            i = gx * gh + gy
+            for dx, dy in _DIRS:
+                nx, ny = gx + dx, gy + dy
+                if nx < 0 or ny < 0 or nx >= gw or ny >= gh:
+                    continue
+                nd = dist[nx * gh + ny]
+                if nd != -1 and (dist[i] == -1 or nd + 1 < dist[i]):
+                    dist[i] = nd + 1
+                    step[i] = (dx, dy)
+            if dist[i] != -1:
+                q.append(i)
+
+        self._propagate(q)
+
+    def _propagate(self, q: deque) -> None:
+        gw, gh = self.world.config.GRID_WIDTH, self._gh
+        dist, step = self._dist, self._step
+        while q:
+            i = q.popleft()
+            x, y = divmod(i, gh)
+            d = dist[i] + 1
+            for dx, dy in _DIRS:
+                nx, ny = x + dx, y + dy
+                if nx < 0 or ny < 0 or nx >= gw or ny >= gh:
+                    continue
+                j = nx * gh + ny
+                if (dist[j] != -1 and dist[j] <= d) or not self._passable(nx, ny):
+                    continue
+                dist[j] = d
+                # (nx, ny)'den player'a doğru ilk adım: geldiğimiz tile'a dön
+                step[j] = (-dx, -dy)
+                q.append(j)
+
+    # ---------- sorgu ----------
+    def _index(self, gx: int, gy: int) -> int:
+        if gx < 0 or gy < 0 or gy >= self._gh:
+            return -1
+        i = gx * self._gh + gy
+        return i if i < len(self._dist) else -1
+
+    def distance(self, gx: int, gy: int) -> int:
+        """En yakın canlı player'a BFS mesafesi; ulaşılamıyorsa -1."""
+        self.refresh()
+        i = self._index(gx, gy)
+        return self._dist[i] if i != -1 else -1
+
+    def next_dir(self, gx: int, gy: int) -> Optional[Dir]:
+        """Player'a en kısa yoldaki ilk adım; player tile'ındaysa / yol yoksa None."""
+        self.refresh()
+        i = self._index(gx, gy)
+        return self._step[i] if i != -1 else None
@@ -2,6 +2,8 @@ from __future__ import annotations
 import random
 from typing import Protocol, TYPE_CHECKING
 
+from model.ai.dir_mask import DIRS_BY_MASK, DIR_BIT
+
 if TYPE_CHECKING:
     from model.enemy import Enemy
     from model.world import World
@@ -13,59 +15,116 @@ class IMoveStrategy(Protocol):
 
 class RandomMoveStrategy:
     def choose_dir(self, enemy: "Enemy", world: "World") -> tuple[int, int]:
-        options = enemy.valid_dirs(world, avoid_reverse=True)
-        if options:
-            random.shuffle(options)
-            return options[0]
-
-        # dead-end: reverse dahil dene
-        options = enemy.valid_dirs(world, avoid_reverse=False)
+        # dead-end ise reverse dahil dene
+        options = enemy.valid_dirs(world, avoid_reverse=True) or \
+            enemy.valid_dirs(world, avoid_reverse=False)
         if options:
-            random.shuffle(options)
-            return options[0]
-
+            return random.choice(options)
         return (0, 0)
 
 
-
-
-
 class ChasePlayerStrategy:
     def choose_dir(self, enemy: "Enemy", world: "World") -> tuple[int, int]:
         ex, ey = enemy.grid_pos()
+
+        # World'ün flow field'i varsa: en yakın player'a en kısa yol, O(1)
+        field = getattr(world, "flow_field", None)
+        if field is not None:
+            step = field.next_dir(ex, ey)
+            if step is not None:
+                return step
+
+        # Fallback: greedy (yol yoksa / player ile aynı tile'daysa)
         px = world.player.rect.centerx // world.config.TILE_SIZE
         py = world.player.rect.centery // world.config.TILE_SIZE
 
         dx = 0 if px == ex else (1 if px > ex else -1)
         dy = 0 if py == ey else (1 if py > ey else -1)
 
-        preferred: list[tuple[int,int]] = []
-
         # Hangisi daha uzaksa önce onu dene
         if abs(px - ex) >= abs(py - ey):
-            if dx != 0: preferred.append((dx, 0))
-            if dy != 0: preferred.append((0, dy))
+            first, second = (dx, 0), (0, dy)
         else:
-            if dy != 0: preferred.append((0, dy))
-            if dx != 0: preferred.append((dx, 0))
+            first, second = (0, dy), (dx, 0)
 
-        # Reverse engelli şekilde dene
-        valid = set(enemy.valid_dirs(world, avoid_reverse=True))
-        for d in preferred:
-            if d in valid:
-                return d
+        # Reverse engelli şekilde dene ((0, 0) mask'te biti olmadığı için elenir)
+        legal = enemy.legal_mask(world, avoid_reverse=True)
+        if legal & DIR_BIT.get(first, 0):
+            return first
+        if legal & DIR_BIT.get(second, 0):
+            return second
 
-        # Olmadıysa reverse engelli başka bir valid yön seç
-        options = enemy.valid_dirs(world, avoid_reverse=True)
+        # Olmadıysa reverse engelli başka bir valid yön; dead-end: reverse dahil
+        options = DIRS_BY_MASK[legal] or enemy.valid_dirs(world, avoid_reverse=False)
         if options:
-            random.shuffle(options)
-            return options[0]
+            return random.choice(options)
+
+        return (0, 0)
+
+
+
+class BombAwareStrategy:
+    """
+    Başka bir stratejiyi sarar (Decorator), World.danger_map'e göre:
+    - Blast alanındaysa: patlamadan önce ulaşılabilen en yakın güvenli tile'a kaçar
+    - Değilse: iç stratejinin yönünü kullanır, ama blast alanına adım atmaz
+    Danger map tick başına bir kez (bomba/duvar değişince) hesaplanır,
+    enemy başına blast simülasyonu yok.
+    """
+
+    def __init__(self, inner: IMoveStrategy | None = None, max_escape_depth: int = 8):
+        self.inner: IMoveStrategy = inner or RandomMoveStrategy()
+        self.max_escape_depth = max_escape_depth
+
+    def choose_dir(self, enemy: "Enemy", world: "World") -> tuple[int, int]:
+        danger = getattr(world, "danger_map", None)
+        if danger is None:
+            return self.inner.choose_dir(enemy, world)
+
+        gx, gy = enemy.grid_pos()
+
+        if danger.is_dangerous(gx, gy):
+            step = self._escape_dir(enemy, world, danger, gx, gy)
+            if step is not None:
+                return step
+
+        d = self.inner.choose_dir(enemy, world)
+        if d != (0, 0) and not danger.is_dangerous(gx + d[0], gy + d[1]):
+            return d
 
-        # dead-end: reverse dahil
-        options = enemy.valid_dirs(world, avoid_reverse=False)
+        options = [
+            o for o in enemy.valid_dirs(world, avoid_reverse=False)
+            if not danger.is_dangerous(gx + o[0], gy + o[1])
+        ]
         if options:
-            random.shuffle(options)
-            return options[0]
+            return random.choice(options)
 
+        # Güvenli adım yok: yerinde bekle (Enemy.update (0, 0)'ı bekleme sayar)
         return (0, 0)
 
+    def _escape_dir(self, enemy: "Enemy", world: "World", danger, gx: int, gy: int):
+        """Blast'tan önce varılabilen en yakın güvenli tile'a ilk adım (BFS)."""
+        step_time = 1.0 / max(1e-6, enemy.speed_tiles)
+        frontier = [((gx, gy), None)]
+        seen = {(gx, gy)}
+
+        for depth in range(1, self.max_escape_depth + 1):
+            arrive = depth * step_time
+            nxt = []
+            for (x, y), first in frontier:
+                for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+                    nx, ny = x + dx, y + dy
+                    if (nx, ny) in seen or world.is_solid_cell(nx, ny):
+                        continue
+                    seen.add((nx, ny))
+                    # Bu tile'a varmadan patlayacaksa bu yol kullanılamaz
+                    if danger.time_to_blast(nx, ny) <= arrive:
+                        continue
+                    step = first or (dx, dy)
+                    if not danger.is_dangerous(nx, ny):
+                        return step
+                    nxt.append(((nx, ny), step))
+            if not nxt:
+                return None
+            frontier = nxt
+        return None
@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import random
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Callable, Optional, Protocol, TYPE_CHECKING
+
+import pygame
+
+from commands.base import Command
+from commands.bomb import PlaceBombCommand
+from commands.move import MoveCommand
+from core.explosion_strategy import NormalExplosionStrategy
+from model.ai.dir_mask import DIRS_BY_MASK
+from model.entities import WallType
+
+if TYPE_CHECKING:
+    from model.entities import Player
+    from model.world import World
+
+
+GridPos = tuple[int, int]
+
+
+class IPlayerBot(Protocol):
+    """
+    Player'ı klavye yerine süren politika (self-play / headless maçlar).
+    Her tick çağrılır, klavyeyle aynı Command'ları döndürür (CommandInvoker çalıştırır).
+    """
+    def commands(self, player: "Player", world: "World") -> list[Command]: ...
+
+
+class _TileBot(ABC):
+    """
+    Ortak iskelet: kararlar tile merkezinde verilir, arada hedef tile'a yürünür.
+    - Blast alanındaysa: patlamadan önce varılabilen en yakın güvenli tile'a kaçar
+    - Enemy'ye bitişikse: enemy'lerden uzak bir tile'a kaçar
+    - Değilse: alt sınıfın _choose()'u hedef tile'ı ve bomba kararını verir
+    """
+
+    # Hedef tile'a bu kadar tick'te varamazsa (köşeye takıldı vs.) yeniden karar ver
+    STALL_TICKS = 90
+
+    def __init__(self, rng: Optional[random.Random] = None, search_depth: int = 12):
+        self.rng = rng or random.Random()
+        self.search_depth = search_depth
+        self._target: Optional[GridPos] = None
+        self._target_ticks = 0
+
+    def commands(self, player: "Player", world: "World") -> list[Command]:
+        if not player.alive:
+            return []
+        ts = world.config.TILE_SIZE
+
+        if self._target is not None:
+            self._target_ticks += 1
+            arrived = pygame.Rect(
+                self._target[0] * ts, self._target[1] * ts, ts, ts).contains(player.rect)
+            if not arrived and self._target_ticks < self.STALL_TICKS:
+                return [self._steer(player, self._target, ts)]
+
+        here = (player.rect.centerx // ts, player.rect.centery // ts)
+        out: list[Command] = []
+        danger = world.danger_map
+        threat = self._enemy_tiles(world)
+
+        if danger.is_dangerous(*here) or here in threat:
+            step = self._path_step(
+                player, world, here,
+                lambda t: not danger.is_dangerous(*t) and t not in threat,
+            )
+        else:
+            step, bomb = self._choose(player, world, here)
+            if bomb:
+                out.append(PlaceBombCommand(world, player))
+
+        self._target = step
+        self._target_ticks = 0
+        if step is None:
+            out.append(MoveCommand(player, 0, 0))
+        else:
+            out.append(self._steer(player, step, ts))
+        return out
+
+    @abstractmethod
+    def _choose(self, player, world, here: GridPos) -> tuple[Optional[GridPos], bool]:
+        """Güvenli durumda: sıradaki hedef tile (None = dur) ve bomba bırakılsın mı."""
+
+    # ---------- helpers ----------
+    @staticmethod
+    def _steer(player, tile: GridPos, ts: int) -> MoveCommand:
+        cx = tile[0] * ts + ts // 2
+        cy = tile[1] * ts + ts // 2
+        dx = cx - player.rect.centerx
+        dy = cy - player.rect.centery
+        return MoveCommand(
+            player,
+            0 if abs(dx) <= 1 else (1 if dx > 0 else -1),
+            0 if abs(dy) <= 1 else (1 if dy > 0 else -1),
+        )
+
+    @staticmethod
+    def _tile_seconds(player, world) -> float:
+        speed = player.state.get_speed() if player.state is not None else player.base_speed
+        return world.config.TILE_SIZE / max(1e-6, speed)
+
+    def _path_step(
+        self,
+        player,
+        world,
+        start: GridPos,
+        goal: Callable[[GridPos], bool],
+        max_depth: Optional[int] = None,
+    ) -> Optional[GridPos]:
+        """
+        BFS: goal'ü sağlayan en yakın tile'a giden yolun ilk tile'ı.
+        Varmadan patlayacak tile'lardan ve enemy'lerin üstünden geçmez; en fazla max_depth adım arar.
+        """
+        danger = world.danger_map
+        enemies = self._enemy_tiles(world)
+        step_time = self._tile_seconds(player, world)
+        limit = self.search_depth if max_depth is None else min(self.search_depth, max_depth)
+        seen = {start}
+        frontier: deque = deque([(start, None, 0)])
+        while frontier:
+            (x, y), first, depth = frontier.popleft()
+            if depth >= limit:
+                continue
+            arrive = (depth + 1) * step_time
+            for dx, dy in DIRS_BY_MASK[world.open_mask_at(x, y)]:
+                nxt = (x + dx, y + dy)
+                if nxt in seen or nxt in enemies:
+                    continue
+                seen.add(nxt)
+                if danger.time_to_blast(*nxt) <= arrive:
+                    continue
+                step = first or nxt
+                if goal(nxt):
+                    return step
+                frontier.append((nxt, step, depth + 1))
+        return None
+
+    @staticmethod
+    def _enemy_tiles(world, reach: int = 1) -> set[GridPos]:
+        """Enemy tile'ları; reach=1 ise 4 komşuları da (bir adımda temas edebilecekleri)."""
+        ts = world.config.TILE_SIZE
+        out: set[GridPos] = set()
+        for e in world.enemies:
+            x, y = e.rect.centerx // ts, e.rect.centery // ts
+            out.add((x, y))
+            if reach:
+                out.update(((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)))
+        return out
+
+    @staticmethod
+    def _can_bomb(player, world) -> bool:
+        active = sum(1 for b in world.bombs if not b.exploded and b.owner is player)
+        return active < player.max_bombs
+
+    @staticmethod
+    def _blast_from(player, world, here: GridPos) -> frozenset:
+        return frozenset(NormalExplosionStrategy().compute_tiles(
+            origin=here,
+            power=player.bomb_power,
+            is_blocking=world.is_blocking,
+            is_breakable=world.is_breakable,
+        ))
+
+    def _escape_after_bomb(self, player, world, here: GridPos) -> Optional[GridPos]:
+        """Buraya bomba bırakılırsa blast dışına kaçış yolunun ilk tile'ı (yoksa None)."""
+        blast = self._blast_from(player, world, here)
+        danger = world.danger_map
+        # Kendi bombası patlamadan blast dışına çıkabilmeli
+        fuse_steps = int(world.config.BOMB_TIMER / self._tile_seconds(player, world)) - 1
+        return self._path_step(
+            player, world, here,
+            lambda t: t not in blast and not danger.is_dangerous(*t),
+            max_depth=fuse_steps,
+        )
+
+    @staticmethod
+    def _next_to_breakable(world, tile: GridPos) -> bool:
+        x, y = tile
+        for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if world.wall_type_at(nx, ny) == WallType.BREAKABLE:
+                return True
+        return False
+
+    def _random_safe_step(self, world, here: GridPos) -> Optional[GridPos]:
+        danger = world.danger_map
+        enemies = self._enemy_tiles(world)
+        x, y = here
+        options = [
+            (x + dx, y + dy)
+            for dx, dy in DIRS_BY_MASK[world.open_mask_at(x, y)]
+            if not danger.is_dangerous(x + dx, y + dy) and (x + dx, y + dy) not in enemies
+        ]
+        return self.rng.choice(options) if options else None
+
+
+class RandomBot(_TileBot):
+    """Güvenli komşulara rastgele yürür; bomb_chance ihtimalle (kaçış varsa) bomba bırakır."""
+
+    def __init__(self, rng: Optional[random.Random] = None, bomb_chance: float = 0.1):
+        super().__init__(rng)
+        self.bomb_chance = bomb_chance
+
+    def _choose(self, player, world, here):
+        if self._can_bomb(player, world) and self.rng.random() < self.bomb_chance:
+            escape = self._escape_after_bomb(player, world, here)
+            if escape is not None:
+                return escape, True
+        return self._random_safe_step(world, here), False
+
+
+class BomberBot(_TileBot):
+    """
+    Kırılabilir duvar avcısı:
+    - Yanında BREAKABLE duvar ya da blast hattında enemy varsa ve bombadan sonra
+      kaçış yolu varsa bomba bırakır
+    - Değilse en yakın BREAKABLE duvarın yanındaki tile'a yürür (BFS)
+    - Hedef yoksa güvenli bir komşuya rastgele yürür
+    """
+
+    def _choose(self, player, world, here):
+        if self._can_bomb(player, world) and (
+            self._next_to_breakable(world, here)
+            or self._blast_from(player, world, here) & self._enemy_tiles(world, reach=0)
+        ):
+            escape = self._escape_after_bomb(player, world, here)
+            if escape is not None:
+                return escape, True
+
+        danger = world.danger_map
+        step = self._path_step(
+            player, world, here,
+            lambda t: self._next_to_breakable(world, t) and not danger.is_dangerous(*t),
+        )
+        if step is not None:
+            return step, False
+        return self._random_safe_step(world, here), False
+
+
+class IdleBot:
+    """Hiçbir şey yapmaz (baseline / tek botlu ölçümler için)."""
+
+    def commands(self, player: "Player", world: "World") -> list[Command]:
+        return []
+
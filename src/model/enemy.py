@@ -7,6 +7,8 @@ from typing import Optional
 import pygame
 
 from model.ai.move_strategies import IMoveStrategy, RandomMoveStrategy
+from model.ai.dir_mask import DIRS_BY_MASK, DIR_BIT, REVERSE_BIT
+from model.sim_clock import to_ticks
 
 
 class Enemy:
@@ -27,6 +29,7 @@ class Enemy:
         speed: float = 7.0,
         strategy: Optional[IMoveStrategy] = None,
         enemy_type: int = 1,   # 👈 e1 / e2
+        rate: int = 60,        # simülasyon tick/sn (karar aralığı tick sayılır)
     ):
         self.ts = tile_size
         self.rect = pygame.Rect(x * tile_size, y * tile_size, tile_size, tile_size)
@@ -41,9 +44,11 @@ class Enemy:
         self._last_dir = (0, 0)
         self._target_px = self.rect.topleft
 
-        self._rethink_timer = 0.0
+        self._rethink_ticks = 0
+        # Batched AI tick'te World'ün hesapladığı açık-komşu bitmask'i (karar süresince)
+        self.open_mask: Optional[int] = None
         # tile süresine yakın aralık: bekleme hissini azaltır
-        self._rethink_interval = 1.0 / max(1e-6, self.speed_tiles)
+        self._rethink_interval = to_ticks(1.0 / max(1e-6, self.speed_tiles), rate)
                 # --- Combat ---
         # type 1: tek vuruş
         # type 2: biraz daha dayanıklı (istersen 1 yap)
@@ -65,27 +70,25 @@ class Enemy:
     def _reverse_of(self, d: tuple[int, int]) -> tuple[int, int]:
         return (-d[0], -d[1])
 
-    def _can_step(self, world, dx: int, dy: int) -> bool:
+    def _tile_mask(self, world) -> int:
+        if self.open_mask is not None:
+            return self.open_mask
         gx, gy = self.grid_pos()
-        # World tarafında grid-based kontrolün var:
-        # is_solid_cell(gx, gy) varsa onu kullanır.
-        if hasattr(world, "is_solid_cell"):
-            return not world.is_solid_cell(gx + dx, gy + dy)
-        # fallback (eski rect collision)
-        nxt = self._tile_rect(gx + dx, gy + dy)
-        return not world.collides_with_solid(nxt)
-
-    def valid_dirs(self, world, avoid_reverse: bool = True) -> list[tuple[int, int]]:
-        dirs = [(1, 0), (-1, 0), (0, 1), (0, -1)]
-        out: list[tuple[int, int]] = []
-        rev = self._reverse_of(self._last_dir)
-
-        for d in dirs:
-            if avoid_reverse and self._last_dir != (0, 0) and d == rev:
-                continue
-            if self._can_step(world, d[0], d[1]):
-                out.append(d)
-        return out
+        return world.open_mask_at(gx, gy)
+
+    def _can_step(self, world, dx: int, dy: int) -> bool:
+        return bool(self._tile_mask(world) & DIR_BIT.get((dx, dy), 0))
+
+    def legal_mask(self, world, avoid_reverse: bool = True) -> int:
+        """Bu tile'dan atılabilecek adımların bitmask'i (bkz. ai.dir_mask)."""
+        mask = self._tile_mask(world)
+        if avoid_reverse:
+            mask &= ~REVERSE_BIT[self._last_dir]
+        return mask
+
+    def valid_dirs(self, world, avoid_reverse: bool = True) -> tuple[tuple[int, int], ...]:
+        # Hazır tablo: mask başına yön tuple'ı, karar başına liste kurulmaz
+        return DIRS_BY_MASK[self.legal_mask(world, avoid_reverse)]
 
     def _start_step(self, world, dx: int, dy: int) -> bool:
         if dx == 0 and dy == 0:
@@ -140,6 +143,14 @@ class Enemy:
 
     # ---------- Main loop ----------
     def update(self, dt: float, world) -> None:
+        if self.advance(dt):
+            self.decide(world)
+
+    def advance(self, dt: float) -> bool:
+        """
+        Hareketi ilerletir. Bu frame yeni yön kararı gerekiyorsa True döner
+        (World bu enemy'leri toplayıp decide()'ı batch halinde çağırır).
+        """
         # Hareket halindeyken hedefe ilerle
         if self._moving:
             speed_px = self.speed_tiles * self.ts * dt
@@ -160,38 +171,45 @@ class Enemy:
 
             if self.rect.topleft == self._target_px:
                 self._moving = False
-            return
+            return False
 
         # tile üstüne hizala
         self._snap_to_tile()
 
         # karar verme aralığı
-        self._rethink_timer += dt
-        if self._rethink_timer < self._rethink_interval:
-            return
-        self._rethink_timer = 0.0
+        self._rethink_ticks += 1
+        if self._rethink_ticks < self._rethink_interval:
+            return False
+        self._rethink_ticks = 0
+        return True
 
+    def decide(self, world, open_mask: Optional[int] = None) -> None:
+        """
+        Strategy'den yön alıp adımı başlatır.
+        open_mask verilirse valid_dirs/_can_step World'e sormadan bu mask'i kullanır.
+        """
+        self.open_mask = open_mask
+        try:
+            self._decide(world)
+        finally:
+            self.open_mask = None
+
+    def _decide(self, world) -> None:
         # Strategy kararı
         dx, dy = self.strategy.choose_dir(self, world)
 
+        # (0, 0): strateji bilerek bekliyor (ör. etraf blast alanı)
+        if dx == 0 and dy == 0:
+            return
+
         # Önce seçilen yön
         if not self._start_step(world, dx, dy):
-            # Reverse hariç alternatif
-            options = self.valid_dirs(world, avoid_reverse=True)
-            random.shuffle(options)
-            moved = False
-            for adx, ady in options:
-                if self._start_step(world, adx, ady):
-                    moved = True
-                    break
-
-            # dead-end: reverse dahil
-            if not moved:
-                options = self.valid_dirs(world, avoid_reverse=False)
-                random.shuffle(options)
-                for adx, ady in options:
-                    if self._start_step(world, adx, ady):
-                        break
+            # Reverse hariç alternatif; dead-end ise reverse dahil
+            options = self.valid_dirs(world, avoid_reverse=True) or \
+                self.valid_dirs(world, avoid_reverse=False)
+            if options:
+                adx, ady = random.choice(options)
+                self._start_step(world, adx, ady)
 
     def draw(self, screen: pygame.Surface) -> None:
         # hareket ediyorsa anim aksın, değilse orta frame
@@ -5,9 +5,10 @@ from dataclasses import dataclass
 from typing import Callable, Dict, Any, List, Tuple, DefaultDict
 from collections import defaultdict
 from abc import ABC, abstractmethod
-from model.player_state import PlayerState, NormalState, SpeedBoostState
+from model.player_state import PlayerState, NormalState, RemoteSpeedState, SpeedBoostState
 from core.event_bus import EventBus, EventType, Event
 from core.explosion_strategy import ExplosionStrategy, NormalExplosionStrategy
+from model.sim_clock import tick_rate, to_ticks
 
 
 
@@ -100,9 +101,11 @@ class Player(Entity):
         self.hp_max=3
         self.hp = 3
         self.alive = True
-        self.invuln_time = 0.0  # opsiyonel
+        # Hasar sonrası sayaçlar tick cinsinden (World tick başına bir kez update eder)
+        self.tick_rate = tick_rate(config)
+        self.invuln_ticks = 0  # opsiyonel
         self.invincible = False
-        self.inv_timer = 0.0
+        self.inv_ticks = 0
         self.inv_duration = 0.8  # saniye
 
 
@@ -131,6 +134,12 @@ class Player(Entity):
         self.moving = False
         self.facing="f" # idle bakış yönü default (front)
 
+        # Ağ: server'da uygulanan son INPUT seq'i ve tick'i (client reconciliation için)
+        self.input_seq = 0
+        self.input_tick = 0
+        # Son CMD'deki basılı yön maskesi (yeni basılan yönü bulmak için)
+        self.input_dirs = 0
+
         # ---- STATE PATTERN ----
         # Player'ın current state'i (NormalState ile başlıyoruz)
         self.state: PlayerState = NormalState(self)
@@ -145,39 +154,61 @@ class Player(Entity):
         self.state = new_state
         self.state.enter()
 
+    def speed_multiplier(self) -> float:
+        """Current state'in base_speed'e göre hız çarpanı (snapshot'a yazılır)."""
+        if self.state is None or not self.base_speed:
+            return 1.0
+        return self.state.get_speed() / self.base_speed
+
+    def apply_speed_multiplier(self, multiplier: float) -> None:
+        """Client: snapshot'taki hız çarpanını uygular (boost süresi server'da sayılır)."""
+        if abs(multiplier - 1.0) < 1e-6:
+            if not isinstance(self.state, NormalState):
+                self.change_state(NormalState(self))
+        elif not (isinstance(self.state, RemoteSpeedState) and self.state.multiplier == multiplier):
+            self.change_state(RemoteSpeedState(self, multiplier))
+
+    @property
+    def inv_timer(self) -> float:
+        """Kalan invincibility süresi (sn); inv_ticks'ten türetilir (snapshot'lar saniye taşır)."""
+        return self.inv_ticks / self.tick_rate
+
+    @inv_timer.setter
+    def inv_timer(self, seconds: float) -> None:
+        self.inv_ticks = int(round(seconds * self.tick_rate))
+
     def take_damage(self,amount:int=1):
         if self.invincible:
             return
         if not self.alive:
             return
-        if self.invuln_time >0:
+        if self.invuln_ticks >0:
             return
         self.hp -=amount
-        self.invuln_time =1.0
+        self.invuln_ticks = to_ticks(1.0, self.tick_rate)
         print(f"[Player] Damage taken! HP={self.hp}")
 
         self.invincible = True
-        self.inv_timer = self.inv_duration
+        self.inv_ticks = to_ticks(self.inv_duration, self.tick_rate)
 
         if self.hp <= 0:
             self.alive = False
             self.invincible = False
-            self.inv_timer = 0.0
-            self.invuln_time = 0.0
+            self.inv_ticks = 0
+            self.invuln_ticks = 0
             print("[Player] DEAD")
 
 
     def update(self, dt, world):
+        # World tick başına bir kez çağırır; dt sabit (1 / TICK_RATE), sayaçlar tick sayar
         # --- invincibility timer (alive olmasa bile düşsün) ---
         if self.invincible:
-            self.inv_timer -= dt
-            if self.inv_timer <= 0:
+            self.inv_ticks -= 1
+            if self.inv_ticks <= 0:
                 self.invincible = False
 
-        if self.invuln_time > 0:
-            self.invuln_time -= dt
-            if self.invuln_time < 0:
-                self.invuln_time = 0
+        if self.invuln_ticks > 0:
+            self.invuln_ticks -= 1
 
         # sonra alive check
         if not self.alive:
@@ -200,15 +231,22 @@ class Player(Entity):
             # 1) X ekseni
             if move.x !=0:
                 new_rect = self.rect.move(move.x, 0)
-                if not world.collides_with_solid(new_rect):
+                if not self._blocked(world, new_rect):
                     self.rect = new_rect
 
             # 2) Y ekseni
             if move.y !=0:
                 new_rect = self.rect.move(0, move.y)
-                if not world.collides_with_solid(new_rect):
+                if not self._blocked(world, new_rect):
                     self.rect = new_rect
 
+    @staticmethod
+    def _blocked(world, rect) -> bool:
+        # Broad-phase: sadece rect'in üstündeki tile'lardaki duvarlarla test et
+        if hasattr(world, "walls_near_rect"):
+            return any(rect.colliderect(w.rect) for w in world.walls_near_rect(rect))
+        return world.collides_with_solid(rect)
+
 
     def draw(self, s):
         if not hasattr(self,"moving"):
@@ -523,10 +561,10 @@ class Wall(Entity):
 # --- BOMB ---------------------------------------------------------
 class Bomb(Entity):
     """
-    - Zamanlayıcı dolunca patlar.
-    - Patlama alanını ExplosionStrategy (Strategy Pattern) ile hesaplar.
-    - Patlayınca world.handle_explosion'a tiles listesini yollar.
-    - EventBus ile BOMB_PLACED / BOMB_EXPLODED event'leri yayınlar (Observer).
+    - Fitil tick sayısıdır: her World tick'inde bir azalır, dolunca World süresi
+      dolanları toplayıp ExplosionResolver ile tek batch'te patlatır (zincirleme dahil).
+    - Patlama alanı bombanın ExplosionStrategy'si (Strategy Pattern) ile hesaplanır.
+    - EventBus ile BOMB_PLACED yayınlar; BOMB_EXPLODED resolver'dan gelir (Observer).
     """
 
     ASSET_BASE = os.path.join(
@@ -539,9 +577,11 @@ class Bomb(Entity):
 
     def __init__(self, x, y, owner, config):
         super().__init__(x, y, config)
-        self.placed_ms = pygame.time.get_ticks()
         self.owner = owner
-        self.timer = config.BOMB_TIMER  # dt saniye ise bu da saniye
+        # Fitil ve yaş tick cinsinden (pygame saatine bağlı değil, deterministik)
+        self.tick_rate = tick_rate(config)
+        self.fuse_ticks = to_ticks(config.BOMB_TIMER, self.tick_rate)
+        self.age_ticks = 0
         self.color = self.config.COLOR_BOMB
         self.explosion_strategy: ExplosionStrategy = NormalExplosionStrategy()
 
@@ -577,60 +617,36 @@ class Bomb(Entity):
         except Exception as e:
             print("[ERROR] BOMB_PLACED event sırasında hata:", repr(e))
 
+    @property
+    def timer(self) -> float:
+        """Patlamaya kalan süre (sn); fuse_ticks'ten türetilir."""
+        return self.fuse_ticks / self.tick_rate
+
+    @timer.setter
+    def timer(self, seconds: float) -> None:
+        self.fuse_ticks = int(round(seconds * self.tick_rate))
+
     def update(self, dt, world):
+        # World tick başına bir kez çağırır; dt sabit (1 / TICK_RATE)
+        self.age_ticks += 1
+
         # Zaten patladıysa bir daha hiçbir şey yapma
         if self.exploded:
             return
 
-        self.timer -= dt
-        if self.timer <= 0:
-            self.explode(world)
+        # Fitil bitince World bu bombayı toplayıp batch halinde patlatır
+        self.fuse_ticks -= 1
 
     def explode(self, world):
         # Güvenlik: iki kere çağrılırsa ignore et
         if self.exploded:
             return
-        self.exploded = True
-
-        print("BOOM!")
-
-        tile_size = self.config.TILE_SIZE
-        gx = self.rect.x // tile_size
-        gy = self.rect.y // tile_size
-
-        # Default: sadece merkez tile
-        tiles = [(gx, gy)]
 
-        # --- Strategy Pattern: patlama alanını hesapla ---
-        tiles = self.explosion_strategy.compute_tiles(
-            origin=(gx, gy),
-            power=self.power,
-            is_blocking=lambda pos: world.is_blocking(pos),
-            is_breakable=lambda pos: world.is_breakable(pos),
-)
-
-
-
-        # 🔥 Asıl kritik: patlayan tile'ları world'e yolla
+        # Blast hesabı, zincirleme patlama ve BOMB_EXPLODED event'i World tarafında
         try:
-            world.handle_explosion(bomb=self, tiles=tiles)
+            world.detonate_bombs([self])
         except Exception as e:
-            print("[ERROR] world.handle_explosion sırasında hata:", repr(e))
-
-        # --- Observer Pattern: BOMB_EXPLODED event'i yayınla ---
-        try:
-            EventBus.publish(
-                Event(
-                    type=EventType.BOMB_EXPLODED,
-                    payload={
-                        "grid_pos": (gx, gy),
-                        "tiles": tiles,
-                        "owner": self.owner,
-                    },
-                )
-            )
-        except Exception as e:
-            print("[ERROR] BOMB_EXPLODED event sırasında hata:", repr(e))
+            print("[ERROR] world.detonate_bombs sırasında hata:", repr(e))
 
     @staticmethod
     def _load_bomb(frame, size):
@@ -644,7 +660,7 @@ class Bomb(Entity):
 
 
     def draw(self, s):
-        elapsed = pygame.time.get_ticks() - self.placed_ms
+        elapsed = self.age_ticks * 1000 // self.tick_rate
         frame = (elapsed // 150) % 3
         img = Bomb._load_bomb(frame, (self.rect.width, self.rect.height))
         s.blit(img, self.rect)
@@ -658,10 +674,12 @@ class ExplosionFX:
     )
     _CACHE = {}
 
-    def __init__(self, x_px: int, y_px: int, size: int, duration: float = 0.35):
+    def __init__(self, x_px: int, y_px: int, size: int, duration: float = 0.35, rate: int = 60):
         self.rect = pygame.Rect(x_px, y_px, size, size)
-        self.start_ms = pygame.time.get_ticks()
-        self.duration_ms = int(duration * 1000)
+        # Ömür tick cinsinden: World (veya client frame'i) tick() ile ilerletir
+        self.rate = rate
+        self.age_ticks = 0
+        self.duration_ticks = to_ticks(duration, rate)
 
     @staticmethod
     def _load(code: str, size: tuple[int, int]) -> pygame.Surface:
@@ -673,11 +691,14 @@ class ExplosionFX:
             ExplosionFX._CACHE[key] = img
         return ExplosionFX._CACHE[key]
 
+    def tick(self) -> None:
+        self.age_ticks += 1
+
     def alive(self) -> bool:
-        return (pygame.time.get_ticks() - self.start_ms) < self.duration_ms
+        return self.age_ticks < self.duration_ticks
 
     def draw(self, s: pygame.Surface):
-        elapsed = pygame.time.get_ticks() - self.start_ms
+        elapsed = self.age_ticks * 1000 // self.rate
         frame = (elapsed // 80) % 3   # 80ms/frame => hızlı patlama hissi
         code = f"ex{frame}"
         img = ExplosionFX._load(code, (self.rect.w, self.rect.h))
@@ -0,0 +1,158 @@
+# src/model/explosion_resolver.py
+from __future__ import annotations
+
+from collections import deque
+from typing import TYPE_CHECKING, Iterable, List, Tuple
+
+from core.event_bus import EventBus, EventType, Event
+from model.entities import ExplosionFX, WallType
+from model.grid_changes import GridChangeKind
+
+if TYPE_CHECKING:
+    from model.entities import Bomb
+    from model.world import World
+
+
+GridPos = Tuple[int, int]
+
+
+class ExplosionResolver:
+    """
+    Bir tick içinde patlayan tüm bombaları tek seferde çözer.
+    - Zincirleme patlama: blast'ın değdiği tile'daki bombalar aynı BFS'e eklenir
+    - Blast tile'ları her bombanın ExplosionStrategy'si ile bir kez hesaplanır,
+      hepsi tek bir set'te birleşir (FX/hasar tile başına bir kez)
+    - Duvar / enemy / player hasarı en sonda tek batch halinde uygulanır;
+      yayılım batch başındaki duvar durumuna göre hesaplanır
+    - Her bomba için BOMB_EXPLODED event'i yine ayrı ayrı yayınlanır
+    """
+
+    def __init__(self, world: "World"):
+        self.world = world
+
+    def resolve(self, bombs: Iterable["Bomb"]) -> set[GridPos]:
+        world = self.world
+        ts = world.config.TILE_SIZE
+
+        # Henüz patlamamış bombalar: tile -> bombalar (zincir için)
+        bombs_by_tile: dict[GridPos, list] = {}
+        for b in world.bombs:
+            if not b.exploded:
+                bombs_by_tile.setdefault((b.rect.x // ts, b.rect.y // ts), []).append(b)
+
+        queue: deque = deque()
+        seen: set[int] = set()
+        for b in bombs:
+            if id(b) not in seen:
+                seen.add(id(b))
+                b.exploded = True
+                queue.append(b)
+
+        detonated: List[Tuple["Bomb", GridPos, List[GridPos]]] = []
+        blast: set[GridPos] = set()
+        hit_walls: list = []
+
+        while queue:
+            bomb = queue.popleft()
+            origin = (bomb.rect.x // ts, bomb.rect.y // ts)
+            tiles = bomb.explosion_strategy.compute_tiles(
+                origin=origin,
+                power=bomb.power,
+                is_blocking=world.is_blocking,
+                is_breakable=world.is_breakable,
+            )
+            detonated.append((bomb, origin, tiles))
+
+            for tile in tiles:
+                if tile in blast:
+                    continue
+                blast.add(tile)
+
+                wall = world._get_wall_at(tile[0], tile[1])
+                if wall is not None and wall.wall_type != WallType.UNBREAKABLE:
+                    hit_walls.append(wall)
+
+                # Zincirleme: bu tile'daki diğer bombalar da patlar
+                for other in bombs_by_tile.get(tile, ()):
+                    if id(other) not in seen:
+                        seen.add(id(other))
+                        other.exploded = True
+                        queue.append(other)
+
+        self._apply(blast, hit_walls, detonated)
+        return blast
+
+    def _apply(self, blast: set[GridPos], hit_walls: list, detonated: list) -> None:
+        world = self.world
+        config = world.config
+        ts = config.TILE_SIZE
+        game = getattr(config, "game", None)
+
+        # --- FX: tile başına bir tane ---
+        for (tx, ty) in blast:
+            world.explosions_fx.append(ExplosionFX(tx * ts, ty * ts, ts, rate=world.tick_rate))
+
+        # --- Duvarlar + breakable'lardan power-up ---
+        max_pu = int(getattr(config, "MAX_POWERUPS_ON_MAP", 9999))
+        damaged = []
+        for wall in hit_walls:
+            if not wall.take_damage():
+                damaged.append((wall.rect.x // ts, wall.rect.y // ts))
+                continue
+            world._remove_wall(wall)
+
+            # Sadece BREAKABLE duvarlardan power-up çıksın
+            if wall.wall_type == WallType.BREAKABLE:
+                if game is not None:
+                    game.score += 10
+                if len(world.powerups) < max_pu:
+                    pu = world.powerup_factory.maybe_spawn(wall.rect.x // ts, wall.rect.y // ts)
+                    if pu is not None:
+                        world.powerups.append(pu)
+
+        if damaged:
+            world.grid_changes.publish(GridChangeKind.WALL_DAMAGED, damaged)
+
+        # --- Patlayan bombaları tek geçişte listeden sil ---
+        world.bombs[:] = [b for b in world.bombs if not b.exploded]
+        world.grid_changes.publish(
+            GridChangeKind.BOMB_REMOVED, [origin for _, origin, _ in detonated])
+
+        # --- 💀 Enemy hit ---
+        for e in list(world.enemies):
+            if (e.rect.centerx // ts, e.rect.centery // ts) not in blast:
+                continue
+            died = e.take_damage(1) if hasattr(e, "take_damage") else True
+            if died:
+                if e in world.enemies:
+                    world.enemies.remove(e)
+                if game is not None:
+                    game.score += 50 if getattr(e, "enemy_type", 1) == 1 else 80
+
+        # --- 💥 Player hit ---
+        damage = getattr(config, "BOMB_DAMAGE", 1)
+        for p in world.players.values():
+            if (p.rect.centerx // ts, p.rect.centery // ts) in blast:
+                p.take_damage(damage)
+                if not p.alive:
+                    print(f"[World] Player {getattr(p,'id', '?')} killed by explosion!")
+
+        # --- owner bomb sayacı + event'ler (bomba başına) ---
+        for bomb, origin, tiles in detonated:
+            owner = bomb.owner
+            if hasattr(owner, "active_bombs") and owner.active_bombs > 0:
+                owner.active_bombs -= 1
+
+            try:
+                EventBus.publish(
+                    Event(
+                        type=EventType.BOMB_EXPLODED,
+                        payload={
+                            "grid_pos": origin,
+                            "tiles": tiles,
+                            "owner": owner,
+                        },
+                    )
+                )
+            except Exception as e:
+                print("[ERROR] BOMB_EXPLODED event sırasında hata:", repr(e))
@@ -0,0 +1,55 @@
+# src/model/grid_changes.py
+from __future__ import annotations
+
+from dataclasses import dataclass
+from enum import Enum, auto
+from typing import Callable, List, Tuple
+
+
+GridPos = Tuple[int, int]
+
+
+class GridChangeKind(Enum):
+    RESET = auto()          # level yüklendi / walls komple değişti
+    WALL_ADDED = auto()
+    WALL_REMOVED = auto()
+    WALL_DAMAGED = auto()   # duvar hasar aldı ama yerinde (hp değişti, geçilebilirlik aynı)
+    BOMB_PLACED = auto()
+    BOMB_REMOVED = auto()
+    TARGET_MOVED = auto()   # canlı player'ların tile'ı değişti
+
+
+@dataclass(frozen=True)
+class GridChange:
+    version: int
+    kind: GridChangeKind
+    tiles: Tuple[GridPos, ...] = ()
+
+
+GridListener = Callable[[GridChange], None]
+
+
+class GridChangeFeed:
+    """
+    World'e ait, versiyonlu grid değişiklik bildirimi.
+    Global EventBus'tan farklı olarak her World'ün kendi feed'i var;
+    path cache'leri subscribe olup dirty tile'ları toplar, işi bir sonraki
+    sorguya bırakır. Hiçbir şey değişmeyen frame'de hiçbir listener çalışmaz.
+    """
+
+    def __init__(self) -> None:
+        self.version = 0
+        self._listeners: List[GridListener] = []
+
+    def subscribe(self, listener: GridListener) -> None:
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: GridListener) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def publish(self, kind: GridChangeKind, tiles=()) -> None:
+        self.version += 1
+        change = GridChange(self.version, kind, tuple(tiles))
+        for listener in list(self._listeners):
+            listener(change)
@@ -0,0 +1,123 @@
+# src/model/level_cache.py
+from __future__ import annotations
+
+import queue
+import random
+import threading
+from collections import OrderedDict
+from typing import Iterable, Tuple
+
+from model.level_generator import LevelGenerator, LevelGrid
+
+
+GridPos = Tuple[int, int]
+LevelKey = Tuple[str, int, int, int]   # (layout, seed, width, height)
+
+
+class LevelCache:
+    """
+    Üretilmiş LevelGrid'leri (layout, seed, width, height) anahtarıyla tutar.
+    LevelGrid değiştirilemez olduğu için aynı obje birden çok World'e verilebilir.
+    LRU: max_entries dolunca en eski kullanılan atılır.
+    Tekrar kullanılmayacak level'ler (rastgele seed) için generate() cache'e yazmaz.
+    """
+
+    def __init__(self, config, reserved: Iterable[GridPos] = (), max_entries: int = 32):
+        self.config = config
+        self.reserved = tuple(reserved)
+        self.max_entries = max_entries
+        self._levels: "OrderedDict[LevelKey, LevelGrid]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, layout: str, seed: int, width: int, height: int) -> LevelGrid:
+        key = (layout, seed, width, height)
+        with self._lock:
+            level = self._levels.get(key)
+            if level is not None:
+                self._levels.move_to_end(key)
+                return level
+
+        # Üretim lock dışında: background thread ile aynı anda çalışabilsin
+        level = self.generate(layout, seed, width, height)
+
+        with self._lock:
+            self._levels[key] = level
+            self._levels.move_to_end(key)
+            while len(self._levels) > self.max_entries:
+                self._levels.popitem(last=False)
+        return level
+
+    def generate(self, layout: str, seed: int, width: int, height: int) -> LevelGrid:
+        """Cache'e bakmadan/yazmadan üretir."""
+        generator = LevelGenerator.from_config(self.config, layout=layout, seed=seed)
+        return generator.generate(width, height, self.reserved)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._levels)
+
+
+class LevelPool:
+    """
+    Maç arası hızlı restart için hazır level havuzu.
+    - LEVEL_SEED sabitse: her maç aynı level, cache'ten döner (yeniden üretim yok)
+    - LEVEL_SEED None ise: background thread sıradaki `size` level'i
+      rastgele seed'lerle önceden üretip (open mask'leri dahil) kuyrukta sıcak tutar;
+      bu level'ler bir daha istenmeyeceği için LRU cache'e yazılmaz
+    take() hiçbir zaman beklemez; kuyruk boşsa level'i o an üretir.
+    """
+
+    def __init__(self, config, reserved: Iterable[GridPos] = (), size: int = 3):
+        self.config = config
+        self.layout = getattr(config, "LEVEL_LAYOUT", "classic")
+        self.width = config.GRID_WIDTH
+        self.height = config.GRID_HEIGHT
+        self.seed = getattr(config, "LEVEL_SEED", None)
+
+        self.cache = LevelCache(
+            config,
+            reserved,
+            max_entries=int(getattr(config, "LEVEL_CACHE_SIZE", 32)),
+        )
+
+        self._seed_rng = random.Random()
+        self._ready: "queue.Queue[LevelGrid]" = queue.Queue(maxsize=max(1, size))
+        self._running = False
+        self._thread: threading.Thread | None = None
+
+        if self.seed is None and size > 0:
+            self._running = True
+            self._thread = threading.Thread(target=self._worker, daemon=True)
+            self._thread.start()
+
+    def _next_seed(self) -> int:
+        return self._seed_rng.getrandbits(32)
+
+    def _worker(self) -> None:
+        while self._running:
+            level = self.cache.generate(self.layout, self._next_seed(), self.width, self.height)
+            level.open_masks  # World yüklemesinde hazır olsun
+            while self._running:
+                try:
+                    self._ready.put(level, timeout=0.5)
+                    break
+                except queue.Full:
+                    continue
+
+    def take(self) -> LevelGrid:
+        if self.seed is not None:
+            return self.cache.get(self.layout, self.seed, self.width, self.height)
+
+        try:
+            return self._ready.get_nowait()
+        except queue.Empty:
+            return self.cache.generate(self.layout, self._next_seed(), self.width, self.height)
+
+    def ready_count(self) -> int:
+        return self._ready.qsize()
+
+    def close(self) -> None:
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
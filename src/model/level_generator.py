@@ -0,0 +1,266 @@
+# src/model/level_generator.py
+from __future__ import annotations
+
+import random
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Iterable, Tuple
+
+from model.ai.dir_mask import DOWN, LEFT, RIGHT, UP
+from model.entities import WallType
+
+
+GridPos = Tuple[int, int]
+
+# Compact grid kodları: 0 = boş, diğerleri WallType.value
+EMPTY = 0
+UNBREAKABLE = WallType.UNBREAKABLE.value
+BREAKABLE = WallType.BREAKABLE.value
+HARD = WallType.HARD.value
+
+_CODE_TO_WALL = {wt.value: wt for wt in WallType}
+
+
+@dataclass(frozen=True)
+class LevelGrid:
+    """
+    Üretilmiş level'in değiştirilemez, kompakt hali.
+    cells[y * width + x] -> EMPTY veya WallType.value
+    World bunu doğrudan Wall objelerine çevirir; cache'lenip tekrar kullanılabilir.
+    """
+    width: int
+    height: int
+    cells: bytes
+    layout: str = ""
+    seed: int | None = None
+
+    def code_at(self, gx: int, gy: int) -> int:
+        return self.cells[gy * self.width + gx]
+
+    def wall_type_at(self, gx: int, gy: int) -> WallType | None:
+        return _CODE_TO_WALL.get(self.cells[gy * self.width + gx])
+
+    def iter_walls(self) -> Iterable[tuple[int, int, WallType]]:
+        w = self.width
+        for i, code in enumerate(self.cells):
+            if code != EMPTY:
+                yield i % w, i // w, _CODE_TO_WALL[code]
+
+    @cached_property
+    def open_masks(self) -> tuple[tuple[int, ...], ...]:
+        """
+        [gx][gy] -> duvarsız komşu yönlerinin bitmask'i (bkz. ai.dir_mask), level başına bir kez
+        hesaplanır; World yüklerken sadece kopyalar (LevelPool bunu background'da ısıtır).
+        """
+        w, h, cells = self.width, self.height, self.cells
+        columns = []
+        for gx in range(w):
+            column = []
+            for gy in range(h):
+                i = gy * w + gx
+                m = 0
+                if gx + 1 < w and cells[i + 1] == EMPTY:
+                    m |= RIGHT
+                if gx > 0 and cells[i - 1] == EMPTY:
+                    m |= LEFT
+                if gy + 1 < h and cells[i + w] == EMPTY:
+                    m |= DOWN
+                if gy > 0 and cells[i - w] == EMPTY:
+                    m |= UP
+                column.append(m)
+            columns.append(tuple(column))
+        return tuple(columns)
+
+
+# ====================================================
+# LAYOUTS (Strategy Pattern)
+# ====================================================
+
+class LevelLayout(ABC):
+    """
+    Level'in duvar yerleşimini üreten arayüz.
+    fill() boş bir grid'i doldurur; reserved tile'lar boş bırakılmalı
+    (kenar UNBREAKABLE hariç).
+    """
+
+    name = ""
+
+    @abstractmethod
+    def fill(
+        self,
+        cells: bytearray,
+        width: int,
+        height: int,
+        rng: random.Random,
+        reserved: set[GridPos],
+    ) -> None:
+        raise NotImplementedError
+
+    @staticmethod
+    def _fill_border(cells: bytearray, width: int, height: int) -> None:
+        for x in range(width):
+            cells[x] = UNBREAKABLE
+            cells[(height - 1) * width + x] = UNBREAKABLE
+        for y in range(height):
+            cells[y * width] = UNBREAKABLE
+            cells[y * width + width - 1] = UNBREAKABLE
+
+
+class ClassicLayout(LevelLayout):
+    """
+    Klasik Bomberman haritası:
+    - Kenar UNBREAKABLE
+    - İçeride 2x2 aralıklarla HARD pillar
+    - Kalan boşluklara breakable_chance ihtimalle BREAKABLE
+    """
+
+    name = "classic"
+
+    def __init__(self, breakable_chance: float = 0.45):
+        self.breakable_chance = breakable_chance
+
+    def fill(self, cells, width, height, rng, reserved):
+        self._fill_border(cells, width, height)
+
+        for x in range(2, width - 2, 2):
+            for y in range(2, height - 2, 2):
+                cells[y * width + x] = HARD
+
+        chance = self.breakable_chance
+        for x in range(1, width - 1):
+            for y in range(1, height - 1):
+                if (x, y) in reserved:
+                    continue
+                i = y * width + x
+                if cells[i] != EMPTY:
+                    continue
+                if rng.random() < chance:
+                    cells[i] = BREAKABLE
+
+
+class MazeLayout(LevelLayout):
+    """
+    Labirent haritası:
+    - Tek koordinatlı tile'lar oda, çift-çift tile'lar HARD pillar
+    - Odalar arası geçişler randomized DFS ile açılır, kapalı kalanlar BREAKABLE
+    - loop_chance kadar ekstra geçiş açılır (tek yol kalmasın)
+    """
+
+    name = "maze"
+
+    def __init__(self, loop_chance: float = 0.1):
+        self.loop_chance = loop_chance
+
+    def fill(self, cells, width, height, rng, reserved):
+        self._fill_border(cells, width, height)
+
+        for x in range(1, width - 1):
+            for y in range(1, height - 1):
+                if x % 2 == 1 and y % 2 == 1:
+                    continue  # oda
+                cells[y * width + x] = HARD if (x % 2 == 0 and y % 2 == 0) else BREAKABLE
+
+        rooms = [(x, y) for x in range(1, width - 1, 2) for y in range(1, height - 1, 2)]
+        if not rooms:
+            return
+
+        visited = {rooms[0]}
+        stack = [rooms[0]]
+        steps = [(2, 0), (-2, 0), (0, 2), (0, -2)]
+        while stack:
+            x, y = stack[-1]
+            options = [
+                (x + dx, y + dy)
+                for dx, dy in steps
+                if 0 < x + dx < width - 1 and 0 < y + dy < height - 1
+                and (x + dx, y + dy) not in visited
+            ]
+            if not options:
+                stack.pop()
+                continue
+            nx, ny = rng.choice(options)
+            cells[((y + ny) // 2) * width + (x + nx) // 2] = EMPTY
+            visited.add((nx, ny))
+            stack.append((nx, ny))
+
+        # Ekstra geçişler: döngüler oluşsun
+        for x in range(1, width - 1):
+            for y in range(1, height - 1):
+                if (x + y) % 2 == 1 and cells[y * width + x] == BREAKABLE:
+                    if rng.random() < self.loop_chance:
+                        cells[y * width + x] = EMPTY
+
+
+class OpenArenaLayout(LevelLayout):
+    """
+    Açık arena: sadece kenar + seyrek BREAKABLE, pillar yok.
+    """
+
+    name = "open_arena"
+
+    def __init__(self, breakable_chance: float = 0.15):
+        self.breakable_chance = breakable_chance
+
+    def fill(self, cells, width, height, rng, reserved):
+        self._fill_border(cells, width, height)
+
+        chance = self.breakable_chance
+        for x in range(1, width - 1):
+            for y in range(1, height - 1):
+                if (x, y) in reserved:
+                    continue
+                if rng.random() < chance:
+                    cells[y * width + x] = BREAKABLE
+
+
+# ====================================================
+# GENERATOR
+# ====================================================
+
+class LevelGenerator:
+    """
+    Seed'li procedural level üretici.
+    - Her generator kendi random.Random'unu tutar (global RNG'ye dokunmaz)
+    - Layout ve seed config'ten gelir (LEVEL_LAYOUT, LEVEL_SEED)
+    - Çıktı: LevelGrid (World doğrudan tüketir)
+    """
+
+    def __init__(self, layout: LevelLayout, seed: int | None = None):
+        self.layout = layout
+        self.seed = seed
+        self.rng = random.Random(seed)
+
+    @classmethod
+    def from_config(cls, config, layout: str | None = None, seed: int | None = None) -> "LevelGenerator":
+        name = layout or getattr(config, "LEVEL_LAYOUT", "classic")
+        if seed is None:
+            seed = getattr(config, "LEVEL_SEED", None)
+
+        if name == ClassicLayout.name:
+            impl: LevelLayout = ClassicLayout(
+                float(getattr(config, "LEVEL_BREAKABLE_CHANCE", 0.45)))
+        elif name == MazeLayout.name:
+            impl = MazeLayout(float(getattr(config, "LEVEL_MAZE_LOOP_CHANCE", 0.1)))
+        elif name == OpenArenaLayout.name:
+            impl = OpenArenaLayout(
+                float(getattr(config, "LEVEL_OPEN_BREAKABLE_CHANCE", 0.15)))
+        else:
+            raise ValueError(f"Unknown level layout: {name}")
+
+        return cls(impl, seed=seed)
+
+    def generate(self, width: int, height: int, reserved: Iterable[GridPos] = ()) -> LevelGrid:
+        reserved_set = set(reserved)
+        cells = bytearray(width * height)
+
+        self.layout.fill(cells, width, height, self.rng, reserved_set)
+
+        # Reserved tile'lar (spawn alanları) her layout'ta boş kalsın; kenar hariç
+        for x, y in reserved_set:
+            if 0 <= x < width and 0 <= y < height:
+                i = y * width + x
+                if cells[i] != UNBREAKABLE:
+                    cells[i] = EMPTY
+
+        return LevelGrid(width, height, bytes(cells), self.layout.name, self.seed)
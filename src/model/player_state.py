@@ -1,6 +1,8 @@
 # src/model/player_state.py
 from __future__ import annotations
 
+from model.sim_clock import tick_rate, to_ticks
+
 
 class PlayerState:
     """
@@ -30,14 +32,27 @@ class NormalState(PlayerState):
     pass
 
 
+class RemoteSpeedState(PlayerState):
+    """
+    Client'taki player için server'ın snapshot'ta bildirdiği hız çarpanı (prediction aynı hızla
+    koşsun diye). Süre server'da sayılır; çarpan 1'e dönünce snapshot NormalState'e geri alır.
+    """
+    def __init__(self, player: "Player", multiplier: float):
+        super().__init__(player)
+        self.multiplier = multiplier
+
+    def get_speed(self) -> float:
+        return self.player.base_speed * self.multiplier
+
+
 class SpeedBoostState(PlayerState):
     """
-    Geçici hız artışı sağlayan state.
+    Geçici hız artışı sağlayan state. Süre tick cinsinden sayılır (update tick başına bir kez).
     """
     def __init__(self, player: "Player", duration: float = 5.0, multiplier: float = 3.0):
         super().__init__(player)
         self.duration = duration
-        self.remaining = duration
+        self.remaining_ticks = to_ticks(duration, tick_rate(player.config))
         self.multiplier = multiplier
 
     def enter(self):
@@ -47,8 +62,8 @@ class SpeedBoostState(PlayerState):
         print("[State] SpeedBoostState exit")
 
     def update(self, dt: float):
-        self.remaining -= dt
-        if self.remaining <= 0:
+        self.remaining_ticks -= 1
+        if self.remaining_ticks <= 0:
             # Süre bitti → NormalState'e geç
             from model.player_state import NormalState
             self.player.change_state(NormalState(self.player))
@@ -0,0 +1,25 @@
+# src/model/sim_clock.py
+"""
+Fixed-step simülasyon saati yardımcıları.
+World her tick'te sabit 1 / TICK_RATE saniye ilerler; bomba fitili, patlama FX ömrü,
+player invincibility / hız boost'u ve enemy karar aralığı gibi sayaçlar tick sayısı olarak
+tutulur (pygame saatine bağlı değil).
+"""
+from __future__ import annotations
+
+
+def tick_rate(config) -> int:
+    """Simülasyon frekansı (tick/sn); TICK_RATE yoksa FPS."""
+    return max(1, int(getattr(config, "TICK_RATE", getattr(config, "FPS", 60))))
+
+
+def to_ticks(seconds: float, rate: int) -> int:
+    """Saniye cinsinden süreyi tick sayısına çevirir (en az 1 tick)."""
+    return max(1, int(round(seconds * rate)))
+
+
+def send_interval(config) -> int:
+    """İki snapshot gönderimi arasındaki tick sayısı (TICK_RATE / NET_SEND_RATE, en az 1)."""
+    rate = tick_rate(config)
+    send_rate = max(1, int(getattr(config, "NET_SEND_RATE", rate)))
+    return max(1, int(round(rate / send_rate)))
@@ -0,0 +1,65 @@
+# src/model/spatial_hash.py
+from __future__ import annotations
+
+from typing import Any, Dict, List, Tuple
+
+
+Cell = Tuple[int, int]
+
+
+class SpatialHash:
+    """
+    Dinamik entity'ler için uniform-grid spatial hash (hücre = tile).
+    Bir entity rect'inin kapladığı tüm hücrelere eklenir; query(rect) sadece
+    rect'in hücrelerindeki adayları döndürür. Her tick rebuild edilir.
+    """
+
+    def __init__(self, cell_size: int):
+        self.cell_size = cell_size
+        self._cells: Dict[Cell, List[Any]] = {}
+
+    def clear(self) -> None:
+        self._cells.clear()
+
+    def _cell_range(self, rect) -> tuple[int, int, int, int]:
+        cs = self.cell_size
+        return (
+            rect.left // cs,
+            (rect.right - 1) // cs,
+            rect.top // cs,
+            (rect.bottom - 1) // cs,
+        )
+
+    def insert(self, obj: Any, rect=None) -> None:
+        r = obj.rect if rect is None else rect
+        x0, x1, y0, y1 = self._cell_range(r)
+        cells = self._cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    cells[(cx, cy)] = [obj]
+                else:
+                    bucket.append(obj)
+
+    def rebuild(self, objs) -> None:
+        self._cells.clear()
+        for obj in objs:
+            self.insert(obj)
+
+    def query(self, rect) -> List[Any]:
+        """rect ile aynı hücreleri paylaşan adaylar (tekrarsız). Kesin test çağıranda."""
+        x0, x1, y0, y1 = self._cell_range(rect)
+        cells = self._cells
+        out: List[Any] = []
+        seen: set[int] = set()
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if not bucket:
+                    continue
+                for obj in bucket:
+                    if id(obj) not in seen:
+                        seen.add(id(obj))
+                        out.append(obj)
+        return out
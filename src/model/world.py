@@ -1,16 +1,26 @@
-import random
 import pygame
 from factory.entity_factory import EntityFactory
 from model.entities import WallType
 from factory.powerup_factory import PowerUpFactory
 from model.enemy import Enemy
-from model.ai.move_strategies import RandomMoveStrategy, ChasePlayerStrategy
-from model.entities import ExplosionFX
+from model.ai.move_strategies import RandomMoveStrategy, ChasePlayerStrategy, BombAwareStrategy
+from model.explosion_resolver import ExplosionResolver
+from model.spatial_hash import SpatialHash
+from model.ai.flow_field import FlowField
+from model.ai.danger_map import DangerMap
+from model.ai.dir_mask import DIRS, RIGHT, LEFT, DOWN, UP, REVERSE_BIT
+from model.grid_changes import GridChangeFeed, GridChangeKind
+from model.level_generator import LevelGenerator, LevelGrid
+from model.sim_clock import tick_rate
 
 
 
 class World:
-    def __init__(self, config):
+    def __init__(self, config, level: LevelGrid | None = None):
+        """
+        level: önceden üretilmiş (ör. LevelPool'dan gelen) kompakt grid.
+        Verilmezse config'teki LevelGenerator ile yeniden üretilir.
+        """
         self.config = config
         self.factory = EntityFactory(config)
 
@@ -22,25 +32,51 @@ class World:
         self.player=self.players[1]  # tek oyunculu için
 
         self.walls = []
+        # Tile index: (gx, gy) -> duvar referansı ve tipi, O(1) sorgu için.
+        # walls listesi çizim/snapshot için duruyor, ikisi birlikte güncellenir.
+        self._wall_grid = [[None] * config.GRID_HEIGHT for _ in range(config.GRID_WIDTH)]
+        self._wall_type_grid = [[None] * config.GRID_HEIGHT for _ in range(config.GRID_WIDTH)]
+        # Tile başına açık-komşu bitmask'i (bkz. ai.dir_mask); level yüklenince kurulur,
+        # sonra sadece duvar değişince güncellenir
+        self._open_mask: list[list[int]] = []
+        # Grid değişiklik feed'i: duvar/bomba/hedef değişince AI cache'lerine dirty tile'lar
+        self.grid_changes = GridChangeFeed()
+        self._target_tiles: tuple = ()
         self.bombs = []
 
         self.powerups=[]
         self.powerup_factory = PowerUpFactory(config)
 
+        # Procedural level: kendi RNG'si var, global random'a dokunmaz
+        self.level_generator = LevelGenerator.from_config(config)
+
         self.enemies = []
 
         self.explosions_fx = []
+        self.explosion_resolver = ExplosionResolver(self)
+
+        # Dinamik entity temasları için tile bazlı spatial hash
+        self.player_hash = SpatialHash(config.TILE_SIZE)
+
+        # Chaser AI için player'lara BFS mesafe haritası (grid_changes'e abone, lazy)
+        self.flow_field = FlowField(self)
+
+        # Fixed-step simülasyon saati: tick sayacı + sabit tick süresi.
+        # time = tick * tick_dt (sn); pygame saatine bağlı değil, headless çalışır.
+        self.tick_rate = tick_rate(config)
+        self.tick_dt = 1.0 / self.tick_rate
+        self.tick = 0
+        self.time = 0.0
+        self._accumulator = 0.0
+        # Bomba tehlike haritası (tüm enemy'ler paylaşır)
+        self.danger_map = DangerMap(self)
 
-        self._build_level()
         ts = self.config.TILE_SIZE
-        
 
         # Enemy spawn noktaları (grid koordinatı)
-        enemy_spawns = [
-            (self.config.GRID_WIDTH - 2, self.config.GRID_HEIGHT - 2),
-            (self.config.GRID_WIDTH - 3, self.config.GRID_HEIGHT - 2),
-        ]
-        self._clear_enemy_spawn_area(enemy_spawns)
+        enemy_spawns = World.enemy_spawn_points(self.config.GRID_WIDTH, self.config.GRID_HEIGHT)
+        # Spawn alanı level üretilirken boş bırakılıyor (sonradan duvar silmeye gerek yok)
+        self._build_level(level)
 
          # Enemy'leri oluştur ve listeye ekle
 
@@ -49,8 +85,9 @@ class World:
                 enemy_spawns[0][0],
                 enemy_spawns[0][1],
                 ts,
-                strategy=RandomMoveStrategy(),
-                enemy_type=1
+                strategy=self._enemy_strategy(RandomMoveStrategy()),
+                enemy_type=1,
+                rate=self.tick_rate,
             )
         )
 
@@ -59,8 +96,9 @@ class World:
                 enemy_spawns[1][0],
                 enemy_spawns[1][1],
                 ts,
-                strategy=ChasePlayerStrategy(),
-                enemy_type=2
+                strategy=self._enemy_strategy(ChasePlayerStrategy()),
+                enemy_type=2,
+                rate=self.tick_rate,
             )
         )
 
@@ -69,107 +107,183 @@ class World:
 
 
 
-    def _build_level(self):
+    def _enemy_strategy(self, strategy):
+        # Config açıksa enemy'ler danger map'e bakıp blast alanına girmez
+        if getattr(self.config, "ENEMY_BOMB_AWARE", False):
+            return BombAwareStrategy(strategy)
+        return strategy
+
+    def _build_level(self, level: LevelGrid | None = None):
+        """
+        Level, LevelGenerator'dan kompakt bir grid olarak gelir
+        (layout + seed config'te), sonra tek geçişte Wall objelerine çevrilir.
+        Hazır bir grid verildiyse üretim tamamen atlanır.
+        """
         gw, gh = self.config.GRID_WIDTH, self.config.GRID_HEIGHT
 
-        # -------------------------
-        # 1) Kenar: UNBREAKABLE walls
-        # -------------------------
-        for x in range(gw):
-            self.walls.append(
-                self.factory.create(
-                    "wall",
-                    x=x,
-                    y=0,
-                    wall_type=WallType.UNBREAKABLE,
-                )
-            )
-            self.walls.append(
-                self.factory.create(
-                    "wall",
-                    x=x,
-                    y=gh - 1,
-                    wall_type=WallType.UNBREAKABLE,
-                )
-            )
+        if level is None:
+            level = self.level_generator.generate(gw, gh, World.reserved_level_cells(gw, gh))
+        elif (level.width, level.height) != (gw, gh):
+            raise ValueError(
+                f"Level size {level.width}x{level.height} does not match grid {gw}x{gh}")
+
+        self._load_level(level)
+
+    def _load_level(self, level: LevelGrid) -> None:
+        # Toplu yükleme: duvar başına 4 komşu mask güncellemesi yok, mask'ler LevelGrid'de
+        # level başına bir kez hesaplanmış halinden kopyalanır
+        create = self.factory.create
+        walls = self.walls
+        grid = self._wall_grid
+        types = self._wall_type_grid
+        for gx, gy, wall_type in level.iter_walls():
+            if grid[gx][gy] is not None:
+                continue
+            wall = create("wall", x=gx, y=gy, wall_type=wall_type)
+            walls.append(wall)
+            grid[gx][gy] = wall
+            types[gx][gy] = wall_type
+        self._open_mask = [list(column) for column in level.open_masks]
+        self.grid_changes.publish(GridChangeKind.RESET)
+
+    @staticmethod
+    def enemy_spawn_points(gw: int, gh: int) -> list[tuple[int, int]]:
+        return [(gw - 2, gh - 2), (gw - 3, gh - 2)]
+
+    @staticmethod
+    def reserved_level_cells(gw: int, gh: int) -> list[tuple[int, int]]:
+        """
+        Level üretiminde boş kalması gereken tile'lar:
+        oyuncunun spawn çevresi + enemy spawn alanı.
+        """
+        reserved = [(1, 1), (1, 2), (2, 1)]
+        reserved.extend(World._spawn_area_cells(World.enemy_spawn_points(gw, gh), gw, gh))
+        return reserved
 
-        for y in range(gh):
-            self.walls.append(
-                self.factory.create(
-                    "wall",
-                    x=0,
-                    y=y,
-                    wall_type=WallType.UNBREAKABLE,
-                )
-            )
-            self.walls.append(
-                self.factory.create(
-                    "wall",
-                    x=gw - 1,
-                    y=y,
-                    wall_type=WallType.UNBREAKABLE,
-                )
-            )
+    @staticmethod
+    def _spawn_area_cells(spawns: list[tuple[int, int]], gw: int, gh: int) -> list[tuple[int, int]]:
+        offsets = [(0,0), (1,0), (-1,0), (0,1), (0,-1)]
+        cells = []
+        for sx, sy in spawns:
+            for dx, dy in offsets:
+                gx, gy = sx + dx, sy + dy
+                if 0 <= gx < gw and 0 <= gy < gh:
+                    cells.append((gx, gy))
+        return cells
+
+    # -------------------------
+    # WALL INDEX (tile -> wall)
+    # -------------------------
 
-        # -------------------------
-        # 2) İçerideki HARD walls
-        #    Satranç tahtası gibi 2x2 aralıklarla
-        # -------------------------
-        for x in range(2, gw - 2, 2):
-            for y in range(2, gh - 2, 2):
-                self.walls.append(
-                    self.factory.create(
-                        "wall",
-                        x=x,
-                        y=y,
-                        wall_type=WallType.HARD,
-                    )
-                )
-
-        # -------------------------
-        # 3) Aralara BREAKABLE walls (rastgele)
-        # -------------------------
-        random.seed(0)  # deterministik olsun, her çalıştırmada aynı map gelsin
-
-        for x in range(1, gw - 1):
-            for y in range(1, gh - 1):
-
-                # Oyuncunun spawn çevresini boş bırak
-                if (x, y) in [(1, 1), (1, 2), (2, 1)]:
-                    continue
-
-                # Bu tile'da zaten bir UNBREAKABLE/HARD var mı?
-                occupied = any(
-                    (w.rect.x // self.config.TILE_SIZE == x)
-                    and (w.rect.y // self.config.TILE_SIZE == y)
-                    for w in self.walls
-                )
-                if occupied:
-                    continue
-
-                # %45 ihtimalle kırılabilir duvar koy
-                if random.random() < 0.45:
-                    self.walls.append(
-                        self.factory.create(
-                            "wall",
-                            x=x,
-                            y=y,
-                            wall_type=WallType.BREAKABLE,
-                        )
-                    )
+    def _in_grid(self, gx: int, gy: int) -> bool:
+        return 0 <= gx < self.config.GRID_WIDTH and 0 <= gy < self.config.GRID_HEIGHT
+
+    def _add_wall(self, gx: int, gy: int, wall_type: WallType, notify: bool = True):
+        """
+        (gx, gy) tile'ına duvar koyar; walls listesi ve tile index birlikte güncellenir.
+        Tile zaten doluysa mevcut duvarı döndürür (köşelerde çift duvar oluşmasın).
+        """
+        existing = self._wall_grid[gx][gy]
+        if existing is not None:
+            return existing
+        wall = self.factory.create("wall", x=gx, y=gy, wall_type=wall_type)
+        self.walls.append(wall)
+        self._wall_grid[gx][gy] = wall
+        self._wall_type_grid[gx][gy] = wall_type
+        self._set_neighbour_bits(gx, gy, opened=False)
+        if notify:
+            self.grid_changes.publish(GridChangeKind.WALL_ADDED, [(gx, gy)])
+        return wall
+
+    def _remove_wall(self, wall) -> None:
+        ts = self.config.TILE_SIZE
+        gx = wall.rect.x // ts
+        gy = wall.rect.y // ts
+        if self._in_grid(gx, gy) and self._wall_grid[gx][gy] is wall:
+            self._wall_grid[gx][gy] = None
+            self._wall_type_grid[gx][gy] = None
+            self._set_neighbour_bits(gx, gy, opened=True)
+            self.grid_changes.publish(GridChangeKind.WALL_REMOVED, [(gx, gy)])
+        if wall in self.walls:
+            self.walls.remove(wall)
+
+    def rebuild_wall_index(self) -> None:
+        """
+        walls listesi dışarıdan komple değiştirildiğinde (client snapshot) index'i yeniden kurar.
+        """
+        gw, gh = self.config.GRID_WIDTH, self.config.GRID_HEIGHT
+        ts = self.config.TILE_SIZE
+        self._wall_grid = [[None] * gh for _ in range(gw)]
+        self._wall_type_grid = [[None] * gh for _ in range(gw)]
+        for w in self.walls:
+            gx = w.rect.x // ts
+            gy = w.rect.y // ts
+            if self._in_grid(gx, gy):
+                self._wall_grid[gx][gy] = w
+                self._wall_type_grid[gx][gy] = getattr(w, "wall_type", None)
+        self._open_mask = self._compute_open_masks()
+        self.grid_changes.publish(GridChangeKind.RESET)
+
+    def _compute_open_masks(self) -> list[list[int]]:
+        """Tüm grid için açık-komşu mask'lerini duvar listesinden baştan hesaplar (snapshot / rebuild)."""
+        gw, gh = self.config.GRID_WIDTH, self.config.GRID_HEIGHT
+        grid = self._wall_grid
+        masks = [[0] * gh for _ in range(gw)]
+        for gx in range(gw):
+            column = grid[gx]
+            out = masks[gx]
+            for gy in range(gh):
+                m = 0
+                if gx + 1 < gw and grid[gx + 1][gy] is None:
+                    m |= RIGHT
+                if gx > 0 and grid[gx - 1][gy] is None:
+                    m |= LEFT
+                if gy + 1 < gh and column[gy + 1] is None:
+                    m |= DOWN
+                if gy > 0 and column[gy - 1] is None:
+                    m |= UP
+                out[gy] = m
+        return masks
+
+    def _set_neighbour_bits(self, gx: int, gy: int, opened: bool) -> None:
+        """
+        (gx, gy)'ye duvar eklendi/kaldırıldı: 4 komşunun bu tile'a bakan bitini günceller.
+        Tile'ın kendi mask'i komşularına bağlı olduğu için değişmez.
+        """
+        masks = self._open_mask
+        for dx, dy in DIRS:
+            nx, ny = gx + dx, gy + dy
+            if not self._in_grid(nx, ny):
+                continue
+            # Komşudan (gx, gy)'ye giden yön = (-dx, -dy)
+            bit = REVERSE_BIT[(dx, dy)]
+            if opened:
+                masks[nx][ny] |= bit
+            else:
+                masks[nx][ny] &= ~bit
+
+    def open_mask_at(self, gx: int, gy: int) -> int:
+        """(gx, gy)'den duvarsız komşulara giden yönlerin bitmask'i; map dışı -> 0."""
+        if not self._in_grid(gx, gy):
+            return 0
+        return self._open_mask[gx][gy]
+
+    def wall_type_at(self, gx: int, gy: int):
+        if not self._in_grid(gx, gy):
+            return None
+        return self._wall_type_grid[gx][gy]
 
     def is_blocking(self, pos):
+        """Patlama için: map dışı veya UNBREAKABLE duvar -> blast bu tile'a giremez."""
         gx, gy = pos
         if gx < 0 or gy < 0 or gx >= self.config.GRID_WIDTH or gy >= self.config.GRID_HEIGHT:
             return True
-        return self.is_solid_cell(gx, gy)
+        return self.wall_type_at(gx, gy) == WallType.UNBREAKABLE
 
     def is_breakable(self, pos):
+        """Patlama için: hasar alabilen duvar (HARD/BREAKABLE) -> blast burada durur."""
         gx, gy = pos
-        ts = self.config.TILE_SIZE
-        r = pygame.Rect(gx * ts, gy * ts, ts, ts)
-        # breakable duvarlarını nasıl tutuyorsan ona göre:
-        return any(getattr(w, "breakable", False) and w.rect.colliderect(r) for w in self.walls)
+        return self.wall_type_at(gx, gy) in (WallType.BREAKABLE, WallType.HARD)
 
 
 
@@ -177,26 +291,79 @@ class World:
     # GAME LOOP API
     # -------------------------
 
+    # Uzun bir frame'den sonra simülasyonun yetişmeye çalışacağı en fazla tick
+    MAX_CATCHUP_TICKS = 5
+
     def update(self, dt):
+        """
+        Gerçek zamanlı döngü için: değişken frame dt'si biriktirilir,
+        simülasyon sabit tick_dt adımlarıyla ilerler (frame jitter sonucu değiştirmez).
+        """
+        self._accumulator += dt
+        n = int(self._accumulator / self.tick_dt)
+        if n > self.MAX_CATCHUP_TICKS:
+            # Çok geride kaldık: kalan süreyi at, spiral of death olmasın
+            n = self.MAX_CATCHUP_TICKS
+            self._accumulator = 0.0
+        else:
+            self._accumulator -= n * self.tick_dt
+        if n:
+            self.step(n)
+
+    def step(self, n: int = 1, until=None) -> int:
+        """
+        Simülasyonu gerçek zamandan bağımsız, olabildiğince hızlı n tick ilerletir
+        (bot / test / server yük ölçümü). until(world) True dönerse erken durur.
+        Çalışan tick sayısını döndürür.
+        """
+        for i in range(n):
+            self._tick()
+            if until is not None and until(self):
+                return i + 1
+        return n
+
+    def _tick(self) -> None:
+        dt = self.tick_dt
+        self.tick += 1
+        self.time = self.tick * dt
+
         for p in self.players.values():
             p.update(dt, self)
 
+        # Player'lar bu tick'te artık hareket etmiyor: hash'i bir kez kur,
+        # enemy teması ve power-up toplama sadece komşu hücrelere baksın
+        self.player_hash.rebuild(self.players.values())
+
+        # Hedef player tile'ları değiştiyse path cache'lerine haber ver
+        self._publish_target_moves()
+
+        # Enemy hareketi; karar zamanı gelenler toplanıp tek AI fazında işlenir
+        deciding = [e for e in self.enemies if e.advance(dt)]
+        if deciding:
+            self._ai_phase(deciding)
+
         for e in self.enemies:
-            e.update(dt, self)
-            for p in self.players.values():
+            for p in self.player_hash.query(e.rect):
                 if e.rect.colliderect(p.rect):
                     p.take_damage(1)
 
 
-        for bomb in list(self.bombs):
+        for bomb in self.bombs:
             bomb.update(dt, self)
 
-        # explosion FX cleanup
+        # Fitili biten bombalar tek batch'te (zincirleme dahil) patlar
+        due = [b for b in self.bombs if not b.exploded and b.fuse_ticks <= 0]
+        if due:
+            self.detonate_bombs(due)
+
+        # explosion FX: ömür tick cinsinden
+        for fx in self.explosions_fx:
+            fx.tick()
         self.explosions_fx = [fx for fx in self.explosions_fx if fx.alive()]
 
 
         for pu in list(self.powerups):
-            for p in self.players.values():
+            for p in self.player_hash.query(pu.rect):
                 if pu.rect.colliderect(p.rect):
                     pu.apply(p)
                     if hasattr(self.config,"game"):
@@ -205,6 +372,35 @@ class World:
                         break
 
 
+    def _ai_phase(self, enemies) -> None:
+        """
+        Batched AI tick: karar verecek tüm enemy'lerin açık-komşu mask'leri
+        kalıcı mask grid'inden tek geçişte okunur, her strategy hazır mask ile çalışır.
+        """
+        masks = self.open_masks([e.grid_pos() for e in enemies])
+        for e, mask in zip(enemies, masks):
+            e.decide(self, mask)
+
+    def open_masks(self, tiles) -> list[int]:
+        """Her (gx, gy) için duvarsız komşu yönlerinin bitmask'i (bkz. ai.dir_mask)."""
+        return [self.open_mask_at(gx, gy) for gx, gy in tiles]
+
+    def _publish_target_moves(self) -> None:
+        ts = self.config.TILE_SIZE
+        tiles = tuple(
+            (p.rect.centerx // ts, p.rect.centery // ts)
+            for p in self.iter_players()
+            if getattr(p, "alive", False)
+        )
+        if tiles != self._target_tiles:
+            changed = set(tiles) ^ set(self._target_tiles)
+            self._target_tiles = tiles
+            self.grid_changes.publish(GridChangeKind.TARGET_MOVED, changed)
+
+    def live_bomb_tiles(self) -> set[tuple[int, int]]:
+        ts = self.config.TILE_SIZE
+        return {(b.rect.x // ts, b.rect.y // ts) for b in self.bombs if not b.exploded}
+
     def draw(self, s):
         moving = getattr(self, "moving", False)
         frame = (pygame.time.get_ticks() // 120) % 3 if moving else 1
@@ -213,13 +409,36 @@ class World:
         # Şu an Renderer.draw_world kullanıyoruz, o yüzden burada bir şey yapmıyoruz.
 
 
+    def walls_near_rect(self, rect) -> list:
+        """
+        Broad-phase: pixel rect'in kapladığı tile'lardaki duvarları döndürür.
+        Player gibi tile'dan küçük bir rect için en fazla 4 aday çıkar,
+        harita büyüklüğünden ve duvar sayısından bağımsız.
+        """
+        ts = self.config.TILE_SIZE
+        if rect.width <= 0 or rect.height <= 0:
+            return []
+        x0 = max(rect.left // ts, 0)
+        x1 = min((rect.right - 1) // ts, self.config.GRID_WIDTH - 1)
+        y0 = max(rect.top // ts, 0)
+        y1 = min((rect.bottom - 1) // ts, self.config.GRID_HEIGHT - 1)
+        grid = self._wall_grid
+        out = []
+        for gx in range(x0, x1 + 1):
+            column = grid[gx]
+            for gy in range(y0, y1 + 1):
+                w = column[gy]
+                if w is not None:
+                    out.append(w)
+        return out
+
     def collides_with_solid(self, rect):
-        return any(rect.colliderect(w.rect) for w in self.walls)
+        return any(rect.colliderect(w.rect) for w in self.walls_near_rect(rect))
     
     def is_solid_cell(self, gx: int, gy: int) -> bool:
-        ts = self.config.TILE_SIZE
-        cell_rect = pygame.Rect(gx * ts, gy * ts, ts, ts)
-        return any(cell_rect.colliderect(w.rect) for w in self.walls)
+        if not self._in_grid(gx, gy):
+            return False
+        return self._wall_grid[gx][gy] is not None
 
 
     
@@ -228,13 +447,9 @@ class World:
         Verilen grid koordinatında (gx, gy) bir duvar varsa onu döndürür,
         yoksa None döner.
         """
-        ts=self.config.TILE_SIZE
-        for w in self.walls:
-            wx = w.rect.x // ts
-            wy = w.rect.y // ts
-            if wx == gx and wy == gy:
-                return w 
-        return None
+        if not self._in_grid(gx, gy):
+            return None
+        return self._wall_grid[gx][gy]
     
 
 
@@ -259,172 +474,18 @@ class World:
             owner=owner,
             )
         self.bombs.append(bomb)
+        self.grid_changes.publish(GridChangeKind.BOMB_PLACED, [(tile_x, tile_y)])
 
-    def handle_explosion(self, bomb, tiles=None):
-            
-            print("[World] handle_explosion called, bomb in bombs:", hasattr(self,"bombs") and (bomb in self.bombs))
-
-            ts = self.config.TILE_SIZE
-        # Bombanın grid koordinatı
-            gx = bomb.rect.x // ts
-            gy = bomb.rect.y // ts
-
-        # Bomba gücü (menzil)
-            power = getattr(bomb, "power", 2)
-
-            destroyed_walls = []
-
-        # tiles None gelirse patlamasın
-            tiles_list = list(tiles) if tiles else []
-
-            blast_tiles = set(tiles_list)
-            blast_tiles.add((gx, gy))
-
-            # FX: sadece blast_tiles üzerinden bas
-            for (tx, ty) in blast_tiles:
-                self.explosions_fx.append(ExplosionFX(tx * ts, ty * ts, ts))
-
-            
-
-
-        # --- Merkez tile'da duvar varsa önce onu kontrol et ---
-            center_wall = self._get_wall_at(gx, gy)
-            if center_wall is not None:
-                if getattr(center_wall, "wall_type", None) != WallType.UNBREAKABLE:
-                    if hasattr(center_wall, "take_damage"):
-                        if center_wall.take_damage():
-                            destroyed_walls.append(center_wall)
-                    else:
-                        if getattr(center_wall, "wall_type", None) == WallType.BREAKABLE:
-                            destroyed_walls.append(center_wall)
-
-        # --- Dört yöne doğru yayıl (duvar bloklama burada) ---
-            directions = [
-                (1, 0),   # sağ
-                (-1, 0),  # sol
-                (0, -1),  # yukarı
-                (0, 1),   # aşağı
-                ]
-            
-            gw, gh = self.config.GRID_WIDTH, self.config.GRID_HEIGHT
-
-            ts = self.config.TILE_SIZE
-            for (tx, ty) in tiles:
-                self.explosions_fx.append(ExplosionFX(tx * ts, ty * ts, ts))
-
-            if bomb in self.bombs:
-                self.bombs.remove(bomb)
-
-            
-            for dx, dy in directions:
-                for step in range(1, power + 1):
-                    nx = gx + dx * step
-                    ny = gy + dy * step
-
-                # Harita dışı
-                    if nx < 0 or ny < 0 or nx >= gw or ny >= gh:
-                        break
-
-                    wall = self._get_wall_at(nx, ny)
-
-                # Boş tile -> patlama etkiler, devam eder
-                    if wall is None:
-                        blast_tiles.add((nx, ny))
-                        continue
-
-                # Duvarın olduğu tile'a kadar patlama gelir
-                    blast_tiles.add((nx, ny))
-
-                # UNBREAKABLE -> hasar yok, bu yönde dur
-                    if getattr(wall, "wall_type", None) == WallType.UNBREAKABLE:
-                        break
-
-                # HARD / BREAKABLE -> hasar ver (varsa take_damage)
-                    if hasattr(wall, "take_damage"):
-                        destroyed = wall.take_damage()
-                    else:
-                        destroyed = (getattr(wall, "wall_type", None) == WallType.BREAKABLE)
-
-                    if destroyed:
-                        destroyed_walls.append(wall)
-
-                # Duvar gördükten sonra patlama o yönde devam etmez
-                    break
-    # --- Duvarları sil + breakable'lardan power-up dene ---
-                
-            for wall in destroyed_walls:
-                wx = wall.rect.x // ts
-                wy = wall.rect.y // ts
-
-                if wall in self.walls:
-                    self.walls.remove(wall)
-
-            # Sadece BREAKABLE duvarlardan power-up çıksın
-                if getattr(wall, "wall_type", None) == WallType.BREAKABLE:
-                    if hasattr(self.config, "game"):
-                        self.config.game.score += 10
-                    max_pu=int(getattr(self.config,"MAX_POWERUPS_ON_MAP",9999))
-                    if len(self.powerups) < max_pu:
-                        pu=self.powerup_factory.maybe_spawn(wx, wy)
-                        if pu is not None:
-                            self.powerups.append(pu)
-                            
-            # --- Bombayı listeden sil ---
-            if bomb in self.bombs:
-                self.bombs.remove(bomb)
-
-
-    # -------------------------
-    # 💀 ENEMY HIT CHECK (explosion kills enemies)
-    # -------------------------
-            ts = self.config.TILE_SIZE
-
-            for e in list(self.enemies):
-                ex = e.rect.centerx // ts
-                ey = e.rect.centery // ts
-
-                if (ex, ey) in blast_tiles:
-                    died = e.take_damage(1) if hasattr(e, "take_damage") else True
-
-                    if died:
-                        if e in self.enemies:
-                            self.enemies.remove(e)
-
-                        # skor (istersen type'a göre değiştir)
-                        if hasattr(self.config, "game"):
-                            bonus = 50 if getattr(e, "enemy_type", 1) == 1 else 80
-                            self.config.game.score += bonus
-
+    def detonate_bombs(self, bombs) -> set[tuple[int, int]]:
+        """
+        Verilen bombaları (ve blast'ın değdiği diğer bombaları) tek seferde patlatır.
+        Etkilenen tile set'ini döndürür.
+        """
+        return self.explosion_resolver.resolve(bombs)
 
-    # -------------------------
-    # 💥 PLAYER HIT CHECK
-    # -------------------------
-            ts = self.config.TILE_SIZE
-
-            for p in self.players.values():
-                px = p.rect.centerx // ts
-                py = p.rect.centery // ts
-
-                if (px, py) in blast_tiles:
-                    damage = getattr(self.config, "BOMB_DAMAGE", 1)
-                    p.take_damage(damage)
-                    
-                    if not p.alive:
-                        print(f"[World] Player {getattr(p,'id', '?')} killed by explosion!")
-
-            # --- bomb cleanup (mutlaka) ---
-            try:
-                if hasattr(self, "bombs") and bomb in self.bombs:
-                    self.bombs.remove(bomb)
-            except Exception as e:
-                print("[ERROR] bomb cleanup:", repr(e))
-
-            # owner bomb sayısını düşürüyorsan (sende varsa)
-            try:
-                if hasattr(bomb.owner, "active_bombs") and bomb.owner.active_bombs > 0:
-                    bomb.owner.active_bombs -= 1
-            except Exception:
-                pass
+    def handle_explosion(self, bomb, tiles=None):
+        # Eski API: tiles artık resolver içinde hesaplanıyor
+        self.detonate_bombs([bomb])
 
 
     def is_tile_free(self, gx, gy) -> bool:
@@ -439,21 +500,6 @@ class World:
                 return False
             
         return True
-    
-    # world.py içinde (World class)
-
-    def _clear_enemy_spawn_area(self, spawns: list[tuple[int, int]]) -> None:
-        offsets = [(0,0), (1,0), (-1,0), (0,1), (0,-1)]
-        for sx, sy in spawns:
-            for dx, dy in offsets:
-                gx, gy = sx + dx, sy + dy
-                w = self._get_wall_at(gx, gy)
-                if w is None:
-                    continue
-            # UNBREAKABLE hariç (HARD/BREAKABLE) temizle
-                if getattr(w, "wall_type", None) != WallType.UNBREAKABLE:
-                    if w in self.walls:
-                        self.walls.remove(w)
 
 
     def iter_players(self):
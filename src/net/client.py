@@ -1,24 +1,66 @@
 from __future__ import annotations
 import socket
 import threading
+import time
 import queue
-from typing import Any, Dict, Optional
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
 
-from net.protocol import send_json, recv_json
+from net.input_command import make_command
+from net.protocol import FrameReader, decode_payload, send_json
+from net.snapshot_codec import CODEC_BINARY, CODEC_JSON, choose_codec
+from net.snapshot_delta import SnapshotReceiver, SnapshotState, apply_dict
+from net.udp import (BIND_RETRY, BIND_TIMEOUT, INPUT_RESEND, MAX_UNACKED, encode_datagram,
+                     wrap_loss)
 
 
 class GameClient:
-    def __init__(self, host: str, port: int):
+    # Oyun thread'i okumazsa tamponda tutulacak en fazla snapshot
+    MAX_PENDING = 32
+
+    def __init__(self, host: str, port: int, codec: str = CODEC_BINARY, udp: bool = False,
+                 udp_loss: float = 0.0):
         self.host = host
         self.port = port
+        # Server sunarsa snapshot + input için UDP kanalı (net.udp); udp_loss: test için kayıp simülasyonu
+        self.use_udp = udp
+        self.udp_loss = udp_loss
+        self.udp: socket.socket | None = None
+        self._udp_out = None
+        # Tercih edilen snapshot codec'i; server sunmazsa JSON'a düşülür
+        self.preferred_codec = codec
+        self.codec = CODEC_JSON
 
         self.conn: socket.socket | None = None
+        # Soketten büyük parçalar okur, frame'leri kopyasız ayrıştırır (WELCOME + reader thread)
+        self._frames = FrameReader()
         self.running = False
 
         self.player_id: int | None = None
+        # WELCOME'dan: server simülasyon / snapshot gönderme hızı (eski server'da None)
+        self.tick_rate: int | None = None
+        self.send_rate: int | None = None
         self._inbox: "queue.Queue[Dict[str, Any]]" = queue.Queue()
-        self._last_snapshot: Optional[Dict[str, Any]] = None
         self._lock = threading.Lock()
+        # reader ACK'leri ile oyun thread'inin input'ları aynı sokete yazar
+        self._send_lock = threading.Lock()
+
+        # Delta snapshot'lar: reader her mesajdan tam state kurar ve sıraya ekler;
+        # oyun thread'i interpolasyon için hepsini sırayla alır
+        self._receiver = SnapshotReceiver()
+        self._states: Deque[SnapshotState] = deque(maxlen=self.MAX_PENDING)
+        self._applied: Optional[SnapshotState] = None
+        # TCP ve UDP reader'ları aynı receiver'ı kullanır; en yeni seq'ten eskisi atılır
+        self._recv_lock = threading.Lock()
+        self._newest_seq = 0
+
+        # Client prediction: INPUT'lar seq numaralı; gönderilenler oyun thread'inde local
+        # player'a da uygulanır (take_sent_inputs)
+        self.input_seq = 0
+        self._sent_inputs: List[Dict[str, Any]] = []
+        # UDP: server'ın henüz uygulamadığı input'lar (her datagram hepsini taşır)
+        self._unacked: Deque[Dict[str, Any]] = deque(maxlen=MAX_UNACKED)
+        self._input_sent_at = 0.0
 
     def connect(self) -> None:
         self.conn = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
@@ -26,24 +68,61 @@ class GameClient:
         self.conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
 
         # welcome al
-        welcome = recv_json(self.conn)
+        welcome = decode_payload(self._frames.read_frame(self.conn))
         if welcome.get("type") != "WELCOME":
             raise RuntimeError(f"Expected WELCOME, got {welcome}")
         self.player_id = int(welcome["player_id"])
+        self.tick_rate = welcome.get("tick_rate")
+        self.send_rate = welcome.get("send_rate")
         print(f"[Client] connected as player_id: {self.player_id}")
 
+        # snapshot codec negotiation: JSON varsayılan, HELLO sadece başka codec seçilirse
+        self.codec = choose_codec(welcome.get("codecs"), self.preferred_codec)
+        if self.codec != CODEC_JSON:
+            send_json(self.conn, {"type": "HELLO", "codec": self.codec})
+        print(f"[Client] snapshot codec: {self.codec}")
+
         self.running = True
         threading.Thread(target=self._reader, daemon=True).start()
 
+        if self.use_udp and welcome.get("udp"):
+            self._connect_udp(welcome["udp"])
+
+    def _connect_udp(self, info: Dict[str, Any]) -> None:
+        """UDP soketini server'a bağlar (BIND / BOUND); cevap gelmezse TCP'de kalınır."""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.connect((self.host, int(info["port"])))
+        sock.settimeout(BIND_RETRY)
+        out = wrap_loss(sock, self.udp_loss)
+        bind = encode_datagram({"type": "BIND", "token": info.get("token")})
+
+        deadline = time.monotonic() + BIND_TIMEOUT
+        while time.monotonic() < deadline:
+            try:
+                out.send(bind)
+                if decode_payload(sock.recv(65536)).get("type") == "BOUND":
+                    break
+            except (socket.timeout, ConnectionRefusedError, ValueError):
+                continue
+        else:
+            print("[Client] UDP bind failed, snapshots stay on TCP")
+            self._send({"type": "UDP_OFF"})
+            sock.close()
+            return
+
+        sock.settimeout(None)
+        self._udp_out = out
+        self.udp = sock
+        print(f"[Client] UDP channel on port {info['port']}")
+        threading.Thread(target=self._udp_reader, daemon=True).start()
+
     def _reader(self) -> None:
         assert self.conn is not None
         try:
             while self.running:
-                msg = recv_json(self.conn)
-                t = msg.get("type")
-                if t == "SNAPSHOT":
-                    with self._lock:
-                        self._last_snapshot = msg.get("data", {})
+                msg = decode_payload(self._frames.read_frame(self.conn))
+                if msg.get("type") == "SNAPSHOT":
+                    self._on_snapshot(msg.get("data", {}))
                 else:
                     self._inbox.put(msg)
         except Exception as e:
@@ -56,22 +135,146 @@ class GameClient:
             except Exception:
                 pass
 
-    def send_input(self, action: str, data: Dict[str, Any]) -> None:
-        if not self.conn or not self.running:
+    def _udp_reader(self) -> None:
+        sock = self.udp
+        assert sock is not None
+        while self.running:
+            try:
+                msg = decode_payload(sock.recv(65536))
+            except ConnectionRefusedError:
+                continue  # ICMP: server'ın UDP portu geçici olarak ulaşılamadı
+            except ValueError:
+                continue  # bozuk datagram
+            except OSError:
+                break
+            if msg.get("type") == "SNAPSHOT":
+                self._on_snapshot(msg.get("data", {}))
+        self.udp = None
+
+    def _on_snapshot(self, data: Dict[str, Any]) -> None:
+        """TCP ya da UDP'den gelen snapshot: state'i kurar, sıraya ekler ve ACK'ler."""
+        with self._recv_lock:
+            seq = data.get("seq")
+            if seq is not None and seq <= self._newest_seq:
+                # UDP'de geç / çift gelen eski snapshot atılır; en yenisi yeniden ACK'lenir
+                # (maç sonu snapshot'ının tekrarı ACK bekler)
+                self._send_ack(self._newest_seq)
+                return
+            state = self._receiver.receive(data)
+            if state is None:
+                # Baseline bilinmiyor: seq=0 ile server'dan keyframe iste
+                self._send_ack(0)
+                return
+            if state.seq is not None:
+                self._newest_seq = state.seq
+        with self._lock:
+            self._states.append(state)
+        if state.seq is not None:
+            self._send_ack(state.seq)
+        if self.udp is not None:
+            self._ack_inputs(state)
+
+    def _send_ack(self, seq: int) -> None:
+        # UDP'deyken ACK de datagram: kaybolursa bir sonraki snapshot'ın ACK'i yerini tutar
+        if not self._send_datagram({"type": "ACK", "seq": seq}):
+            self._send({"type": "ACK", "seq": seq})
+
+    def _send_datagram(self, payload: Dict[str, Any]) -> bool:
+        out = self._udp_out
+        if self.udp is None or out is None:
+            return False
+        try:
+            out.send(encode_datagram(payload))
+        except ConnectionRefusedError:
+            pass  # datagram kayboldu sayılır
+        except OSError:
+            return False
+        return True
+
+    def _ack_inputs(self, state: SnapshotState) -> None:
+        # Snapshot'taki input_seq'e kadar olanlar server'da uygulandı; kalanlar INPUT_RESEND'de bir tekrar
+        ps = state.players.get(str(self.player_id))
+        if ps is None:
+            return
+        acked = ps[6]
+        with self._send_lock:
+            while self._unacked and self._unacked[0]["seq"] <= acked:
+                self._unacked.popleft()
+            resend = bool(self._unacked) and time.monotonic() - self._input_sent_at >= INPUT_RESEND
+        if resend:
+            self._send_inputs()
+
+    def _send_inputs(self) -> None:
+        with self._send_lock:
+            cmds = list(self._unacked)
+            self._input_sent_at = time.monotonic()
+        self._send_datagram({"type": "CMDS", "cmds": cmds})
+
+    def _send_input_msg(self, msg: Dict[str, Any]) -> None:
+        self._sent_inputs.append(msg)
+        if self.udp is None:
+            self._send(msg)
+            return
+        with self._send_lock:
+            self._unacked.append(msg)
+        self._send_inputs()
+
+    def _send(self, payload: Dict[str, Any]) -> None:
+        conn = self.conn
+        if not conn or not self.running:
             return
         try:
-            send_json(self.conn, {"type": "INPUT", "action": action, "data": data})
+            with self._send_lock:
+                send_json(conn, payload)
         except OSError as e:
-            print("[Client] send_input failed:", repr(e))
+            print("[Client] send failed:", repr(e))
             self.running = False
             try:
-                self.conn.close()
+                conn.close()
             except Exception:
                 pass
             self.conn = None
 
+    def send_input(self, action: str, data: Dict[str, Any]) -> int:
+        """Tek-event INPUT'u seq numarasıyla gönderir; seq döner (snapshot'taki input_seq ile eşleşir)."""
+        self.input_seq += 1
+        msg = {"type": "INPUT", "seq": self.input_seq, "action": action, "data": data}
+        self._send_input_msg(msg)
+        return self.input_seq
+
+    def send_command(self, dirs: int, bomb: bool = False) -> int:
+        """Frame'in birleşik input komutu (net.input_command); seq döner."""
+        self.input_seq += 1
+        msg = make_command(self.input_seq, dirs, bomb)
+        self._send_input_msg(msg)
+        return self.input_seq
+
+    def take_sent_inputs(self) -> List[Dict[str, Any]]:
+        """Son çağrıdan beri gönderilen INPUT'lar (oyun thread'i, prediction için)."""
+        sent, self._sent_inputs = self._sent_inputs, []
+        return sent
+
+    def get_snapshots(self) -> List[Dict[str, Any]]:
+        """
+        Son çağrıdan beri gelen snapshot'lar, sırayla. Duvarlar bir öncekine göre artımlı
+        (ilk snapshot'ta tam liste).
+        """
+        with self._lock:
+            states = list(self._states)
+            self._states.clear()
+        out = []
+        for state in states:
+            out.append(apply_dict(state, self._applied))
+            self._applied = state
+        return out
+
     def get_snapshot(self) -> Optional[Dict[str, Any]]:
+        """Sadece en yeni snapshot (aradakiler atlanır); yeni snapshot yoksa None."""
         with self._lock:
-            snap = self._last_snapshot
-            self._last_snapshot = None
+            state = self._states[-1] if self._states else None
+            self._states.clear()
+        if state is None:
+            return None
+        snap = apply_dict(state, self._applied)
+        self._applied = state
         return snap
@@ -0,0 +1,55 @@
+# src/net/input_command.py
+"""
+Client -> server birleşik input komutu (CMD).
+
+Client bir frame içindeki tüm key değişikliklerini tek komutta toplar:
+    {"type": "CMD", "seq": n, "dirs": basılı yön bitmask'i, "bomb": 1 (sadece basıldıysa)}
+Komut sadece bir önceki gönderilenden farklıysa yollanır (yön değişti ya da bomba basıldı).
+
+Server hareketi eski MOVE / STOP_MOVE davranışıyla aynı çözer: tek eksen, son basılan yön
+kazanır; o yön bırakılınca hâlâ basılı olan diğer yöne geçilir.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Tuple
+
+DIR_UP = 1
+DIR_DOWN = 2
+DIR_LEFT = 4
+DIR_RIGHT = 8
+
+# Aynı frame'de birden çok yön basıldıysa öncelik bu sırayla
+_DIRS = (
+    (DIR_UP, (0, -1)),
+    (DIR_DOWN, (0, 1)),
+    (DIR_LEFT, (-1, 0)),
+    (DIR_RIGHT, (1, 0)),
+)
+
+
+def make_command(seq: int, dirs: int, bomb: bool = False) -> Dict[str, Any]:
+    msg: Dict[str, Any] = {"type": "CMD", "seq": seq, "dirs": dirs}
+    if bomb:
+        msg["bomb"] = 1
+    return msg
+
+
+def resolve_move(prev_dirs: int, dirs: int, current: Tuple[float, float]) -> Tuple[int, int]:
+    """
+    Basılı yön maskesinden move_dir. prev_dirs bir önceki komutun maskesi (yeni basılanı bulmak
+    için), current player'ın şu anki move_dir'i (hâlâ basılıysa korunur).
+    """
+    pressed = dirs & ~prev_dirs
+    for bit, vec in _DIRS:
+        if pressed & bit:
+            return vec
+
+    cur = (int(current[0]), int(current[1]))
+    for bit, vec in _DIRS:
+        if vec == cur and dirs & bit:
+            return vec
+
+    for bit, vec in _DIRS:
+        if dirs & bit:
+            return vec
+    return (0, 0)
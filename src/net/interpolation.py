@@ -0,0 +1,72 @@
+# src/net/interpolation.py
+from __future__ import annotations
+
+from collections import deque
+from typing import Deque, Dict, Hashable, Optional, Tuple
+
+Pos = Tuple[int, int]
+
+
+class SnapshotInterpolator:
+    """
+    Client tarafı entity interpolasyonu.
+    Snapshot'lar server tick'iyle tamponlanır; render saati en yeni snapshot'ın `delay`
+    kadar gerisinden yürür ve iki snapshot arasındaki pozisyon lineer hesaplanır.
+    Server TICK_RATE'ten seyrek (NET_SEND_RATE) gönderse de hareket akıcı görünür.
+    - Tampon boşalırsa (paket gecikti) son pozisyonda beklenir, extrapolasyon yok
+    - snap_dist'ten büyük sıçramalar (respawn, enemy index kayması) interpolasyonsuz uygulanır
+    """
+
+    BUFFER = 32
+    # Render saatinin hedef gecikmeye kare başına ne kadar çekileceği (saat kayması)
+    DRIFT_GAIN = 0.02
+
+    def __init__(self, tick_rate: int, delay: float, snap_dist: int):
+        self.tick_rate = max(1, int(tick_rate))
+        self.delay_ticks = max(0.0, delay * self.tick_rate)
+        self.snap_dist = snap_dist
+        self.render_tick: Optional[float] = None
+        self._buf: Deque[Tuple[int, Dict[Hashable, Pos]]] = deque(maxlen=self.BUFFER)
+
+    def push(self, tick: int, positions: Dict[Hashable, Pos]) -> None:
+        if self._buf:
+            last = self._buf[-1][0]
+            if tick < last:
+                return  # eski snapshot
+            if tick == last:
+                self._buf[-1] = (tick, positions)
+                return
+        self._buf.append((tick, positions))
+
+    def sample(self, dt: float) -> Dict[Hashable, Pos]:
+        """Render saatini dt kadar ilerletip o andaki interpolasyonlu pozisyonları döndürür."""
+        buf = self._buf
+        if not buf:
+            return {}
+
+        target = buf[-1][0] - self.delay_ticks
+        if self.render_tick is None or abs(self.render_tick - target) > max(self.delay_ticks, 1.0):
+            self.render_tick = target
+        else:
+            self.render_tick += dt * self.tick_rate + (target - self.render_tick) * self.DRIFT_GAIN
+        rt = self.render_tick
+
+        # render saatinin gerisinde kalan snapshot'ları at (en az biri kalsın)
+        while len(buf) >= 2 and buf[1][0] <= rt:
+            buf.popleft()
+
+        t0, a = buf[0]
+        if len(buf) == 1 or rt <= t0:
+            return dict(a)
+
+        t1, b = buf[1]
+        alpha = (rt - t0) / (t1 - t0)
+        out: Dict[Hashable, Pos] = {}
+        for key, (bx, by) in b.items():
+            prev = a.get(key)
+            if prev is None or abs(bx - prev[0]) + abs(by - prev[1]) > self.snap_dist:
+                out[key] = (bx, by)
+            else:
+                out[key] = (round(prev[0] + (bx - prev[0]) * alpha),
+                            round(prev[1] + (by - prev[1]) * alpha))
+        return out
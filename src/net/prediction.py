@@ -0,0 +1,71 @@
+# src/net/prediction.py
+from __future__ import annotations
+
+from collections import deque
+from typing import Deque, Tuple
+
+
+class ClientPrediction:
+    """
+    Local player için client-side prediction + server reconciliation.
+    - Input'lar client'ta hemen uygulanır; Player.update server ile aynı sabit tick (1/tick_rate) ile koşar
+    - Tahmin edilen her tick, o an geçerli input seq'i ve move_dir ile geçmişe yazılır
+    - Snapshot gelince player server pozisyonuna çekilir; server'ın henüz simüle etmediği tick'ler
+      (ack'lenen input altında server'ın koşmadığı tick'ler + ack'lenmemiş input'lar) yeniden oynatılır
+    Server otoriter kalır: tahmin sadece local player'ın hareketi içindir, bomba / hasar server'dan gelir.
+    Hız (speed boost) da server'dan: snapshot'taki çarpan reconcile'dan önce player'a uygulanır.
+    """
+
+    # Saklanan en fazla tahmin tick'i (RTT * tick_rate'ten büyük olmalı)
+    HISTORY = 256
+    # World.update ile aynı: uzun frame'den sonra yetişilecek en fazla tick
+    MAX_CATCHUP_TICKS = 5
+
+    def __init__(self, tick_rate: int):
+        self.tick_dt = 1.0 / max(1, int(tick_rate))
+        self._accumulator = 0.0
+        # (input seq, seq altındaki tick sırası (1..), move_dir.x, move_dir.y)
+        self._history: Deque[Tuple[int, int, float, float]] = deque(maxlen=self.HISTORY)
+        self._seq = 0
+        self._seq_ticks = 0
+        # Server bu input altında client'tan fazla tick koştuysa (çok düşük RTT) atlanacak tick
+        self._skip = 0
+
+    def advance(self, world, player, dt: float, seq: int) -> int:
+        """Frame dt'sini sabit tick'lere böler, player'ı local world'de ilerletir. Koşan tick sayısı döner."""
+        self._accumulator += dt
+        n = int(self._accumulator / self.tick_dt)
+        if n > self.MAX_CATCHUP_TICKS:
+            n = self.MAX_CATCHUP_TICKS
+            self._accumulator = 0.0
+        else:
+            self._accumulator -= n * self.tick_dt
+
+        for _ in range(n):
+            if seq != self._seq:
+                self._seq, self._seq_ticks, self._skip = seq, 0, 0
+            self._seq_ticks += 1
+            if self._skip:
+                self._skip -= 1
+                continue
+            self._history.append((seq, self._seq_ticks, player.move_dir.x, player.move_dir.y))
+            player.update(self.tick_dt, world)
+        return n
+
+    def reconcile(self, world, player, ack: int, ack_ticks: int) -> None:
+        """
+        player server state'ine çekildikten sonra çağrılır. ack: server'ın uyguladığı son input seq'i,
+        ack_ticks: server'ın o input altında koştuğu tick sayısı (snapshot tick - input_tick).
+        """
+        history = self._history
+        while history and (history[0][0] < ack or (history[0][0] == ack and history[0][1] <= ack_ticks)):
+            history.popleft()
+        if ack == self._seq:
+            self._skip = max(0, ack_ticks - self._seq_ticks)
+
+        # Replay geçmişteki move_dir'leri kullanır; güncel input sonra geri konur
+        current = (player.move_dir.x, player.move_dir.y)
+        for _, _, dx, dy in history:
+            player.move_dir.update(dx, dy)
+            player.update(self.tick_dt, world)
+        player.move_dir.update(*current)
@@ -2,27 +2,181 @@ from __future__ import annotations
 import json
 import socket
 import struct
-from typing import Any, Dict
+from typing import Any, Dict, Iterator, Optional
+
+from net import snapshot_codec
 
 _HDR = struct.Struct("!I")  # 4-byte length, network endian
 
+# Kabul edilen en büyük frame payload'ı. Uzunluk karşı taraftan gelir, tampon ona göre
+# ayrıldığı için sınırsız bırakılamaz (en büyük keyframe bunun çok altında)
+MAX_FRAME = 1 << 20
+
+
+def _check_length(n: int) -> None:
+    if n > MAX_FRAME:
+        raise ValueError(f"frame too large: {n} > {MAX_FRAME}")
+
 
-def _recv_exact(conn: socket.socket, n: int) -> bytes:
-    buf = b""
-    while len(buf) < n:
-        chunk = conn.recv(n - len(buf))
-        if not chunk:
+def _recv_exact(conn: socket.socket, n: int) -> bytearray:
+    _check_length(n)
+    buf = bytearray(n)
+    view = memoryview(buf)
+    got = 0
+    while got < n:
+        k = conn.recv_into(view[got:])
+        if not k:
             raise ConnectionError("socket closed")
-        buf += chunk
+        got += k
     return buf
 
 
-def send_json(conn: socket.socket, payload: Dict[str, Any]) -> None:
+class FrameReader:
+    """
+    Length-prefixed frame'ler için tamponlu okuyucu.
+    - Soketten büyük parçalar tek recv_into ile yeniden kullanılan bir bytearray'e okunur
+    - Tamponda kaç tam frame varsa sırayla ayrıştırılır; payload'lar kopyasız memoryview döner
+    Payload view'ları bir sonraki fill() çağrısına kadar geçerlidir (tampon yeniden kullanılır),
+    yani hemen decode edilmelidir. MAX_FRAME'den büyük uzunluk ValueError (bağlantı kapatılmalı).
+    """
+
+    def __init__(self, size: int = 65536):
+        self._buf = bytearray(max(size, _HDR.size))
+        self._view = memoryview(self._buf)
+        self._start = 0  # işlenmemiş verinin başı
+        self._end = 0    # okunmuş verinin sonu
+        self._need = _HDR.size  # sıradaki frame için tamponda gereken toplam byte
+
+    def fill(self, conn: socket.socket) -> int:
+        """Soketten bir kez okur; okunan byte sayısı (0 = bağlantı kapandı). Non-blocking soket BlockingIOError atabilir."""
+        self._make_room()
+        n = conn.recv_into(self._view[self._end:])
+        self._end += n
+        return n
+
+    def next_frame(self) -> Optional[memoryview]:
+        """Tampondaki sıradaki tam frame'in payload'ı; eksikse None."""
+        avail = self._end - self._start
+        if avail < _HDR.size:
+            self._need = _HDR.size
+            return None
+        (length,) = _HDR.unpack_from(self._buf, self._start)
+        _check_length(length)
+        total = _HDR.size + length
+        if avail < total:
+            self._need = total
+            return None
+        start = self._start + _HDR.size
+        self._start += total
+        if self._start == self._end:
+            self._start = self._end = 0
+        self._need = _HDR.size
+        return self._view[start:start + length]
+
+    def frames(self) -> Iterator[memoryview]:
+        """Tampondaki tüm tam frame'ler."""
+        while True:
+            payload = self.next_frame()
+            if payload is None:
+                return
+            yield payload
+
+    def read_frame(self, conn: socket.socket) -> memoryview:
+        """Bloklayan soket için: sıradaki frame (gerekirse soketten okuyarak)."""
+        while True:
+            payload = self.next_frame()
+            if payload is not None:
+                return payload
+            if not self.fill(conn):
+                raise ConnectionError("socket closed")
+
+    def _make_room(self) -> None:
+        size = len(self._buf)
+        if self._end < size and self._start + self._need <= size:
+            return
+        pending = self._end - self._start
+        if self._need > size:
+            # Tampondan büyük frame: yeni tampon (dışarıda kalan view'lar eskisini tutar)
+            buf = bytearray(max(self._need, 2 * size))
+            buf[:pending] = self._view[self._start:self._end]
+            self._buf = buf
+            self._view = memoryview(buf)
+        elif pending:
+            # Yarım frame'i başa taşı (memoryview ataması çakışan aralıkta memmove yapar)
+            self._view[:pending] = self._view[self._start:self._end]
+        self._start, self._end = 0, pending
+
+
+# Client -> server mesaj türleri ve alan tipleri (alanlar opsiyonel, varsa tipi tutmalı)
+_CLIENT_FIELDS: Dict[str, Dict[str, type]] = {
+    "HELLO": {"codec": str},
+    "ACK": {"seq": int},
+    "CMD": {"seq": int, "dirs": int, "bomb": int},
+    "INPUT": {"seq": int, "action": str, "data": dict},
+    "UDP_OFF": {},
+    # sadece UDP
+    "BIND": {"token": int},
+    "CMDS": {"cmds": list},
+}
+_INPUT_DATA_FIELDS: Dict[str, type] = {"dx": int, "dy": int, "axis": str}
+
+
+def _check_fields(obj: Dict[str, Any], fields: Dict[str, type]) -> None:
+    for name, kind in fields.items():
+        if name in obj and not isinstance(obj[name], kind):
+            raise ValueError(f"bad field {name!r}: {obj[name]!r}")
+
+
+def check_client_message(msg: Any) -> Dict[str, Any]:
+    """
+    Client'tan gelen mesajın şeklini doğrular (obje, bilinen type, alan tipleri); geçersizse ValueError.
+    Server tarafında tek I/O thread'i ve scheduler tüm maçları taşıdığı için mesajlar
+    transport sınırında doğrulanır, bozuk client sadece kendi bağlantısını kaybeder.
+    """
+    if not isinstance(msg, dict):
+        raise ValueError(f"message is not an object: {type(msg).__name__}")
+    kind = msg.get("type")
+    fields = _CLIENT_FIELDS.get(kind) if isinstance(kind, str) else None
+    if fields is None:
+        raise ValueError(f"unknown message type: {msg.get('type')!r}")
+    _check_fields(msg, fields)
+    if kind == "INPUT" and "data" in msg:
+        _check_fields(msg["data"], _INPUT_DATA_FIELDS)
+    return msg
+
+
+def encode_frame(payload: Dict[str, Any]) -> bytes:
+    """Payload'ı length-prefixed frame'e çevirir (aynı mesaj birden çok client'a gidecekse bir kez)."""
     data = json.dumps(payload).encode("utf-8")
-    conn.sendall(_HDR.pack(len(data)) + data)
+    return _HDR.pack(len(data)) + data
+
+
+def encode_raw_frame(data: bytes) -> bytes:
+    """Hazır encode edilmiş (binary) payload'ı length-prefixed frame'e çevirir."""
+    return _HDR.pack(len(data)) + data
+
+
+def decode_payload(data) -> Dict[str, Any]:
+    """
+    Frame payload'ını mesaja çevirir.
+    JSON payload'lar '{' ile başlar; binary snapshot'lar codec'ten geçip
+    JSON SNAPSHOT mesajıyla aynı şekle getirilir.
+    """
+    if snapshot_codec.is_binary_snapshot(data):
+        return {"type": "SNAPSHOT", "data": snapshot_codec.decode_snapshot(data)}
+    return json.loads(str(data, "utf-8"))
+
+
+def send_frame(conn: socket.socket, frame: bytes) -> None:
+    conn.sendall(frame)
+
+
+def send_json(conn: socket.socket, payload: Dict[str, Any]) -> None:
+    send_frame(conn, encode_frame(payload))
 
 
 def recv_json(conn: socket.socket) -> Dict[str, Any]:
     (length,) = _HDR.unpack(_recv_exact(conn, _HDR.size))
     data = _recv_exact(conn, length)
-    return json.loads(data.decode("utf-8"))
+    return json.loads(str(data, "utf-8"))
+
@@ -0,0 +1,159 @@
+# src/net/room.py
+from __future__ import annotations
+
+import copy
+from typing import Any, Dict, List, Optional
+
+from model.level_generator import LevelGrid
+from model.sim_clock import send_interval, tick_rate
+from model.world import World
+from net.input_command import resolve_move
+from net.snapshot import SnapshotFrames
+from net.snapshot_delta import SnapshotHistory
+
+
+def apply_input(world: World, pid: int, msg: Dict[str, Any], bombs: bool = True) -> None:
+    """
+    Client'tan gelen CMD (frame başına birleşik komut) ya da eski tek-event INPUT mesajını
+    pid'li player'a uygular. bombs=False: sadece hareket (client prediction).
+    """
+    kind = msg.get("type")
+    if kind not in ("CMD", "INPUT"):
+        return
+
+    action = msg.get("action")
+    data = msg.get("data", {})
+
+    p = world.players.get(pid)
+    if p is None:
+        return
+
+    # Client prediction için: snapshot'ta son uygulanan input seq'i ve tick'i geri gider.
+    # UDP'de komutlar ACK'lenene kadar tekrar gelir: uygulanmış seq'ler atılır
+    seq = msg.get("seq")
+    if seq is not None:
+        if int(seq) <= getattr(p, "input_seq", 0):
+            return
+        p.input_seq = int(seq)
+        p.input_tick = int(getattr(world, "tick", 0))
+
+    if not getattr(p, "alive", True):
+        return
+
+    if kind == "CMD":
+        dirs = int(msg.get("dirs", 0))
+        p.move_dir.update(*resolve_move(getattr(p, "input_dirs", 0), dirs, p.move_dir))
+        p.input_dirs = dirs
+        if bombs and msg.get("bomb"):
+            world.place_bomb(p)
+        return
+
+    if action == "MOVE":
+        p.move_dir.x = int(data.get("dx", 0))
+        p.move_dir.y = int(data.get("dy", 0))
+
+    elif action in ("STOP_MOVE", "STOP"):
+        axis = data.get("axis")
+        if axis == "x":
+            p.move_dir.x = 0
+        elif axis == "y":
+            p.move_dir.y = 0
+
+    elif action == "BOMB" and bombs:
+        world.place_bomb(p)
+
+
+class Room:
+    """
+    Room server'daki tek maç:
+    - Kendi World'ü ve config kopyası (World skoru config.game üzerinden room'a yazar)
+    - Oyuncu slotları: conn_id -> player_id (World.players key'leri)
+    - Kendi tick zamanlayıcısı: next_tick'e göre sabit TICK_RATE ile ilerler;
+      snapshot sadece her send_every tick'te (NET_SEND_RATE) ve maç bitince üretilir
+    Room ağ bilmez; tick() yayınlanacak SnapshotFrames'leri döndürür, codec seçimi ve
+    gönderim RoomServer'da. Maç bitince son snapshot `final`da kalır; RoomServer onu
+    client'lar ACK'leyene kadar yeniden gönderir.
+    """
+
+    WAITING = "waiting"
+    PLAYING = "playing"
+    FINISHED = "finished"
+
+    def __init__(self, room_id: int, config, size: int = 2, level: Optional[LevelGrid] = None):
+        self.room_id = room_id
+        self.config = copy.copy(config)
+        self.config.game = self
+        self.score = 0
+
+        self.size = size
+        self.level = level
+        self.slots: Dict[int, int] = {}
+
+        self.world: Optional[World] = None
+        self.snapshots: Optional[SnapshotHistory] = None
+        # Maç sonu (win / game over) snapshot'ı
+        self.final: Optional[SnapshotFrames] = None
+        self.state = Room.WAITING
+        self.tick_dt = 1.0 / tick_rate(config)
+        self.send_every = send_interval(config)
+        self.next_tick = 0.0
+
+    # ---------- slots ----------
+    def is_full(self) -> bool:
+        return len(self.slots) >= self.size
+
+    def join(self, conn_id: int) -> int:
+        taken = set(self.slots.values())
+        pid = next(i for i in range(1, self.size + 1) if i not in taken)
+        self.slots[conn_id] = pid
+        return pid
+
+    def leave(self, conn_id: int) -> None:
+        self.slots.pop(conn_id, None)
+        if not self.slots:
+            self.state = Room.FINISHED
+
+    def conn_ids(self) -> List[int]:
+        return list(self.slots)
+
+    # ---------- match ----------
+    def start(self, now: float) -> None:
+        self.world = World(self.config, level=self.level)
+        self.snapshots = SnapshotHistory(
+            self.world, int(getattr(self.config, "NET_SNAPSHOT_HISTORY", 64)))
+        self.state = Room.PLAYING
+        self.next_tick = now
+
+    def handle_input(self, conn_id: int, msg: Dict[str, Any]) -> None:
+        pid = self.slots.get(conn_id)
+        if pid is None or self.world is None or self.state != Room.PLAYING:
+            return
+        apply_input(self.world, pid, msg)
+
+    def due(self, now: float) -> bool:
+        return self.state == Room.PLAYING and now >= self.next_tick
+
+    def tick(self) -> List[SnapshotFrames]:
+        """Bir simülasyon tick'i; bu tick'te room'a yayınlanacak snapshot'lar (gönderim tick'i değilse boş)."""
+        world = self.world
+        assert world is not None
+        world.step(1)
+        self.next_tick += self.tick_dt
+
+        alive = world.alive_player_count()
+        snapshots = self.snapshots
+        assert snapshots is not None
+
+        if world.breakable_wall_count() == 0 and alive > 0:
+            self.state = Room.FINISHED
+            self.final = SnapshotFrames(snapshots, snapshots.capture(self.score, win=True))
+            return [self.final]
+
+        if alive == 0:
+            self.state = Room.FINISHED
+            self.final = SnapshotFrames(snapshots, snapshots.capture(self.score, game_over=True))
+            return [self.final]
+
+        if world.tick % self.send_every:
+            return []
+        return [SnapshotFrames(snapshots, snapshots.capture(self.score))]
@@ -0,0 +1,246 @@
+# src/net/room_server.py
+from __future__ import annotations
+
+import os
+import time
+from typing import Any, Dict
+
+from core.config import GameConfig
+from model.level_cache import LevelPool
+from model.world import World
+from net.room import Room
+from net.snapshot import SnapshotFrames, TerminalSnapshot, net_rates
+from net.snapshot_codec import CODEC_JSON, SUPPORTED_CODECS
+from net.transport import SelectorTransport, OPEN, MESSAGE, CLOSE, queue_limits
+
+
+class RoomServer:
+    """
+    Tek process'te çok sayıda bağımsız maç (Room) barındıran server.
+    - Tüm soket I/O'su tek SelectorTransport thread'inde (non-blocking, bağlantı başına buffer)
+    - Client bağlanırken boş slotu olan ilk room'a atanır (yoksa yeni room açılır),
+      WELCOME'da player_id + room_id + sunulan snapshot codec'leri döner; client HELLO ile seçer
+    - serve_forever() tek scheduler döngüsü: transport event'lerini room'lara dağıtır, zamanı
+      gelen her room'u kendi sabit tick'iyle ilerletir, snapshot'ları o room'un client'larına yollar
+    - Biten room, son snapshot'ı (win / game over) tüm client'ları ACK'leyene kadar açık kalır
+    - NET_UDP açıksa UDP'ye bağlanan client'lar snapshot'ları datagram olarak alır, input / ACK'leri
+      datagram'la yollar (net.udp); handshake ve son snapshot TCP'de
+    Room'lar sadece scheduler thread'inden değiştirilir.
+    """
+
+    # Scheduler geride kalırsa bir room'un tek döngüde yetişeceği en fazla tick
+    MAX_CATCHUP_TICKS = 5
+
+    def __init__(self, host: str, port: int, config=None, room_size: int = 2, max_rooms: int = 256):
+        self.host = host
+        self.port = port
+        self.config = config or GameConfig.get_instance()
+        self.room_size = room_size
+        self.max_rooms = max_rooms
+
+        self.transport = SelectorTransport(host, port, **queue_limits(self.config))
+        self.running = False
+
+        self.rooms: Dict[int, Room] = {}
+        self._room_of: Dict[int, Room] = {}
+        # conn_id -> negotiate edilen snapshot codec'i (HELLO gelene kadar JSON)
+        self._codec: Dict[int, str] = {}
+        # conn_id -> client'ın uyguladığı son snapshot seq'i (delta baseline'ı)
+        self._ack: Dict[int, int] = {}
+        # room_id -> teslimi beklenen son snapshot
+        self._terminals: Dict[int, TerminalSnapshot] = {}
+        self._next_room_id = 1
+
+        gw, gh = self.config.GRID_WIDTH, self.config.GRID_HEIGHT
+        self.level_pool = LevelPool(
+            self.config,
+            World.reserved_level_cells(gw, gh),
+            size=int(getattr(self.config, "LEVEL_POOL_SIZE", 3)),
+        )
+
+    @classmethod
+    def from_env(cls) -> "RoomServer":
+        config = GameConfig.get_instance()
+        return cls(
+            os.environ.get("DP_HOST", "127.0.0.1"),
+            int(os.environ.get("DP_PORT", "5050")),
+            config,
+            room_size=int(getattr(config, "ROOM_SIZE", 2)),
+            max_rooms=int(getattr(config, "MAX_ROOMS", 256)),
+        )
+
+    # ---------- network ----------
+    def start(self) -> None:
+        self.transport.start()
+        self.running = True
+        print(f"[RoomServer] Listening on {self.host}:{self.port}")
+
+    def send(self, conn_id: int, payload: Dict[str, Any]) -> bool:
+        return self.transport.send(conn_id, payload)
+
+    def _drop(self, conn_id: int) -> None:
+        self.transport.close(conn_id)
+        self._forget(conn_id)
+        room = self._room_of.pop(conn_id, None)
+        if room is not None:
+            room.leave(conn_id)
+
+    def _forget(self, conn_id: int) -> None:
+        self._codec.pop(conn_id, None)
+        self._ack.pop(conn_id, None)
+
+    # ---------- rooms ----------
+    def _assign(self, conn_id: int, now: float) -> None:
+        room = next(
+            (r for r in self.rooms.values() if r.state == Room.WAITING and not r.is_full()),
+            None,
+        )
+        if room is None:
+            if len(self.rooms) >= self.max_rooms:
+                self.send(conn_id, {"type": "ERROR", "reason": "server full"})
+                self._drop(conn_id)
+                return
+            room = Room(self._next_room_id, self.config, self.room_size, self.level_pool.take())
+            self.rooms[room.room_id] = room
+            self._next_room_id += 1
+
+        pid = room.join(conn_id)
+        self._room_of[conn_id] = room
+        self.send(conn_id, {
+            "type": "WELCOME",
+            "player_id": pid,
+            "room_id": room.room_id,
+            "codecs": list(SUPPORTED_CODECS),
+            **net_rates(self.config),
+            **self.transport.udp_welcome(conn_id),
+        })
+
+        if room.is_full():
+            room.start(now)
+            print(f"[RoomServer] Room {room.room_id} started ({len(self.rooms)} rooms)")
+
+    def _dispatch_events(self, now: float) -> None:
+        for kind, conn_id, msg in self.transport.poll():
+            if kind == OPEN:
+                print(f"[RoomServer] Client {conn_id} connected: {msg.get('addr') if msg else ''}")
+                self._assign(conn_id, now)
+            elif kind == CLOSE:
+                self._forget(conn_id)
+                room = self._room_of.pop(conn_id, None)
+                if room is not None:
+                    room.leave(conn_id)
+                    terminal = self._terminals.get(room.room_id)
+                    if terminal is not None:
+                        terminal.pending.discard(conn_id)
+            elif kind == MESSAGE and msg.get("type") == "ACK":
+                seq = int(msg.get("seq") or 0)
+                if seq > 0:
+                    self._ack[conn_id] = max(self._ack.get(conn_id, 0), seq)
+                    room = self._room_of.get(conn_id)
+                    terminal = self._terminals.get(room.room_id) if room is not None else None
+                    if terminal is not None:
+                        terminal.ack(conn_id, seq)
+                else:
+                    self._ack.pop(conn_id, None)  # client keyframe istiyor
+            elif kind == MESSAGE and msg.get("type") == "HELLO":
+                if msg.get("codec") in SUPPORTED_CODECS:
+                    self._codec[conn_id] = msg["codec"]
+            elif kind == MESSAGE:
+                room = self._room_of.get(conn_id)
+                if room is not None:
+                    room.handle_input(conn_id, msg)
+
+    def _close_room(self, room: Room) -> None:
+        # transport.close bekleyen son snapshot'ları gönderip kapatır
+        for conn_id in room.conn_ids():
+            self._room_of.pop(conn_id, None)
+            self._forget(conn_id)
+            self.transport.close(conn_id)
+        self.rooms.pop(room.room_id, None)
+        self._terminals.pop(room.room_id, None)
+        print(f"[RoomServer] Room {room.room_id} closed ({len(self.rooms)} rooms)")
+
+    def _send_snapshot(self, conn_ids, frames: SnapshotFrames, reliable: bool = False) -> None:
+        # Aynı (codec, ack'lenen baseline) çiftindeki client'lar aynı frame'i paylaşır.
+        # reliable=False: client UDP'deyse datagram (sığmazsa TCP)
+        for conn_id in conn_ids:
+            frame = frames.frame(self._codec.get(conn_id, CODEC_JSON), self._ack.get(conn_id))
+            if not reliable and self.transport.send_datagram(conn_id, frame):
+                continue
+            self.transport.send_frame(conn_id, frame, flush=False, snapshot=True)
+
+    def _finish(self, room: Room, now: float) -> bool:
+        """Biten room: son snapshot teslim edildiyse (ya da süre dolduysa) kapatır; kapandıysa True."""
+        if room.final is None or not room.slots:
+            self._close_room(room)
+            return True
+        terminal = self._terminals.get(room.room_id)
+        if terminal is None:
+            terminal = self._terminals[room.room_id] = TerminalSnapshot(room.final, room.conn_ids(), now)
+        if terminal.done(now):
+            self._close_room(room)
+            return True
+        self._send_snapshot(terminal.due(now), terminal.frames, reliable=True)
+        return False
+
+    def run_once(self, now: float) -> float:
+        """
+        Scheduler'ın bir turu: input'ları dağıt, zamanı gelen room'ları tick'le.
+        Bir sonraki room tick'inin zamanını döndürür.
+        """
+        self._dispatch_events(now)
+
+        next_due = now + 0.05
+        for room in list(self.rooms.values()):
+            ticks = 0
+            while room.due(now) and ticks < self.MAX_CATCHUP_TICKS:
+                for frames in room.tick():
+                    self._send_snapshot(room.conn_ids(), frames, reliable=frames is room.final)
+                ticks += 1
+            if room.due(now):
+                # Çok geride: kalan tick'leri at (spiral of death olmasın)
+                room.next_tick = now + room.tick_dt
+
+            if room.state == Room.FINISHED:
+                if not self._finish(room, now):
+                    next_due = min(next_due, self._terminals[room.room_id].next_send)
+            elif room.state == Room.PLAYING:
+                next_due = min(next_due, room.next_tick)
+
+        # Tur boyunca biriken tüm frame'ler için I/O thread'i bir kez uyanır
+        self.transport.flush()
+        return next_due
+
+    def serve_forever(self) -> None:
+        self.start()
+        try:
+            while self.running:
+                next_due = self.run_once(time.perf_counter())
+                delay = next_due - time.perf_counter()
+                if delay > 0:
+                    time.sleep(min(delay, 0.05))
+        finally:
+            self.close()
+
+    def stats(self) -> Dict[str, Any]:
+        playing = sum(1 for r in self.rooms.values() if r.state == Room.PLAYING)
+        queues = self.transport.queue_stats().values()
+        return {
+            "rooms": len(self.rooms),
+            "playing": playing,
+            "clients": self.transport.connection_count(),
+            # gönderim kuyruğu: en derin client, toplam atılan snapshot, yavaşlıktan atılan client
+            "max_queue_frames": max((q["frames"] for q in queues), default=0),
+            "max_queue_bytes": max((q["bytes"] for q in queues), default=0),
+            "dropped_snapshots": sum(q["dropped"] for q in queues),
+            "evicted": self.transport.evicted,
+        }
+
+    def queue_stats(self) -> Dict[int, Dict[str, Any]]:
+        """conn_id başına gönderim kuyruğu derinliği (SelectorTransport.queue_stats)."""
+        return self.transport.queue_stats()
+
+    def close(self) -> None:
+        self.running = False
+        self.transport.stop()
+        self.level_pool.close()
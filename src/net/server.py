@@ -1,91 +1,162 @@
 from __future__ import annotations
-import socket
-import threading
-import queue
+import time
 from typing import Dict, Any, Tuple, List
 
-from net.protocol import send_json, recv_json
+from net.protocol import encode_frame
+from net.snapshot import SnapshotFrames, TerminalSnapshot, net_rates
+from net.snapshot_codec import CODEC_JSON, SUPPORTED_CODECS
+from net.transport import SelectorTransport, OPEN, MESSAGE, CLOSE, queue_limits
 
 
 class GameServer:
-    def __init__(self, host: str, port: int):
+    """
+    Tek maçlık server (DP_MODE=server).
+    I/O tek bir selectors thread'inde (SelectorTransport); broadcast sadece
+    bağlantı kuyruklarına yazar, tick süresi en yavaş soketi beklemez; geride kalan
+    client'ın eski snapshot'ları atılır, hiç yetişemeyen client atılır.
+    Snapshot codec'i client başına: WELCOME codec'leri sunar, client HELLO ile seçer;
+    HELLO göndermeyen (eski) client JSON almaya devam eder.
+    Snapshot'lar client'ın ACK'lediği son seq'e göre delta gider (ACK yoksa keyframe).
+    Maç sonu snapshot'ı (send_terminal) client'lar ACK'leyene kadar pump() ile yeniden gönderilir.
+    NET_UDP açıksa UDP'ye bağlanan client'ın snapshot'ları datagram olarak gider (net.udp);
+    maç sonu snapshot'ı her zaman TCP'den.
+    """
+
+    def __init__(self, host: str, port: int, config=None):
         self.host = host
         self.port = port
+        self.config = config
 
-        self.listener: socket.socket | None = None
-        self.clients: Dict[int, socket.socket] = {}
-        self._lock = threading.Lock()
+        self.transport = SelectorTransport(host, port, backlog=2, **queue_limits(config))
+        # pid -> conn_id
+        self.clients: Dict[int, int] = {}
+        self._pid_of: Dict[int, int] = {}
+        # pid -> negotiate edilen snapshot codec'i
+        self.codecs: Dict[int, str] = {}
+        # pid -> client'ın uyguladığı son snapshot seq'i (delta baseline'ı)
+        self.acks: Dict[int, int] = {}
+        # Teslimi beklenen win / game over snapshot'ı
+        self.terminal: TerminalSnapshot | None = None
 
         self.running = False
-        self.inbox: "queue.Queue[Tuple[int, Dict[str, Any]]]" = queue.Queue()
+        # Transport event'lerinden toplanan input'lar; poll_inputs() boşaltır
+        self._inputs: List[Tuple[int, Dict[str, Any]]] = []
 
     def start(self) -> None:
-        self.listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        self.listener.bind((self.host, self.port))
-        self.listener.listen(2)
-
+        self.transport.start()
         self.running = True
         print(f"[Server] Listening on {self.host}:{self.port}")
 
         # 2 client bekle
-        for pid in (1, 2):
-            conn, addr = self.listener.accept()
-            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
-            with self._lock:
-                self.clients[pid] = conn
-
-            print(f"[Server] Client {pid} connected: {addr}")
-            send_json(conn, {"type": "WELCOME", "player_id": pid})
-
-            t = threading.Thread(target=self._reader, args=(pid, conn), daemon=True)
-            t.start()
-
-    def _reader(self, pid: int, conn: socket.socket) -> None:
-        try:
-            while self.running:
-                msg = recv_json(conn)  # blocking
-                self.inbox.put((pid, msg))
-        except Exception as e:
-            print(f"[Server] reader stopped pid={pid}: {repr(e)}")
-        finally:
-            # cleanup
-            with self._lock:
-                old = self.clients.pop(pid, None)
-            try:
-                if old is not None:
-                    old.close()
-            except Exception:
-                pass
+        while len(self.clients) < 2:
+            for kind, conn_id, msg in self.transport.poll():
+                if kind == OPEN and len(self.clients) < 2:
+                    pid = 1 if 1 not in self.clients else 2
+                    self.clients[pid] = conn_id
+                    self._pid_of[conn_id] = pid
+                    print(f"[Server] Client {pid} connected: {msg.get('addr') if msg else ''}")
+                    self.codecs[pid] = CODEC_JSON
+                    self.transport.send(conn_id, {
+                        "type": "WELCOME",
+                        "player_id": pid,
+                        "codecs": list(SUPPORTED_CODECS),
+                        **net_rates(self.config),
+                        **self.transport.udp_welcome(conn_id),
+                    })
+                else:
+                    self._handle(kind, conn_id, msg)
+            time.sleep(0.01)
+
+    def _handle(self, kind: str, conn_id: int, msg) -> None:
+        pid = self._pid_of.get(conn_id)
+        if pid is None:
+            if kind == OPEN:
+                self.transport.close(conn_id)  # maç dolu
+            return
+        if kind == MESSAGE:
+            if msg.get("type") == "HELLO":
+                codec = msg.get("codec")
+                if codec in SUPPORTED_CODECS:
+                    self.codecs[pid] = codec
+                    print(f"[Server] pid={pid} snapshot codec: {codec}")
+                return
+            if msg.get("type") == "ACK":
+                seq = int(msg.get("seq") or 0)
+                if seq > 0:
+                    self.acks[pid] = max(self.acks.get(pid, 0), seq)
+                    if self.terminal is not None:
+                        self.terminal.ack(pid, seq)
+                else:
+                    self.acks.pop(pid, None)  # client keyframe istiyor
+                return
+            self._inputs.append((pid, msg))
+        elif kind == CLOSE:
+            print(f"[Server] client disconnected pid={pid}")
+            self._forget(pid, conn_id)
+
+    def _forget(self, pid: int, conn_id: int) -> None:
+        self._pid_of.pop(conn_id, None)
+        self.clients.pop(pid, None)
+        self.codecs.pop(pid, None)
+        self.acks.pop(pid, None)
+        if self.terminal is not None:
+            self.terminal.pending.discard(pid)
 
     def poll_inputs(self) -> List[Tuple[int, Dict[str, Any]]]:
-        out: List[Tuple[int, Dict[str, Any]]] = []
-        while True:
-            try:
-                out.append(self.inbox.get_nowait())
-            except queue.Empty:
-                break
+        for kind, conn_id, msg in self.transport.poll():
+            self._handle(kind, conn_id, msg)
+        out, self._inputs = self._inputs, []
         return out
 
     def broadcast(self, payload: Dict[str, Any]) -> None:
-        # bağlantısı kopanları listeden düş
-        dead: List[int] = []
-        with self._lock:
-            items = list(self.clients.items())
-
-        for pid, conn in items:
-            try:
-                send_json(conn, payload)
-            except Exception as e:
-                print(f"[Server] send failed pid={pid}: {repr(e)}")
-                dead.append(pid)
-
-        if dead:
-            with self._lock:
-                for pid in dead:
-                    c = self.clients.pop(pid, None)
-                    try:
-                        if c:
-                            c.close()
-                    except Exception:
-                        pass
+        # Payload bir kez encode edilir; aynı frame tüm client kuyruklarında paylaşılır,
+        # soket yazımı I/O thread'inde (bloklamaz)
+        frame = encode_frame(payload)
+        for pid, conn_id in list(self.clients.items()):
+            if not self.transport.send_frame(conn_id, frame):
+                self._forget(pid, conn_id)
+
+    def broadcast_snapshot(self, frames: SnapshotFrames) -> None:
+        self._send_snapshot(list(self.clients), frames)
+
+    def send_terminal(self, frames: SnapshotFrames) -> None:
+        """Win / game over snapshot'ı: herkese gider, ACK'lemeyenlere pump() yeniden yollar."""
+        self.terminal = TerminalSnapshot(frames, self.clients, time.perf_counter())
+        self._send_snapshot(list(self.clients), frames, reliable=True)
+
+    def pump(self) -> bool:
+        """
+        Maç bittikten sonra (Win / GameOver state'i) her frame çağrılır: ACK'leri işler,
+        terminal snapshot'ı ACK'lemeyen client'lara yeniden gönderir. Teslim bitince False.
+        """
+        terminal = self.terminal
+        if terminal is None:
+            return False
+        for kind, conn_id, msg in self.transport.poll():
+            self._handle(kind, conn_id, msg)
+        self._inputs.clear()  # maç bitti, input'lar uygulanmaz
+
+        now = time.perf_counter()
+        if terminal.done(now):
+            self.terminal = None
+            return False
+        self._send_snapshot(terminal.due(now), terminal.frames, reliable=True)
+        return True
+
+    def queue_stats(self) -> Dict[int, Dict[str, Any]]:
+        """pid başına gönderim kuyruğu derinliği (SelectorTransport.queue_stats)."""
+        stats = self.transport.queue_stats()
+        return {pid: stats[conn_id] for pid, conn_id in self.clients.items() if conn_id in stats}
+
+    def _send_snapshot(self, pids, frames: SnapshotFrames, reliable: bool = False) -> None:
+        # (codec, baseline) başına bir kez encode edilir, client kendi frame'ini alır.
+        # reliable=False: client UDP'deyse datagram (sığmazsa TCP)
+        for pid in pids:
+            conn_id = self.clients.get(pid)
+            if conn_id is None:
+                continue
+            frame = frames.frame(self.codecs.get(pid, CODEC_JSON), self.acks.get(pid))
+            if not reliable and self.transport.send_datagram(conn_id, frame):
+                continue
+            if not self.transport.send_frame(conn_id, frame, snapshot=True):
+                self._forget(pid, conn_id)
@@ -1,6 +1,11 @@
 # src/net/snapshot.py
 from __future__ import annotations
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
+
+from model.sim_clock import send_interval, tick_rate
+from net import snapshot_codec
+from net.protocol import encode_frame, encode_raw_frame
+from net.snapshot_delta import SnapshotHistory, SnapshotState
 
 def rect_xy(entity) -> Tuple[int, int]:
     return int(entity.rect.x), int(entity.rect.y)
@@ -64,3 +69,140 @@ def world_to_snapshot(world) -> Dict[str, Any]:
 
     snap["score"] = int(getattr(getattr(world.config, "game", None), "score", 0))
     return snap
+
+
+def make_snapshot(world, score: int = 0) -> Dict[str, Any]:
+    """
+    Server -> client SNAPSHOT payload'ı (PlayingState._apply_snapshot bu formatı okur).
+    Hem tek maçlık server (PlayingState) hem room server kullanır.
+    """
+    ts = world.config.TILE_SIZE
+
+    snap = {
+        "players": {
+            str(pid): {
+                "x": int(p.rect.x),
+                "y": int(p.rect.y),
+                "alive": bool(getattr(p, "alive", True)),
+                "hp": int(getattr(p, "hp", 0)),
+                # blink için istersen şimdiden ekle:
+                "invincible": bool(getattr(p, "invincible", False)),
+                "inv_timer": float(getattr(p, "inv_timer", 0.0)),
+                # client prediction: server'ın uyguladığı son input ve tick'i
+                "input_seq": int(getattr(p, "input_seq", 0)),
+                "input_tick": int(getattr(p, "input_tick", 0)),
+                "speed": float(p.speed_multiplier()),
+            }
+            for pid, p in world.players.items()
+        },
+        "bombs": [
+            {"x": int(b.rect.x), "y": int(b.rect.y)}
+            for b in getattr(world, "bombs", [])
+            if not getattr(b, "exploded", False)
+        ],
+        "enemies": [
+            {"x": int(e.rect.x), "y": int(e.rect.y),
+            "type": int(getattr(e, "enemy_type", 1))}
+            for e in getattr(world, "enemies", [])
+        ],
+        "walls": [
+            {
+                "gx": int(w.rect.x // ts),
+                "gy": int(w.rect.y // ts),
+                "type": str(getattr(w, "wall_type", "")),
+                "hp": int(getattr(w, "hp", 1)),
+            }
+            for w in getattr(world, "walls", [])
+        ],
+        "powerups": [
+            {
+                "gx": int(pu.rect.centerx // ts),
+                "gy": int(pu.rect.centery // ts),
+                "kind": getattr(getattr(pu, "kind", None), "name",
+                                str(getattr(pu, "kind", ""))),
+            }
+            for pu in getattr(world, "powerups", [])
+        ],
+        "score": int(score),
+        "explosions": [
+            {"x": int(fx.rect.x), "y": int(fx.rect.y)}
+            for fx in getattr(world, "explosions_fx", [])
+        ],
+    }
+
+    # ✅ gameover flag (client bununla state değiştirecek)
+    snap["game_over"] = (world.alive_player_count() == 0)
+    snap.setdefault("game_over", False)
+    snap.setdefault("win", False)
+    return snap
+
+
+def net_rates(config) -> Dict[str, int]:
+    """WELCOME'a eklenen simülasyon ve snapshot gönderme hızları (client interpolasyonu için)."""
+    if config is None:
+        return {}
+    rate = tick_rate(config)
+    return {"tick_rate": rate, "send_rate": max(1, rate // send_interval(config))}
+
+
+class SnapshotFrames:
+    """
+    Bir tick'in SNAPSHOT frame'leri: (codec, baseline) başına en fazla bir kez encode edilir.
+    Aynı baseline'ı ack'lemiş client'lar aynı frame'i paylaşır; baseline'ı history'de
+    olmayan client'lar keyframe alır.
+    """
+
+    def __init__(self, history: SnapshotHistory, state: SnapshotState):
+        self.history = history
+        self.state = state
+        self._frames: Dict[Tuple[str, Optional[int]], bytes] = {}
+
+    def frame(self, codec: Optional[str] = None, base: Optional[int] = None) -> bytes:
+        codec = codec or snapshot_codec.CODEC_JSON
+        msg = self.history.message(self.state, base)
+        key = (codec, msg.get("base"))
+        frame = self._frames.get(key)
+        if frame is None:
+            if codec == snapshot_codec.CODEC_BINARY:
+                frame = encode_raw_frame(snapshot_codec.encode_snapshot(msg))
+            else:
+                frame = encode_frame({"type": "SNAPSHOT", "data": msg})
+            self._frames[key] = frame
+        return frame
+
+
+class TerminalSnapshot:
+    """
+    Maç sonu (win / game over) snapshot'ının güvenilir teslimi.
+    Kör tekrar yerine: client'lar bu state'in seq'ini ACK'leyene kadar RESEND aralığıyla
+    yeniden gönderilir. Her gönderim client'ın o anki ack'ine göre encode edilir, yani
+    baseline'ı kaybedip ACK 0 yollayan client keyframe alır. ACK göndermeyen eski client'lar
+    için TIMEOUT sonunda vazgeçilir.
+    """
+
+    RESEND = 0.2
+    TIMEOUT = 3.0
+
+    def __init__(self, frames: SnapshotFrames, targets, now: float):
+        self.frames = frames
+        self.pending = set(targets)
+        self.deadline = now + self.TIMEOUT
+        self.next_send = now + self.RESEND
+
+    @property
+    def seq(self) -> int:
+        return int(self.frames.state.seq or 0)
+
+    def ack(self, target, seq: int) -> None:
+        if seq >= self.seq:
+            self.pending.discard(target)
+
+    def due(self, now: float) -> List:
+        """Yeniden gönderim zamanı geldiyse hâlâ ACK'lemeyen hedefler."""
+        if now < self.next_send or not self.pending:
+            return []
+        self.next_send = now + self.RESEND
+        return list(self.pending)
+
+    def done(self, now: float) -> bool:
+        return not self.pending or now >= self.deadline
@@ -0,0 +1,283 @@
+# src/net/snapshot_codec.py
+"""
+Versiyonlu binary SNAPSHOT codec'i (JSON'a alternatif).
+
+Keyframe ve delta mesajlarını (net.snapshot_delta formatı) taşır. Frame payload'ı
+(little-endian):
+    KIND_SNAPSHOT (1 byte) | VERSION (1 byte) | header | players | ...
+
+- header:  flags, seq, base (0 = keyframe), server tick, score
+           flags: game_over=1, win=2, delta=4, enemies var=8, explosions var=16
+- players: count + (pid, x, y, flags(alive=1, invincible=2), hp, inv_timer,
+                   input_seq, input_tick, speed (hız çarpanı))
+- keyframe:
+    grid w, grid h + duvarlar: tile başına 4 bit, satır sıralı (y * w + x), byte başına 2 tile
+        düşük 2 bit = WallType.value (0 = boş), yüksek 2 bit = hp (0 = gönderilmedi)
+    bombs:    count + (x, y)
+    powerups: count + (gx, gy, PowerUpType.value)
+- delta:
+    walls:    count + (gx, gy, 4 bitlik hücre) / walls_removed: count + (gx, gy)
+    bombs_add / bombs_removed:       count + (x, y)
+    powerups_add / powerups_removed: count + (gx, gy, kind) / count + (gx, gy)
+- enemies:    (flag varsa) count + (x, y, type)
+- explosions: (flag varsa) count + (x, y)
+
+JSON payload'ları her zaman '{' ile başladığı için KIND_SNAPSHOT ile karışmaz.
+decode_snapshot() JSON yolundaki dict'in aynısını döndürür; client tarafı codec'ten habersizdir.
+"""
+from __future__ import annotations
+
+import struct
+from itertools import compress
+from typing import Any, Dict, List, Tuple
+
+from model.entities import PowerUpType, WallType
+
+KIND_SNAPSHOT = 0x01
+VERSION = 5
+
+# WELCOME'da server'ın sunduğu, HELLO'da client'ın seçtiği codec isimleri
+CODEC_BINARY = "bin5"
+CODEC_JSON = "json"
+# Server'ın WELCOME'da sunduğu sıra (tercih edilen önce)
+SUPPORTED_CODECS = (CODEC_BINARY, CODEC_JSON)
+
+FLAG_GAME_OVER = 1
+FLAG_WIN = 2
+FLAG_DELTA = 4
+FLAG_ENEMIES = 8
+FLAG_EXPLOSIONS = 16
+
+_PREFIX = struct.Struct("<BB")
+_HEADER = struct.Struct("<BIIIi")
+_GRID = struct.Struct("<HH")
+_COUNT = struct.Struct("<H")
+_PLAYER = struct.Struct("<BiiBBfIIf")
+_XY = struct.Struct("<ii")
+_ENEMY = struct.Struct("<iiB")
+_POWERUP = struct.Struct("<HHB")
+_TILE = struct.Struct("<HH")
+_WALL = struct.Struct("<HHB")
+
+_POWERUP_CODE = {kind.name: kind.value for kind in PowerUpType}
+_POWERUP_NAME = {kind.value: kind.name for kind in PowerUpType}
+_WALL_CODE = {str(wt): wt.value for wt in WallType}
+_WALL_TYPE_STR = {wt.value: str(wt) for wt in WallType}
+
+
+def choose_codec(offered, preferred: str = CODEC_BINARY) -> str:
+    """
+    Client tarafı seçim: server tercih edilen codec'i sunuyorsa onu, yoksa JSON.
+    Eski server'lar WELCOME'da codec sunmaz -> JSON.
+    """
+    if preferred in (offered or ()) and preferred in SUPPORTED_CODECS:
+        return preferred
+    return CODEC_JSON
+
+
+def is_binary_snapshot(data) -> bool:
+    return len(data) >= 2 and data[0] == KIND_SNAPSHOT
+
+
+def pack_nibbles(cells: bytes) -> bytes:
+    """4-bit değerleri byte başına 2 tane paketler (çift index düşük nibble)."""
+    if len(cells) % 2:
+        cells = bytes(cells) + b"\0"
+    size = len(cells) // 2
+    # Her byte < 16: yüksek nibble'ı 4 bit kaydırıp OR'lamak byte sınırını taşmaz
+    low = int.from_bytes(cells[0::2], "little")
+    high = int.from_bytes(cells[1::2], "little")
+    return (low | (high << 4)).to_bytes(size, "little")
+
+
+def unpack_nibbles(packed: bytes, count: int) -> bytes:
+    size = len(packed)
+    n = int.from_bytes(packed, "little")
+    mask = int.from_bytes(b"\x0f" * size, "little")
+    cells = bytearray(2 * size)
+    cells[0::2] = (n & mask).to_bytes(size, "little")
+    cells[1::2] = ((n >> 4) & mask).to_bytes(size, "little")
+    return bytes(cells[:count])
+
+
+def _wall_cell(w: Dict[str, Any]) -> int:
+    hp = int(w.get("hp", 0))
+    return (_WALL_CODE.get(w.get("type"), WallType.BREAKABLE.value)
+            | ((3 if hp > 3 else max(hp, 0)) << 2))
+
+
+def _wall_dict(gx: int, gy: int, cell: int) -> Dict[str, Any]:
+    wall = {"gx": gx, "gy": gy, "type": _WALL_TYPE_STR[cell & 0x03]}
+    if cell >> 2:
+        wall["hp"] = cell >> 2
+    return wall
+
+
+# -------------------------
+# ENCODE
+# -------------------------
+
+def _pack_list(out: bytearray, st: struct.Struct, rows) -> None:
+    rows = list(rows)
+    out += _COUNT.pack(len(rows))
+    for row in rows:
+        out += st.pack(*row)
+
+
+def encode_snapshot(msg: Dict[str, Any]) -> bytes:
+    delta = msg.get("base") is not None
+    flags = ((FLAG_GAME_OVER if msg.get("game_over") else 0)
+             | (FLAG_WIN if msg.get("win") else 0)
+             | (FLAG_DELTA if delta else 0)
+             | (FLAG_ENEMIES if "enemies" in msg else 0)
+             | (FLAG_EXPLOSIONS if "explosions" in msg else 0))
+
+    out = bytearray(_PREFIX.pack(KIND_SNAPSHOT, VERSION))
+    out += _HEADER.pack(flags, int(msg.get("seq") or 0), int(msg.get("base") or 0),
+                        int(msg.get("tick", 0)), int(msg.get("score", 0)))
+
+    players = msg.get("players", {})
+    _pack_list(out, _PLAYER, (
+        (int(pid), p["x"], p["y"],
+         (1 if p.get("alive", True) else 0) | (2 if p.get("invincible", False) else 0),
+         max(0, min(255, int(p.get("hp", 0)))), float(p.get("inv_timer", 0.0)),
+         int(p.get("input_seq", 0)), int(p.get("input_tick", 0)), float(p.get("speed", 1.0)))
+        for pid, p in players.items()
+    ))
+
+    if delta:
+        _pack_list(out, _WALL, ((w["gx"], w["gy"], _wall_cell(w)) for w in msg.get("walls", [])))
+        _pack_list(out, _TILE, msg.get("walls_removed", []))
+        _pack_list(out, _XY, ((b["x"], b["y"]) for b in msg.get("bombs_add", [])))
+        _pack_list(out, _XY, ((b["x"], b["y"]) for b in msg.get("bombs_removed", [])))
+        _pack_list(out, _POWERUP, (
+            (pu["gx"], pu["gy"], _POWERUP_CODE.get(pu.get("kind"), 0))
+            for pu in msg.get("powerups_add", [])
+        ))
+        _pack_list(out, _TILE, msg.get("powerups_removed", []))
+    else:
+        walls = msg.get("walls", [])
+        gw, gh = msg.get("grid") or (
+            max((w["gx"] for w in walls), default=0) + 1,
+            max((w["gy"] for w in walls), default=0) + 1,
+        )
+        cells = bytearray(gw * gh)
+        for w in walls:
+            if 0 <= w["gx"] < gw and 0 <= w["gy"] < gh:
+                cells[w["gy"] * gw + w["gx"]] = _wall_cell(w)
+        out += _GRID.pack(gw, gh)
+        out += pack_nibbles(cells)
+        _pack_list(out, _XY, ((b["x"], b["y"]) for b in msg.get("bombs", [])))
+        _pack_list(out, _POWERUP, (
+            (pu["gx"], pu["gy"], _POWERUP_CODE.get(pu.get("kind"), 0))
+            for pu in msg.get("powerups", [])
+        ))
+
+    if "enemies" in msg:
+        _pack_list(out, _ENEMY, ((e["x"], e["y"], int(e.get("type", 1))) for e in msg["enemies"]))
+    if "explosions" in msg:
+        _pack_list(out, _XY, ((e["x"], e["y"]) for e in msg["explosions"]))
+    return bytes(out)
+
+
+# -------------------------
+# DECODE
+# -------------------------
+
+def _unpack_list(st: struct.Struct, data, pos: int) -> Tuple[List[tuple], int]:
+    (n,) = _COUNT.unpack_from(data, pos)
+    pos += _COUNT.size
+    end = pos + n * st.size
+    if end > len(data):
+        raise ValueError(f"Truncated snapshot: {end} > {len(data)} bytes")
+    return list(st.iter_unpack(data[pos:end])), end
+
+
+def decode_snapshot(data) -> Dict[str, Any]:
+    """
+    Binary snapshot'ı JSON SNAPSHOT data'sıyla aynı şekle çevirir.
+    Kesik / bozuk payload (ör. eksik gelen UDP datagram'ı) her zaman ValueError olur.
+    """
+    try:
+        return _decode_snapshot(data)
+    except (struct.error, KeyError, IndexError) as e:
+        raise ValueError(f"Corrupt snapshot: {e!r}") from e
+
+
+def _decode_snapshot(data) -> Dict[str, Any]:
+    kind, version = _PREFIX.unpack_from(data, 0)
+    if kind != KIND_SNAPSHOT:
+        raise ValueError(f"Not a binary snapshot (kind={kind})")
+    if version != VERSION:
+        raise ValueError(f"Unsupported snapshot codec version: {version}")
+    pos = _PREFIX.size
+
+    flags, seq, base, tick, score = _HEADER.unpack_from(data, pos)
+    pos += _HEADER.size
+
+    msg: Dict[str, Any] = {"seq": seq, "tick": tick}
+    if flags & FLAG_DELTA:
+        msg["base"] = base
+
+    rows, pos = _unpack_list(_PLAYER, data, pos)
+    msg["players"] = {
+        str(pid): {
+            "x": x, "y": y,
+            "alive": bool(pflags & 1),
+            "hp": hp,
+            "invincible": bool(pflags & 2),
+            "inv_timer": inv_timer,
+            "input_seq": input_seq,
+            "input_tick": input_tick,
+            "speed": speed,
+        }
+        for pid, x, y, pflags, hp, inv_timer, input_seq, input_tick, speed in rows
+    }
+
+    if flags & FLAG_DELTA:
+        rows, pos = _unpack_list(_WALL, data, pos)
+        msg["walls"] = [_wall_dict(gx, gy, cell) for gx, gy, cell in rows]
+        rows, pos = _unpack_list(_TILE, data, pos)
+        msg["walls_removed"] = [list(r) for r in rows]
+        rows, pos = _unpack_list(_XY, data, pos)
+        msg["bombs_add"] = [{"x": x, "y": y} for x, y in rows]
+        rows, pos = _unpack_list(_XY, data, pos)
+        msg["bombs_removed"] = [{"x": x, "y": y} for x, y in rows]
+        rows, pos = _unpack_list(_POWERUP, data, pos)
+        msg["powerups_add"] = [
+            {"gx": gx, "gy": gy, "kind": _POWERUP_NAME.get(k, "")} for gx, gy, k in rows
+        ]
+        rows, pos = _unpack_list(_TILE, data, pos)
+        msg["powerups_removed"] = [list(r) for r in rows]
+    else:
+        gw, gh = _GRID.unpack_from(data, pos)
+        pos += _GRID.size
+        size = (gw * gh + 1) // 2
+        if pos + size > len(data):
+            raise ValueError(f"Truncated snapshot grid: {pos + size} > {len(data)} bytes")
+        cells = unpack_nibbles(data[pos:pos + size], gw * gh)
+        pos += size
+        walls = []
+        for idx in compress(range(gw * gh), cells):
+            gy, gx = divmod(idx, gw)
+            walls.append(_wall_dict(gx, gy, cells[idx]))
+        msg["grid"] = [gw, gh]
+        msg["walls"] = walls
+        rows, pos = _unpack_list(_XY, data, pos)
+        msg["bombs"] = [{"x": x, "y": y} for x, y in rows]
+        rows, pos = _unpack_list(_POWERUP, data, pos)
+        msg["powerups"] = [
+            {"gx": gx, "gy": gy, "kind": _POWERUP_NAME.get(k, "")} for gx, gy, k in rows
+        ]
+
+    if flags & FLAG_ENEMIES:
+        rows, pos = _unpack_list(_ENEMY, data, pos)
+        msg["enemies"] = [{"x": x, "y": y, "type": t} for x, y, t in rows]
+    if flags & FLAG_EXPLOSIONS:
+        rows, pos = _unpack_list(_XY, data, pos)
+        msg["explosions"] = [{"x": x, "y": y} for x, y in rows]
+
+    msg["score"] = score
+    msg["game_over"] = bool(flags & FLAG_GAME_OVER)
+    msg["win"] = bool(flags & FLAG_WIN)
+    return msg
@@ -0,0 +1,439 @@
+# src/net/snapshot_delta.py
+"""
+Ack'lenen baseline'a göre delta SNAPSHOT'lar.
+
+Server her tick World'ün ağa giden durumunu seq numaralı bir SnapshotState olarak yakalar
+ve son HISTORY tick'i saklar. Client uyguladığı son seq'i ACK ile bildirir; server o
+client'a ack'lenen baseline'dan bu yana değişenleri yollar: hareket eden player'lar,
+eklenen / silinen / hasar alan duvarlar, eklenen / silinen bomba ve powerup'lar.
+Baseline yoksa (ilk bağlantı, ACK göndermeyen client, history'den düşmüş ack) keyframe,
+yani tam snapshot gider.
+
+Mesaj formatı (JSON ve binary codec aynı dict'i taşır):
+    keyframe: make_snapshot() formatı + "seq", "tick", "grid"
+    delta:    "seq", "tick", "base", değişen "players", "walls" + "walls_removed",
+              "bombs_add" / "bombs_removed", "powerups_add" / "powerups_removed",
+              değiştiyse "enemies" / "explosions"; "score", "game_over", "win" her zaman
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
+
+from model.entities import WallType
+from model.grid_changes import GridChange, GridChangeKind
+
+GridPos = Tuple[int, int]
+# (x, y, alive, hp, invincible, inv_timer, input_seq, input_tick, speed)
+# input_seq: server'ın uyguladığı son INPUT seq'i, input_tick: uygulandığı tick,
+# speed: hız çarpanı (SpeedBoostState); üçü de client prediction için
+PlayerState = Tuple[int, int, bool, int, bool, float, int, int, float]
+# (x, y, type)
+EnemyState = Tuple[int, int, int]
+# (WallType.value, hp); hp 0 = gönderilmez (UNBREAKABLE)
+WallState = Tuple[int, int]
+
+_WALL_CHANGES = (
+    GridChangeKind.WALL_ADDED,
+    GridChangeKind.WALL_REMOVED,
+    GridChangeKind.WALL_DAMAGED,
+)
+_WALL_TYPE_STR = {wt.value: str(wt) for wt in WallType}
+_WALL_CODE_BY_STR = {str(wt): wt.value for wt in WallType}
+
+
+@dataclass
+class SnapshotState:
+    """
+    Bir tick'in ağ durumu. Alanlar karşılaştırılabilir tuple/dict'ler; duvar dict'i
+    değişmeyen tick'ler arasında paylaşılır, bu yüzden yerinde değiştirilmez.
+    """
+    seq: Optional[int]
+    # State'in yakalandığı server tick'i (client interpolasyonu bununla zamanlar)
+    tick: int
+    players: Dict[str, PlayerState]
+    enemies: Tuple[EnemyState, ...]
+    walls: Dict[GridPos, WallState]
+    bombs: FrozenSet[Tuple[int, int]]
+    powerups: Dict[GridPos, str]
+    explosions: Tuple[Tuple[int, int], ...]
+    score: int = 0
+    game_over: bool = False
+    win: bool = False
+
+
+# -------------------------
+# World -> state (server)
+# -------------------------
+
+def wall_state(wall) -> WallState:
+    wt = wall.wall_type
+    if wt is WallType.UNBREAKABLE:
+        return (wt.value, 0)
+    return (wt.value, int(wall.hp))
+
+
+def capture_state(world, seq: int, walls: Dict[GridPos, WallState],
+                  score: int = 0, game_over: bool = False, win: bool = False) -> SnapshotState:
+    ts = world.config.TILE_SIZE
+    return SnapshotState(
+        seq=seq,
+        tick=int(getattr(world, "tick", 0)),
+        players={
+            str(pid): (
+                int(p.rect.x), int(p.rect.y),
+                bool(getattr(p, "alive", True)),
+                int(getattr(p, "hp", 0)),
+                bool(getattr(p, "invincible", False)),
+                float(getattr(p, "inv_timer", 0.0)),
+                int(getattr(p, "input_seq", 0)),
+                int(getattr(p, "input_tick", 0)),
+                float(p.speed_multiplier()),
+            )
+            for pid, p in world.players.items()
+        },
+        enemies=tuple(
+            (int(e.rect.x), int(e.rect.y), int(getattr(e, "enemy_type", 1)))
+            for e in world.enemies
+        ),
+        walls=walls,
+        bombs=frozenset((int(b.rect.x), int(b.rect.y)) for b in world.bombs if not b.exploded),
+        powerups={
+            (pu.rect.centerx // ts, pu.rect.centery // ts):
+                getattr(getattr(pu, "kind", None), "name", str(getattr(pu, "kind", "")))
+            for pu in world.powerups
+        },
+        explosions=tuple((int(fx.rect.x), int(fx.rect.y)) for fx in world.explosions_fx),
+        score=int(score),
+        game_over=bool(game_over),
+        win=bool(win),
+    )
+
+
+class SnapshotHistory:
+    """
+    Server tarafı: tek bir World'ün son `size` tick'lik SnapshotState geçmişi.
+    Duvarlar her tick taranmaz; grid_changes'ten gelen dirty tile'lar bir önceki
+    duvar dict'ine uygulanır (değişiklik yoksa aynı dict paylaşılır).
+    """
+
+    def __init__(self, world, size: int = 64):
+        self.world = world
+        self.size = max(1, int(size))
+        self.seq = 0
+
+        self._states: Dict[int, SnapshotState] = {}
+        self._walls: Optional[Dict[GridPos, WallState]] = None
+        self._dirty: Set[GridPos] = set()
+        # (seq, base) -> mesaj; sadece son yakalanan state için tutulur
+        self._messages: Dict[Tuple[int, Optional[int]], Dict[str, Any]] = {}
+        world.grid_changes.subscribe(self._on_grid_change)
+
+    def _on_grid_change(self, change: GridChange) -> None:
+        if change.kind is GridChangeKind.RESET:
+            self._walls = None
+            self._dirty.clear()
+        elif change.kind in _WALL_CHANGES and self._walls is not None:
+            self._dirty.update(change.tiles)
+
+    def _capture_walls(self) -> Dict[GridPos, WallState]:
+        world = self.world
+        if self._walls is None:
+            ts = world.config.TILE_SIZE
+            self._walls = {(w.rect.x // ts, w.rect.y // ts): wall_state(w) for w in world.walls}
+        elif self._dirty:
+            walls = dict(self._walls)
+            for gx, gy in self._dirty:
+                w = world._get_wall_at(gx, gy)
+                if w is None:
+                    walls.pop((gx, gy), None)
+                else:
+                    walls[(gx, gy)] = wall_state(w)
+            self._dirty.clear()
+            self._walls = walls
+        return self._walls
+
+    def capture(self, score: int = 0, game_over: bool = False, win: bool = False) -> SnapshotState:
+        self.seq += 1
+        state = capture_state(self.world, self.seq, self._capture_walls(), score, game_over, win)
+        self._states[state.seq] = state
+        self._states.pop(state.seq - self.size, None)
+        self._messages.clear()
+        return state
+
+    def get(self, seq: Optional[int]) -> Optional[SnapshotState]:
+        if seq is None:
+            return None
+        return self._states.get(seq)
+
+    def message(self, state: SnapshotState, base: Optional[int] = None) -> Dict[str, Any]:
+        """state için base'e göre delta; base history'de yoksa keyframe."""
+        baseline = self.get(base)
+        if baseline is not None and baseline.seq > state.seq:
+            baseline = None
+        key = (state.seq, baseline.seq if baseline is not None else None)
+        msg = self._messages.get(key)
+        if msg is None:
+            if baseline is None:
+                cfg = self.world.config
+                msg = keyframe_message(state, (cfg.GRID_WIDTH, cfg.GRID_HEIGHT))
+            else:
+                msg = delta_message(baseline, state)
+            self._messages[key] = msg
+        return msg
+
+
+# -------------------------
+# state -> mesaj (server)
+# -------------------------
+
+def _player_msg(ps: PlayerState) -> Dict[str, Any]:
+    x, y, alive, hp, invincible, inv_timer, input_seq, input_tick, speed = ps
+    return {"x": x, "y": y, "alive": alive, "hp": hp,
+            "invincible": invincible, "inv_timer": inv_timer,
+            "input_seq": input_seq, "input_tick": input_tick, "speed": speed}
+
+
+def _wall_msg(pos: GridPos, ws: WallState) -> Dict[str, Any]:
+    code, hp = ws
+    msg = {"gx": pos[0], "gy": pos[1], "type": _WALL_TYPE_STR.get(code, "")}
+    if hp:
+        msg["hp"] = hp
+    return msg
+
+
+def _enemies_msg(enemies) -> List[Dict[str, Any]]:
+    return [{"x": x, "y": y, "type": t} for x, y, t in enemies]
+
+
+def _xy_msg(items) -> List[Dict[str, int]]:
+    return [{"x": x, "y": y} for x, y in items]
+
+
+def _powerup_msg(pos: GridPos, kind: str) -> Dict[str, Any]:
+    return {"gx": pos[0], "gy": pos[1], "kind": kind}
+
+
+def keyframe_message(state: SnapshotState, grid: Optional[GridPos] = None) -> Dict[str, Any]:
+    msg = {
+        "seq": state.seq,
+        "tick": state.tick,
+        "players": {pid: _player_msg(ps) for pid, ps in state.players.items()},
+        "bombs": _xy_msg(state.bombs),
+        "enemies": _enemies_msg(state.enemies),
+        "walls": [_wall_msg(pos, ws) for pos, ws in state.walls.items()],
+        "powerups": [_powerup_msg(pos, kind) for pos, kind in state.powerups.items()],
+        "score": state.score,
+        "explosions": _xy_msg(state.explosions),
+        "game_over": state.game_over,
+        "win": state.win,
+    }
+    if grid is not None:
+        msg["grid"] = [grid[0], grid[1]]
+    return msg
+
+
+def delta_message(base: SnapshotState, state: SnapshotState) -> Dict[str, Any]:
+    msg: Dict[str, Any] = {
+        "seq": state.seq,
+        "tick": state.tick,
+        "base": base.seq,
+        "players": {
+            pid: _player_msg(ps)
+            for pid, ps in state.players.items()
+            if base.players.get(pid) != ps
+        },
+        "score": state.score,
+        "game_over": state.game_over,
+        "win": state.win,
+    }
+
+    if base.walls is not state.walls:
+        msg["walls"] = [
+            _wall_msg(pos, ws) for pos, ws in state.walls.items() - base.walls.items()
+        ]
+        msg["walls_removed"] = [list(pos) for pos in base.walls.keys() - state.walls.keys()]
+    else:
+        msg["walls"] = []
+        msg["walls_removed"] = []
+
+    msg["bombs_add"] = _xy_msg(state.bombs - base.bombs)
+    msg["bombs_removed"] = _xy_msg(base.bombs - state.bombs)
+    msg["powerups_add"] = [
+        _powerup_msg(pos, kind) for pos, kind in state.powerups.items() - base.powerups.items()
+    ]
+    msg["powerups_removed"] = [
+        list(pos) for pos in base.powerups.keys() - state.powerups.keys()
+    ]
+
+    if state.enemies != base.enemies:
+        msg["enemies"] = _enemies_msg(state.enemies)
+    if state.explosions != base.explosions:
+        msg["explosions"] = _xy_msg(state.explosions)
+    return msg
+
+
+# -------------------------
+# mesaj -> state (client)
+# -------------------------
+
+def _player_state(d: Dict[str, Any]) -> PlayerState:
+    return (
+        int(d["x"]), int(d["y"]),
+        bool(d.get("alive", True)),
+        int(d.get("hp", 0)),
+        bool(d.get("invincible", False)),
+        float(d.get("inv_timer", 0.0)),
+        int(d.get("input_seq", 0)),
+        int(d.get("input_tick", 0)),
+        float(d.get("speed", 1.0)),
+    )
+
+
+def _wall_code(type_str: str) -> int:
+    code = _WALL_CODE_BY_STR.get(type_str)
+    if code is not None:
+        return code
+    s = (type_str or "").upper()
+    if "UNBREAKABLE" in s:
+        return WallType.UNBREAKABLE.value
+    if "HARD" in s:
+        return WallType.HARD.value
+    return WallType.BREAKABLE.value
+
+
+def _wall_entry(d: Dict[str, Any]) -> Tuple[GridPos, WallState]:
+    return (int(d["gx"]), int(d["gy"])), (_wall_code(d.get("type", "")), int(d.get("hp", 0)))
+
+
+def _xy_set(items) -> FrozenSet[Tuple[int, int]]:
+    return frozenset((int(d["x"]), int(d["y"])) for d in items)
+
+
+def _enemies(items) -> Tuple[EnemyState, ...]:
+    return tuple((int(d["x"]), int(d["y"]), int(d.get("type", 1))) for d in items)
+
+
+def _explosions(items) -> Tuple[Tuple[int, int], ...]:
+    return tuple((int(d["x"]), int(d["y"])) for d in items)
+
+
+def state_from_message(msg: Dict[str, Any], base: Optional[SnapshotState] = None) -> SnapshotState:
+    """Keyframe'den (base=None) ya da base + delta'dan tam state kurar."""
+    common = dict(
+        seq=msg.get("seq"),
+        tick=int(msg.get("tick", 0)),
+        score=int(msg.get("score", 0)),
+        game_over=bool(msg.get("game_over", False)),
+        win=bool(msg.get("win", False)),
+    )
+
+    if base is None:
+        return SnapshotState(
+            players={pid: _player_state(d) for pid, d in msg.get("players", {}).items()},
+            enemies=_enemies(msg.get("enemies", [])),
+            walls=dict(_wall_entry(w) for w in msg.get("walls", [])),
+            bombs=_xy_set(msg.get("bombs", [])),
+            powerups={
+                (int(d["gx"]), int(d["gy"])): str(d.get("kind", ""))
+                for d in msg.get("powerups", [])
+            },
+            explosions=_explosions(msg.get("explosions", [])),
+            **common,
+        )
+
+    players = dict(base.players)
+    for pid, d in msg.get("players", {}).items():
+        players[pid] = _player_state(d)
+
+    walls = base.walls
+    if msg.get("walls") or msg.get("walls_removed"):
+        walls = dict(walls)
+        for gx, gy in msg.get("walls_removed", []):
+            walls.pop((int(gx), int(gy)), None)
+        walls.update(_wall_entry(w) for w in msg.get("walls", []))
+
+    powerups = base.powerups
+    if msg.get("powerups_add") or msg.get("powerups_removed"):
+        powerups = dict(powerups)
+        for gx, gy in msg.get("powerups_removed", []):
+            powerups.pop((int(gx), int(gy)), None)
+        for d in msg.get("powerups_add", []):
+            powerups[(int(d["gx"]), int(d["gy"]))] = str(d.get("kind", ""))
+
+    bombs = base.bombs
+    if msg.get("bombs_add") or msg.get("bombs_removed"):
+        bombs = (bombs - _xy_set(msg.get("bombs_removed", []))) | _xy_set(msg.get("bombs_add", []))
+
+    return SnapshotState(
+        players=players,
+        enemies=_enemies(msg["enemies"]) if "enemies" in msg else base.enemies,
+        walls=walls,
+        bombs=bombs,
+        powerups=powerups,
+        explosions=_explosions(msg["explosions"]) if "explosions" in msg else base.explosions,
+        **common,
+    )
+
+
+class SnapshotReceiver:
+    """
+    Client tarafı: gelen keyframe/delta'lardan tam state'leri kurar.
+    Baseline'ı bilinmeyen delta None döner (client keyframe ister).
+    """
+
+    def __init__(self, size: int = 64):
+        self.size = max(1, int(size))
+        self._states: Dict[int, SnapshotState] = {}
+
+    def receive(self, msg: Dict[str, Any]) -> Optional[SnapshotState]:
+        base_seq = msg.get("base")
+        if base_seq is None:
+            state = state_from_message(msg)
+        else:
+            base = self._states.get(base_seq)
+            if base is None:
+                return None
+            state = state_from_message(msg, base)
+            # Server ack'lerden daha eski bir baseline'a dönmez
+            for seq in [s for s in self._states if s < base_seq]:
+                del self._states[seq]
+        if state.seq is not None:
+            self._states[state.seq] = state
+            for seq in [s for s in self._states if s <= state.seq - self.size]:
+                del self._states[seq]
+        return state
+
+
+# -------------------------
+# state -> PlayingState._apply_snapshot
+# -------------------------
+
+def apply_dict(state: SnapshotState, prev: Optional[SnapshotState] = None) -> Dict[str, Any]:
+    """
+    Client world'üne uygulanacak snapshot dict'i.
+    Duvarlar prev'e göre artımlıdır ("walls" + "walls_removed"); prev yoksa tam liste.
+    Diğer alanlar küçük olduğu için her zaman tam gönderilir.
+    """
+    snap = keyframe_message(SnapshotState(
+        seq=state.seq,
+        tick=state.tick,
+        players=state.players,
+        enemies=state.enemies,
+        walls={},
+        bombs=state.bombs,
+        powerups=state.powerups,
+        explosions=state.explosions,
+        score=state.score,
+        game_over=state.game_over,
+        win=state.win,
+    ))
+
+    if prev is None:
+        snap["walls"] = [_wall_msg(pos, ws) for pos, ws in state.walls.items()]
+    elif prev.walls is state.walls:
+        snap["walls_removed"] = []
+    else:
+        snap["walls"] = [_wall_msg(pos, ws) for pos, ws in state.walls.items() - prev.walls.items()]
+        snap["walls_removed"] = [list(pos) for pos in prev.walls.keys() - state.walls.keys()]
+    return snap
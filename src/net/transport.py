@@ -0,0 +1,510 @@
+# src/net/transport.py
+from __future__ import annotations
+
+import json
+import queue
+import secrets
+import selectors
+import socket
+import threading
+import time
+from collections import deque
+from itertools import islice
+from typing import Any, Deque, Dict, List, Optional, Tuple, Union
+
+from net.protocol import FrameReader, check_client_message, encode_frame
+from net.udp import MAX_DATAGRAM, encode_datagram, frame_payload, unpack_inputs, wrap_loss
+
+# poll() event türleri
+OPEN = "open"
+MESSAGE = "message"
+CLOSE = "close"
+
+Event = Tuple[str, int, Optional[Dict[str, Any]]]
+Chunk = Union[bytes, memoryview]
+
+
+def queue_limits(config) -> Dict[str, Any]:
+    """Config'teki kuyruk sınırları -> SelectorTransport kwargs'ı (config yoksa varsayılanlar)."""
+    if config is None:
+        return {}
+    return {
+        "queue_limit": int(getattr(config, "NET_SEND_QUEUE_SNAPSHOTS", 8)),
+        "max_queue_bytes": int(getattr(config, "NET_SEND_QUEUE_MAX_BYTES", 1 << 20)),
+        "slow_timeout": float(getattr(config, "NET_SLOW_CLIENT_TIMEOUT", 5.0)),
+        "udp": bool(getattr(config, "NET_UDP", False)),
+        "udp_loss": float(getattr(config, "NET_UDP_LOSS", 0.0)),
+    }
+
+
+def _send_chunks(sock: socket.socket, chunks: List[Chunk]) -> int:
+    """Kuyruktaki frame'leri tek syscall'da yazar (sendmsg yoksa birleştirip send)."""
+    if len(chunks) == 1:
+        return sock.send(chunks[0])
+    if hasattr(sock, "sendmsg"):
+        return sock.sendmsg(chunks)
+    return sock.send(b"".join(chunks))  # Windows: sendmsg yok
+
+
+class _Conn:
+    __slots__ = ("conn_id", "sock", "addr", "reader", "wbuf", "wlen", "snapshots",
+                 "dropped", "behind_since", "closing", "writing", "udp_token", "udp_addr")
+
+    def __init__(self, conn_id: int, sock: socket.socket, addr):
+        self.conn_id = conn_id
+        self.sock = sock
+        self.addr = addr
+        self.reader = FrameReader(SelectorTransport.READ_BUFFER)
+        # Yazma kuyruğu: (frame, snapshot mı) — encode edilmiş frame'ler kopyalanmadan sıraya
+        # girer (broadcast'te aynı bytes objesi tüm kuyruklarda paylaşılır); yarım yazılan baş
+        # memoryview olur ve artık atılamaz
+        self.wbuf: Deque[Tuple[Chunk, bool]] = deque()
+        self.wlen = 0
+        # Kuyruktaki atılabilir snapshot frame sayısı / toplam atılan
+        self.snapshots = 0
+        self.dropped = 0
+        # Kuyruk taşıp en son ne zamandan beri boşalmadı (None = yetişiyor)
+        self.behind_since: Optional[float] = None
+        # close() istendi: bekleyen yazma bitince kapanır
+        self.closing = False
+        # selector'da EVENT_WRITE ile kayıtlı mı
+        self.writing = False
+        # UDP kanalı: WELCOME'da verilen token, BIND'den sonra client'ın UDP adresi
+        self.udp_token = secrets.randbits(32)
+        self.udp_addr = None
+
+
+class SelectorTransport:
+    """
+    selectors tabanlı, tek I/O thread'li TCP transport (server tarafı).
+    - accept / okuma / yazma hepsi tek thread'de, soketler non-blocking
+    - Her bağlantının kendi yazma kuyruğu var: send() sadece kuyruğa ekler ve
+      I/O thread'ini uyandırır, tick thread'i hiçbir zaman sokete bloklanmaz
+    - Frame'ler kuyruğa kopyalanmaz; bir kez encode edilen frame tüm client'lara paylaşılır,
+      soket yazımı sendmsg ile birden çok frame'i tek syscall'da gönderir
+    - Kuyruklar sınırlı: kuyrukta queue_limit'ten fazla snapshot birikirse eskiler atılır, en
+      yenisi kalır (delta'lar client'ın ack'ine göre olduğundan atılan snapshot bir şey bozmaz).
+      slow_timeout boyunca yetişemeyen ya da max_queue_bytes'ı aşan client atılır (CLOSE event'i)
+    - Gelen frame'ler JSON'a çözülüp poll() ile alınan tek kuyruğa yazılır:
+      (OPEN, conn_id, {"addr": ...}) / (MESSAGE, conn_id, msg) / (CLOSE, conn_id, None)
+    Yavaş bir client sadece kendi buffer'ını büyütür, simülasyonu bekletmez.
+    udp=True: aynı port numarasında bir UDP soketi de açılır (net.udp). BIND ile bağlanan
+    client'ın datagram'ları aynı event kuyruğuna MESSAGE olarak düşer; send_datagram()
+    snapshot'ı kuyruğa girmeden doğrudan yollar.
+    """
+
+    # Bağlantı başına okuma tamponu; client'lar sadece küçük input frame'leri yollar,
+    # daha büyük frame gelirse tampon büyür
+    READ_BUFFER = 16384
+    # Tek sendmsg çağrısında yazılan en fazla frame
+    SEND_BATCH = 64
+
+    def __init__(self, host: str, port: int, backlog: int = 128, queue_limit: int = 8,
+                 max_queue_bytes: int = 1 << 20, slow_timeout: float = 5.0,
+                 udp: bool = False, udp_loss: float = 0.0):
+        self.host = host
+        self.port = port
+        self.backlog = backlog
+        self.queue_limit = max(1, int(queue_limit))
+        self.max_queue_bytes = int(max_queue_bytes)
+        self.slow_timeout = float(slow_timeout)
+        # Yavaş olduğu için atılan toplam bağlantı
+        self.evicted = 0
+        self.udp = bool(udp)
+        self.udp_loss = float(udp_loss)
+
+        self._sel = selectors.DefaultSelector()
+        self._listener: socket.socket | None = None
+        self._udp_sock: socket.socket | None = None
+        # Gönderim için (NET_UDP_LOSS > 0 ise LossShim)
+        self._udp_out = None
+        self._udp_port = 0
+        # UDP kaynak adresi -> conn_id (sadece I/O thread'i değiştirir)
+        self._udp_conns: Dict[Any, int] = {}
+        self._conns: Dict[int, _Conn] = {}
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+        # I/O thread'ini select()'ten uyandırmak için socketpair
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        # Yazacak verisi olan bağlantılar (tick thread'i ekler, I/O thread'i boşaltır)
+        self._pending: set[int] = set()
+
+        self.events: "queue.Queue[Event]" = queue.Queue()
+        self.running = False
+        self._thread: threading.Thread | None = None
+
+    # ---------- lifecycle ----------
+    def start(self) -> None:
+        self._listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._listener.bind((self.host, self.port))
+        self._listener.listen(self.backlog)
+        self._listener.setblocking(False)
+
+        self._sel.register(self._listener, selectors.EVENT_READ, "listener")
+        self._sel.register(self._wake_r, selectors.EVENT_READ, "wake")
+
+        if self.udp:
+            self._udp_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self._udp_sock.bind((self.host, self._listener.getsockname()[1]))
+            self._udp_sock.setblocking(False)
+            self._udp_port = self._udp_sock.getsockname()[1]
+            self._udp_out = wrap_loss(self._udp_sock, self.udp_loss)
+            self._sel.register(self._udp_sock, selectors.EVENT_READ, "udp")
+
+        self.running = True
+        self._thread = threading.Thread(target=self._io_loop, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self.running = False
+        self._wake()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    # ---------- tick thread API ----------
+    def poll(self) -> List[Event]:
+        out: List[Event] = []
+        while True:
+            try:
+                out.append(self.events.get_nowait())
+            except queue.Empty:
+                return out
+
+    def send(self, conn_id: int, payload: Dict[str, Any]) -> bool:
+        return self.send_frame(conn_id, encode_frame(payload))
+
+    def send_frame(self, conn_id: int, frame: bytes, flush: bool = True, snapshot: bool = False) -> bool:
+        """
+        Frame'i bağlantının yazma kuyruğuna ekler; bloklamaz, kopyalamaz (frame değiştirilmemeli).
+        flush=False: I/O thread'i uyandırılmaz, çok sayıda gönderimden sonra flush() çağrılır.
+        snapshot=True: kuyruk taşarsa yenisi gelince atılabilir frame.
+        Bağlantı yoksa ya da client yavaş diye atıldıysa False.
+        """
+        with self._lock:
+            conn = self._conns.get(conn_id)
+            if conn is None or conn.closing:
+                return False
+            if snapshot and conn.snapshots >= self.queue_limit:
+                self._drop_stale(conn)
+            conn.wbuf.append((frame, snapshot))
+            conn.wlen += len(frame)
+            if snapshot:
+                conn.snapshots += 1
+            evict = conn.wlen > self.max_queue_bytes or (
+                conn.behind_since is not None
+                and time.monotonic() - conn.behind_since > self.slow_timeout)
+            if evict:
+                self._evict(conn)
+            wake = (flush or evict) and not self._pending
+            self._pending.add(conn_id)
+        if wake:
+            self._wake()
+        return not evict
+
+    def udp_welcome(self, conn_id: int) -> Dict[str, Any]:
+        """WELCOME'a eklenecek UDP bilgisi ({"udp": {"port", "token"}}); UDP kapalıysa boş."""
+        with self._lock:
+            conn = self._conns.get(conn_id)
+            if not self.udp or conn is None:
+                return {}
+            return {"udp": {"port": self._udp_port, "token": conn.udp_token}}
+
+    def send_datagram(self, conn_id: int, frame: bytes) -> bool:
+        """
+        Frame'in payload'ını client'ın UDP adresine doğrudan yollar (kuyruk yok, kayıp olabilir).
+        Client UDP'ye bağlı değilse ya da payload MAX_DATAGRAM'ı aşıyorsa False: TCP'den gönderilmeli.
+        """
+        with self._lock:
+            conn = self._conns.get(conn_id)
+            addr = conn.udp_addr if conn is not None and not conn.closing else None
+        payload = frame_payload(frame)
+        if addr is None or len(payload) > MAX_DATAGRAM:
+            return False
+        try:
+            self._udp_out.sendto(payload, addr)
+        except OSError:
+            pass  # soket tamponu dolu vb.: datagram kaybolmuş sayılır
+        return True
+
+    def flush(self) -> None:
+        """Bekleyen yazmalar için I/O thread'ini uyandırır."""
+        with self._lock:
+            if not self._pending:
+                return
+        self._wake()
+
+    def close(self, conn_id: int) -> None:
+        """Bekleyen yazmalar gönderildikten sonra bağlantıyı kapatır."""
+        with self._lock:
+            conn = self._conns.get(conn_id)
+            if conn is None:
+                return
+            conn.closing = True
+            self._pending.add(conn_id)
+        self._wake()
+
+    def pending_bytes(self, conn_id: int) -> int:
+        with self._lock:
+            conn = self._conns.get(conn_id)
+            return conn.wlen if conn is not None else 0
+
+    def queue_stats(self) -> Dict[int, Dict[str, Any]]:
+        """Bağlantı başına kuyruk derinliği: bekleyen frame / byte, atılan snapshot, ne kadar süredir geride."""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                conn_id: {
+                    "frames": len(conn.wbuf),
+                    "bytes": conn.wlen,
+                    "dropped": conn.dropped,
+                    "behind": 0.0 if conn.behind_since is None else now - conn.behind_since,
+                }
+                for conn_id, conn in self._conns.items()
+            }
+
+    def _drop_stale(self, conn: _Conn) -> None:
+        # _lock altında: kuyruktaki snapshot'ları at (yeni gelen en güncelidir), diğer frame'ler sırayla kalır
+        kept: Deque[Tuple[Chunk, bool]] = deque()
+        for chunk, snapshot in conn.wbuf:
+            if snapshot:
+                conn.wlen -= len(chunk)
+                conn.dropped += 1
+            else:
+                kept.append((chunk, snapshot))
+        conn.wbuf = kept
+        conn.snapshots = 0
+        if conn.behind_since is None:
+            conn.behind_since = time.monotonic()
+
+    def _evict(self, conn: _Conn) -> None:
+        # _lock altında: bekleyen veri atılır, I/O thread'i bağlantıyı kapatıp CLOSE üretir
+        print(f"[Transport] evicting slow client conn={conn.conn_id} queued={conn.wlen}B")
+        conn.wbuf.clear()
+        conn.wlen = 0
+        conn.snapshots = 0
+        conn.closing = True
+        self.evicted += 1
+
+    def connection_count(self) -> int:
+        with self._lock:
+            return len(self._conns)
+
+    def _wake(self) -> None:
+        try:
+            self._wake_w.send(b"\0")
+        except (BlockingIOError, OSError):
+            pass  # buffer dolu: zaten uyanacak
+
+    # ---------- I/O thread ----------
+    def _io_loop(self) -> None:
+        try:
+            while self.running:
+                for key, mask in self._sel.select(timeout=0.5):
+                    tag = key.data
+                    if tag == "listener":
+                        self._accept()
+                    elif tag == "wake":
+                        self._drain_wake()
+                    elif tag == "udp":
+                        self._read_udp()
+                    else:
+                        self._service(tag, mask)
+                self._flush_pending()
+        finally:
+            for conn in list(self._conns.values()):
+                self._drop(conn, notify=False)
+            for s in (self._listener, self._udp_sock, self._wake_r, self._wake_w):
+                try:
+                    if s is not None:
+                        s.close()
+                except Exception:
+                    pass
+            self._sel.close()
+
+    def _service(self, conn: _Conn, mask: int) -> None:
+        # Tek bağlantıdaki beklenmeyen hata sadece o bağlantıyı kapatır, I/O thread'i devam eder
+        try:
+            if mask & selectors.EVENT_READ:
+                self._read(conn)
+            if mask & selectors.EVENT_WRITE and conn.conn_id in self._conns:
+                self._flush(conn)
+        except Exception as e:
+            print(f"[Transport] conn={conn.conn_id} failed: {repr(e)}")
+            self._drop(conn)
+
+    def _accept(self) -> None:
+        assert self._listener is not None
+        while True:
+            try:
+                sock, addr = self._listener.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                return
+            sock.setblocking(False)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            with self._lock:
+                conn = _Conn(self._next_id, sock, addr)
+                self._next_id += 1
+                self._conns[conn.conn_id] = conn
+            self._sel.register(sock, selectors.EVENT_READ, conn)
+            self.events.put((OPEN, conn.conn_id, {"addr": addr}))
+
+    def _drain_wake(self) -> None:
+        try:
+            while self._wake_r.recv(4096):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+
+    def _read(self, conn: _Conn) -> None:
+        try:
+            n = conn.reader.fill(conn.sock)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            n = 0
+        if not n:
+            self._drop(conn)
+            return
+
+        try:
+            for payload in conn.reader.frames():
+                msg = check_client_message(json.loads(str(payload, "utf-8")))
+                if msg.get("type") == "UDP_OFF":
+                    # Client UDP'ye bağlanamadı: snapshot'lar TCP'den devam eder
+                    self._unbind_udp(conn)
+                    continue
+                self.events.put((MESSAGE, conn.conn_id, msg))
+        except ValueError as e:
+            # Bozuk JSON / geçersiz mesaj ya da MAX_FRAME'i aşan uzunluk: sadece bu bağlantı kapanır
+            print(f"[Transport] bad frame conn={conn.conn_id}: {repr(e)}")
+            self._drop(conn)
+
+    def _read_udp(self) -> None:
+        assert self._udp_sock is not None
+        while True:
+            try:
+                data, addr = self._udp_sock.recvfrom(65536)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                continue  # önceki sendto'nun ICMP hatası vb.
+            # Datagram kimliksiz gelir ve bağlantıya ait değildir: çözme / doğrulama / BIND'deki
+            # herhangi bir hata (ValueError, derin iç içe JSON'da RecursionError...) sadece o
+            # datagram'ı düşürür, I/O thread'i ayakta kalır
+            try:
+                self._handle_datagram(data, addr)
+            except Exception:
+                continue
+
+    def _handle_datagram(self, data: bytes, addr) -> None:
+        msg = check_client_message(json.loads(str(data, "utf-8")))
+        msgs = [check_client_message(m) for m in unpack_inputs(msg)]
+
+        conn_id = self._udp_conns.get(addr)
+        if msg.get("type") == "BIND":
+            self._bind_udp(msg.get("token"), addr)
+        elif conn_id is not None:
+            for m in msgs:
+                self.events.put((MESSAGE, conn_id, m))
+
+    def _bind_udp(self, token, addr) -> None:
+        with self._lock:
+            conn = next((c for c in self._conns.values() if c.udp_token == token), None)
+            if conn is None:
+                return
+            if conn.udp_addr is not None and conn.udp_addr != addr:
+                self._udp_conns.pop(conn.udp_addr, None)
+            conn.udp_addr = addr
+        self._udp_conns[addr] = conn.conn_id
+        try:
+            self._udp_out.sendto(encode_datagram({"type": "BOUND"}), addr)
+        except OSError:
+            pass  # client BIND'i tekrarlar
+
+    def _unbind_udp(self, conn: _Conn) -> None:
+        with self._lock:
+            addr, conn.udp_addr = conn.udp_addr, None
+        if addr is not None:
+            self._udp_conns.pop(addr, None)
+
+    def _flush_pending(self) -> None:
+        with self._lock:
+            if not self._pending:
+                return
+            ids = list(self._pending)
+            self._pending.clear()
+        for conn_id in ids:
+            conn = self._conns.get(conn_id)
+            if conn is not None:
+                self._service(conn, selectors.EVENT_WRITE)
+
+    def _flush(self, conn: _Conn) -> None:
+        with self._lock:
+            if conn.wbuf:
+                try:
+                    sent = _send_chunks(
+                        conn.sock, [chunk for chunk, _ in islice(conn.wbuf, self.SEND_BATCH)])
+                except (BlockingIOError, InterruptedError):
+                    sent = 0
+                except OSError:
+                    sent = -1
+                if sent > 0:
+                    self._consume(conn, sent)
+            else:
+                sent = 0
+            remaining = conn.wlen
+            closing = conn.closing
+            if not remaining:
+                conn.behind_since = None
+
+        if sent < 0 or (closing and not remaining):
+            self._drop(conn)
+            return
+
+        # Kalan veri varsa soket yazılabilir olunca devam et
+        want_write = remaining > 0
+        if want_write != conn.writing:
+            conn.writing = want_write
+            events = selectors.EVENT_READ | (selectors.EVENT_WRITE if want_write else 0)
+            self._sel.modify(conn.sock, events, conn)
+
+    @staticmethod
+    def _consume(conn: _Conn, sent: int) -> None:
+        wbuf = conn.wbuf
+        conn.wlen -= sent
+        while sent:
+            head, snapshot = wbuf[0]
+            if snapshot:
+                conn.snapshots -= 1
+            if len(head) <= sent:
+                sent -= len(head)
+                wbuf.popleft()
+            else:
+                # Yarım yazılan frame atılamaz (stream bozulur)
+                wbuf[0] = (memoryview(head)[sent:], False)
+                sent = 0
+
+    def _drop(self, conn: _Conn, notify: bool = True) -> None:
+        with self._lock:
+            if self._conns.pop(conn.conn_id, None) is None:
+                return
+            self._pending.discard(conn.conn_id)
+        if conn.udp_addr is not None:
+            self._udp_conns.pop(conn.udp_addr, None)
+        try:
+            self._sel.unregister(conn.sock)
+        except (KeyError, ValueError):
+            pass
+        try:
+            conn.sock.close()
+        except Exception:
+            pass
+        if notify:
+            self.events.put((CLOSE, conn.conn_id, None))
@@ -0,0 +1,82 @@
+# src/net/udp.py
+"""
+Snapshot ve input'lar için isteğe bağlı UDP kanalı (NET_UDP).
+
+TCP (net.protocol) handshake ve güvenilir mesajlar için kalır: WELCOME, HELLO, maç sonu
+snapshot'ı. UDP'de her datagram tek mesajdır (TCP frame'inin length prefix'siz payload'ı):
+- Bağlanma: WELCOME {"udp": {"port", "token"}} -> client UDP'den BIND {"token"} yollar, server
+  kaynak adresi bağlantıya bağlar ve BOUND ile cevaplar. Cevap gelmezse client TCP'den UDP_OFF
+  yollar ve her şey TCP'de kalır.
+- Snapshot'lar seq numaralı, en yenisi kazanır: client gördüğünden eski seq'i atar, kaybolan
+  snapshot beklenmez (delta'lar zaten client'ın ACK'lediği baseline'a göre).
+  MAX_DATAGRAM'a sığmayan snapshot (büyük keyframe) TCP'den gider.
+- Input: her datagram henüz ACK'lenmemiş tüm komutları taşır (CMDS); server uyguladığı
+  seq'leri atar, kaybolan datagram bir sonrakiyle telafi edilir.
+"""
+from __future__ import annotations
+
+import json
+import random
+import socket
+from typing import Any, Dict, List, Optional
+
+from net.protocol import _HDR
+
+# Fragmentasyon olmadan geçmesi beklenen payload boyu (tipik MTU altı)
+MAX_DATAGRAM = 1200
+# Client: BIND tekrar aralığı / UDP'den vazgeçme süresi (sn)
+BIND_RETRY = 0.1
+BIND_TIMEOUT = 2.0
+# Client: ACK'lenmeyen input'ları yeniden gönderme aralığı (sn) ve tek datagram'daki en fazla komut
+INPUT_RESEND = 0.1
+MAX_UNACKED = 32
+
+
+def encode_datagram(payload: Dict[str, Any]) -> bytes:
+    return json.dumps(payload).encode("utf-8")
+
+
+def frame_payload(frame: bytes) -> memoryview:
+    """Length-prefixed TCP frame'inin payload'ı (aynı encode edilmiş snapshot kopyasız datagram olur)."""
+    return memoryview(frame)[_HDR.size:]
+
+
+def unpack_inputs(msg: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Datagram mesajı -> server'a iletilecek mesajlar (CMDS içindeki komutlar tek tek)."""
+    if msg.get("type") == "CMDS":
+        return list(msg.get("cmds", ()))
+    return [msg]
+
+
+class LossShim:
+    """
+    Localhost testi için UDP soket sarmalayıcısı: giden datagram'ları loss olasılığıyla
+    sessizce düşürür (gönderilmiş gibi döner). Diğer her şey alttaki sokete gider.
+    Config: NET_UDP_LOSS (0.0 = kapalı).
+    """
+
+    def __init__(self, sock: socket.socket, loss: float, seed: Optional[int] = None):
+        self.sock = sock
+        self.loss = float(loss)
+        self.dropped = 0
+        self._rng = random.Random(seed)
+
+    def _lost(self) -> bool:
+        if self._rng.random() < self.loss:
+            self.dropped += 1
+            return True
+        return False
+
+    def send(self, data) -> int:
+        return len(data) if self._lost() else self.sock.send(data)
+
+    def sendto(self, data, addr) -> int:
+        return len(data) if self._lost() else self.sock.sendto(data, addr)
+
+    def __getattr__(self, name: str):
+        return getattr(self.sock, name)
+
+
+def wrap_loss(sock: socket.socket, loss: float):
+    """loss > 0 ise soketi LossShim'le sarar."""
+    return LossShim(sock, loss) if loss > 0 else sock
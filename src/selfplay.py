@@ -0,0 +1,213 @@
+# src/selfplay.py
+"""
+Headless AI-vs-AI batch simülatörü (POWERUP_SPAWN_CHANCE, BOMB_TIMER, enemy
+stratejileri vb. ayarlamak için binlerce maç).
+
+- Display / pygame saati yok: World fixed-step tick'lerle (World.step) koşar
+- Player'ları bot politikaları sürer (model.ai.player_bots), klavyeyle aynı Command'lar
+- Maçlar multiprocessing pool ile tüm çekirdeklere dağıtılır
+- Maç başına sonuçlar kolon bazlı dosyaya yazılır (utils.columnar)
+
+Kullanım (src klasöründen):
+    python selfplay.py --matches 1000
+    python selfplay.py --matches 5000 --bots bomber random --set BOMB_TIMER=1.5 POWERUP_SPAWN_CHANCE=0.1
+"""
+from __future__ import annotations
+
+import os
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import argparse
+import ast
+import contextlib
+import multiprocessing
+import random
+import time
+from array import array
+from types import SimpleNamespace
+
+from controller.command_invoker import CommandInvoker
+from core.config import GameConfig
+from model.ai.player_bots import BomberBot, IdleBot, RandomBot
+from model.level_generator import LevelGenerator
+from model.world import World
+from utils.columnar import write_columns
+
+
+BOTS = {
+    "idle": lambda rng: IdleBot(),
+    "random": lambda rng: RandomBot(rng),
+    "bomber": lambda rng: BomberBot(rng),
+}
+
+# Maç sonucu
+OUTCOMES = ("timeout", "last_standing", "all_dead", "cleared")
+TIMEOUT, LAST_STANDING, ALL_DEAD, CLEARED = range(len(OUTCOMES))
+
+# (kolon adı, array typecode); play_match bu sırayla tuple döndürür
+COLUMNS = (
+    ("match", "I"),
+    ("seed", "I"),
+    ("ticks", "I"),
+    ("duration_s", "f"),
+    ("winner", "B"),          # tek kalan player id'si, yoksa 0
+    ("outcome", "B"),         # OUTCOMES index'i
+    ("score", "i"),
+    ("walls_destroyed", "H"),
+    ("enemies_left", "B"),
+)
+
+_DEVNULL = open(os.devnull, "w")
+
+
+def _parse_value(text: str):
+    try:
+        return ast.literal_eval(text)
+    except (ValueError, SyntaxError):
+        return text
+
+
+def parse_overrides(items: list[str]) -> dict:
+    out = {}
+    for item in items:
+        key, sep, value = item.partition("=")
+        if not sep or not key:
+            raise ValueError(f"Expected KEY=VALUE, got: {item}")
+        out[key.strip()] = _parse_value(value.strip())
+    return out
+
+
+def _init_worker(overrides: dict) -> None:
+    config = GameConfig.get_instance()
+    for key, value in overrides.items():
+        setattr(config, key, value)
+
+
+def play_match(spec: tuple[int, int, tuple[str, ...], int]) -> tuple:
+    """
+    Tek maç: (match index, seed, bot isimleri, max tick).
+    Global random (enemy AI / power-up) ve level seed'le sabitlenir, sonuç tekrarlanabilir.
+    """
+    index, seed, bot_names, max_ticks = spec
+    config = GameConfig.get_instance()
+    # World skor/power-up toplama için config.game'e bakıyor
+    config.game = SimpleNamespace(score=0)
+    random.seed(seed)
+
+    gw, gh = config.GRID_WIDTH, config.GRID_HEIGHT
+    level = LevelGenerator.from_config(config, seed=seed).generate(
+        gw, gh, World.reserved_level_cells(gw, gh))
+
+    # World / entity debug print'leri maç hızını düşürmesin
+    with contextlib.redirect_stdout(_DEVNULL):
+        world = World(config, level=level)
+        bots = {
+            pid: BOTS[name](random.Random(seed * 31 + pid))
+            for pid, name in zip(sorted(world.players), bot_names)
+        }
+        invoker = CommandInvoker()
+        walls_start = len(world.walls)
+        walls_seen = walls_start
+
+        outcome = TIMEOUT
+        while world.tick < max_ticks:
+            for pid, bot in bots.items():
+                for cmd in bot.commands(world.players[pid], world):
+                    invoker.execute(cmd)
+            world.step(1)
+
+            alive = world.alive_player_count()
+            if alive == 0:
+                outcome = ALL_DEAD
+                break
+            if alive == 1 and len(world.players) > 1:
+                outcome = LAST_STANDING
+                break
+            # Breakable sayımı sadece duvar kırıldığında
+            if len(world.walls) != walls_seen:
+                walls_seen = len(world.walls)
+                if world.breakable_wall_count() == 0:
+                    outcome = CLEARED
+                    break
+
+    alive_ids = [pid for pid, p in world.players.items() if p.alive]
+    winner = alive_ids[0] if len(alive_ids) == 1 else 0
+    return (
+        index,
+        seed,
+        world.tick,
+        world.tick / world.tick_rate,
+        winner,
+        outcome,
+        int(config.game.score),
+        walls_start - len(world.walls),
+        len(world.enemies),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Headless Bomberman self-play batch runner")
+    parser.add_argument("--matches", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="process sayısı (1 = aynı process'te)")
+    parser.add_argument("--bots", nargs="+", default=["bomber", "bomber"], choices=sorted(BOTS),
+                        help="player 1, 2, ... için bot politikası")
+    parser.add_argument("--max-seconds", type=float, default=180.0,
+                        help="maç başına simülasyon süresi sınırı")
+    parser.add_argument("--seed", type=int, default=0, help="ilk maçın seed'i (sonrakiler +1)")
+    parser.add_argument("--set", nargs="*", default=[], metavar="KEY=VALUE",
+                        help="config override, örn: BOMB_TIMER=1.5")
+    parser.add_argument("--out", default="selfplay_results.bmcol")
+    args = parser.parse_args()
+
+    overrides = parse_overrides(args.set)
+    _init_worker(overrides)
+    config = GameConfig.get_instance()
+    rate = int(getattr(config, "TICK_RATE", config.FPS))
+    max_ticks = max(1, int(args.max_seconds * rate))
+
+    bots = tuple(args.bots)
+    specs = [(i, args.seed + i, bots, max_ticks) for i in range(args.matches)]
+    columns = {name: array(code) for name, code in COLUMNS}
+
+    t0 = time.perf_counter()
+    if args.workers <= 1:
+        results = [play_match(spec) for spec in specs]
+    else:
+        chunk = max(1, args.matches // (args.workers * 8))
+        with multiprocessing.Pool(args.workers, initializer=_init_worker,
+                                  initargs=(overrides,)) as pool:
+            results = list(pool.imap_unordered(play_match, specs, chunksize=chunk))
+    elapsed = time.perf_counter() - t0
+
+    results.sort()
+    for row in results:
+        for (name, _), value in zip(COLUMNS, row):
+            columns[name].append(value)
+    write_columns(args.out, columns)
+
+    n = len(results)
+    ticks = sum(columns["ticks"])
+    print(f"matches={n} workers={args.workers} bots={'/'.join(bots)} wall={elapsed:.2f}s "
+          f"-> {n / elapsed:.1f} matches/s ({ticks / elapsed:.0f} ticks/s)")
+    if n:
+        counts = [0] * len(OUTCOMES)
+        for o in columns["outcome"]:
+            counts[o] += 1
+        print("outcomes: " + " ".join(f"{name}={c}" for name, c in zip(OUTCOMES, counts)))
+
+        wins: dict[int, int] = {}
+        for w in columns["winner"]:
+            wins[w] = wins.get(w, 0) + 1
+        print("winners: " + " ".join(
+            f"{'none' if w == 0 else f'p{w}'}={c}" for w, c in sorted(wins.items())))
+        print(f"mean: duration={sum(columns['duration_s']) / n:.1f}s "
+              f"score={sum(columns['score']) / n:.1f} "
+              f"walls_destroyed={sum(columns['walls_destroyed']) / n:.1f}")
+    print(f"results -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
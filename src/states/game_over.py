@@ -63,7 +63,9 @@ class GameOverState(GameState):
 
     def update(self, dt: float):
         # GameOver ekranında dünya güncellenmez
-        pass
+        # server: game over snapshot'ı client'lar ACK'leyene kadar yeniden gönderilir
+        if getattr(self.game, "mode", "") == "server" and getattr(self.game, "server", None):
+            self.game.server.pump()
 
     def render(self, surface: pygame.Surface):
         print("[GameOverState] render")
@@ -11,11 +11,26 @@ from controller.command_invoker import CommandInvoker
 from model.entities import ExplosionFX, WallType
 from model.enemy import Enemy
 from model.ai.move_strategies import RandomMoveStrategy
+from model.sim_clock import send_interval
+from net.snapshot import SnapshotFrames, make_snapshot
+from net.interpolation import SnapshotInterpolator
+from net.prediction import ClientPrediction
+from net.snapshot_delta import SnapshotHistory
+from net.room import apply_input
 
 if TYPE_CHECKING:
     from core.game import Game
 
 
+def _parse_wall_type(s: str) -> WallType:
+    s = (s or "").upper()
+    if "UNBREAKABLE" in s:
+        return WallType.UNBREAKABLE
+    if "HARD" in s:
+        return WallType.HARD
+    return WallType.BREAKABLE
+
+
 class PlayingState(GameState):
     def __init__(self, game: Game):
         super().__init__(game)
@@ -30,6 +45,14 @@ class PlayingState(GameState):
         self._prev_pos = {}  # pid -> (x,y)
         self._prev_enemy_pos = []  # index -> (x,y)  (snapshot sırası)
 
+        # server: delta snapshot'lar için tick geçmişi (world'e bağlı, lazy)
+        self._snapshots: SnapshotHistory | None = None
+        self._next_send_tick = 0
+        # client: snapshot'lar arası pozisyon interpolasyonu (lazy)
+        self._interp: SnapshotInterpolator | None = None
+        # client: local player prediction + reconciliation (lazy)
+        self._prediction: ClientPrediction | None = None
+
     def enter(self):
         print("[PlayingState] enter")
         self.world = self.game.world
@@ -70,30 +93,7 @@ class PlayingState(GameState):
             inputs = self.game.server.poll_inputs()
 
             for pid, msg in inputs:
-                print("[Server] got:", pid, msg)
-                if msg.get("type") != "INPUT":
-                    continue
-
-                action = msg.get("action")
-                data = msg.get("data", {})
-
-                p = self.world.players.get(pid)
-                if p is None or not getattr(p, "alive", True):
-                    continue
-
-                if action == "MOVE":
-                    p.move_dir.x = int(data.get("dx", 0))
-                    p.move_dir.y = int(data.get("dy", 0))
-
-                elif action in ("STOP_MOVE", "STOP"):
-                    axis = data.get("axis")
-                    if axis == "x":
-                        p.move_dir.x = 0
-                    elif axis == "y":
-                        p.move_dir.y = 0
-
-                elif action == "BOMB":
-                    self.world.place_bomb(p)
+                apply_input(self.world, pid, msg)
 
             # fizik sadece server'da
             self.world.update(dt)
@@ -101,13 +101,8 @@ class PlayingState(GameState):
             remaining_breakable = self.world.breakable_wall_count()
 
             if remaining_breakable == 0 and alive_players > 0:
-                snap = self._make_snapshot()
-                snap["win"] = True
-                snap["game_over"] = False
-
-                # ✅ 1 kere değil, garanti olsun diye birkaç kere gönder
-                for _ in range(5):
-                    self.game.server.broadcast({"type": "SNAPSHOT", "data": snap})
+                # Client'lar ACK'leyene kadar WinState'te pump() ile yeniden gönderilir
+                self.game.server.send_terminal(self._snapshot_frames(win=True))
 
                 from states.win import WinState
                 self.game.set_state(WinState(self.game))
@@ -116,27 +111,43 @@ class PlayingState(GameState):
             alive = self.world.alive_player_count()
 
             if alive == 0:
-                # ✅ client'lara son snapshot (game_over=True) gönder
-                snap = self._make_snapshot()
-                snap["game_over"] = True
-                self.game.server.broadcast({"type": "SNAPSHOT", "data": snap})
+                # ✅ client'lara son snapshot (game_over=True) gönder (ACK'lenene kadar)
+                self.game.server.send_terminal(self._snapshot_frames(game_over=True))
 
                 from states.game_over import GameOverState
                 self.game.set_state(GameOverState(self.game))
                 return
 
-            # snapshot her frame
-            snap = self._make_snapshot()
-            snap["game_over"] = False  # opsiyonel ama netlik iyi
-            self.game.server.broadcast({"type": "SNAPSHOT", "data": snap})
+            # snapshot simülasyon tick'inden bağımsız, NET_SEND_RATE hızında
+            if self.world.tick >= self._next_send_tick:
+                self._next_send_tick = self.world.tick + send_interval(self.world.config)
+                self.game.server.broadcast_snapshot(self._snapshot_frames())
             return
 
 
         # ---------------- CLIENT ----------------
         if mode == "client" and self.game.client is not None:
-            snap = self.game.client.get_snapshot()
-            if snap:
+            # Client simülasyon koşturmuyor: FX ömrü frame başına bir tick ilerler
+            for fx in self.world.explosions_fx:
+                fx.tick()
+
+            client = self.game.client
+            # Frame boyunca biriken key değişiklikleri tek komut olarak gider
+            if self.game.net_proxy is not None:
+                self.game.net_proxy.flush()
+
+            local_pid = self._predicted_pid()
+            sent = client.take_sent_inputs()
+            if local_pid is not None:
+                # Gönderilen input'lar local player'a hemen uygulanır (bomba server'dan gelir)
+                for msg in sent:
+                    apply_input(self.world, local_pid, msg, bombs=False)
+
+            last = None
+            for snap in client.get_snapshots():
+                last = snap
                 self._apply_snapshot(snap)
+                self._interpolator().push(int(snap.get("tick", 0)), self._snapshot_positions(snap))
 
                 if snap.get("win"):
                     from states.win import WinState
@@ -152,6 +163,21 @@ class PlayingState(GameState):
                     from states.game_over import GameOverState
                     self.game.set_state(GameOverState(self.game))
                     return
+
+            if local_pid is not None:
+                me = self.world.players.get(local_pid)
+                if me is not None:
+                    prediction = self._client_prediction()
+                    pdata = last["players"].get(str(local_pid)) if last is not None else None
+                    if pdata is not None:
+                        # Server pozisyonundan, server'ın henüz görmediği input tick'lerini yeniden oynat
+                        prediction.reconcile(
+                            self.world, me, int(pdata.get("input_seq", 0)),
+                            int(last.get("tick", 0)) - int(pdata.get("input_tick", 0)))
+                    prediction.advance(self.world, me, dt, client.input_seq)
+
+            # Snapshot'lar seyrek (NET_SEND_RATE): çizilen pozisyonlar tampondan interpolasyonla
+            self._apply_interpolated(self._interpolator().sample(dt))
             return
 
 
@@ -191,67 +217,68 @@ class PlayingState(GameState):
         surface.blit(text_surf, (bg_rect.x + padding, bg_rect.y + padding))
 
     def _make_snapshot(self) -> dict:
-        ts = self.world.config.TILE_SIZE
-
-        snap = {
-            "players": {
-                str(pid): {
-                    "x": int(p.rect.x),
-                    "y": int(p.rect.y),
-                    "alive": bool(getattr(p, "alive", True)),
-                    "hp": int(getattr(p, "hp", 0)),
-                    # blink için istersen şimdiden ekle:
-                    "invincible": bool(getattr(p, "invincible", False)),
-                    "inv_timer": float(getattr(p, "inv_timer", 0.0)),
-                }
-                for pid, p in self.world.players.items()
-            },
-            "bombs": [
-                {"x": int(b.rect.x), "y": int(b.rect.y)}
-                for b in getattr(self.world, "bombs", [])
-                if not getattr(b, "exploded", False)
-            ],
-            "enemies": [
-                {"x": int(e.rect.x), "y": int(e.rect.y),
-                "type": int(getattr(e, "enemy_type", 1))}
-                for e in getattr(self.world, "enemies", [])
-            ],
-            "walls": [
-                {
-                    "gx": int(w.rect.x // ts),
-                    "gy": int(w.rect.y // ts),
-                    "type": str(getattr(w, "wall_type", "")),
-                    "hp": int(getattr(w, "hp", 1)),
-                }
-                for w in getattr(self.world, "walls", [])
-            ],
-            "powerups": [
-                {
-                    "gx": int(pu.rect.centerx // ts),
-                    "gy": int(pu.rect.centery // ts),
-                    "kind": getattr(getattr(pu, "kind", None), "name",
-                                    str(getattr(pu, "kind", ""))),
-                }
-                for pu in getattr(self.world, "powerups", [])
-            ],
-            "score": int(getattr(self.game, "score", 0)),
-            "explosions": [
-                {"x": int(fx.rect.x), "y": int(fx.rect.y)}
-                for fx in getattr(self.world, "explosions_fx", [])
-            ],
+        return make_snapshot(self.world, int(getattr(self.game, "score", 0)))
+
+    def _snapshot_frames(self, game_over: bool = False, win: bool = False) -> SnapshotFrames:
+        # Tick'i geçmişe yaz; frame'ler client'ların codec'i + ack'lediği baseline'a göre encode edilir
+        if self._snapshots is None or self._snapshots.world is not self.world:
+            self._snapshots = SnapshotHistory(
+                self.world, int(getattr(self.world.config, "NET_SNAPSHOT_HISTORY", 64)))
+        state = self._snapshots.capture(int(getattr(self.game, "score", 0)), game_over, win)
+        return SnapshotFrames(self._snapshots, state)
+
+    def _interpolator(self) -> SnapshotInterpolator:
+        if self._interp is None:
+            config = self.world.config
+            client = self.game.client
+            self._interp = SnapshotInterpolator(
+                getattr(client, "tick_rate", None) or self.world.tick_rate,
+                float(getattr(config, "NET_INTERP_DELAY", 0.1)),
+                snap_dist=config.TILE_SIZE,
+            )
+        return self._interp
+
+    def _predicted_pid(self) -> int | None:
+        """Prediction açıksa local player id'si. Eski server (WELCOME'da tick_rate yok) input ack'lemez."""
+        client = getattr(self.game, "client", None)
+        if client is None or getattr(client, "tick_rate", None) is None:
+            return None
+        if not getattr(self.world.config, "NET_PREDICTION", True):
+            return None
+        return client.player_id
+
+    def _client_prediction(self) -> ClientPrediction:
+        if self._prediction is None:
+            self._prediction = ClientPrediction(self.game.client.tick_rate or self.world.tick_rate)
+        return self._prediction
+
+    @staticmethod
+    def _snapshot_positions(snap: dict) -> dict:
+        positions = {
+            ("p", int(pid)): (int(p["x"]), int(p["y"]))
+            for pid, p in snap.get("players", {}).items()
         }
-
-        # ✅ gameover flag (client bununla state değiştirecek)
-        snap["game_over"] = (self.world.alive_player_count() == 0)
-        snap.setdefault("game_over", False)
-        snap.setdefault("win", False)
-        return snap
-
-
-    
+        for i, e in enumerate(snap.get("enemies", [])):
+            positions[("e", i)] = (int(e["x"]), int(e["y"]))
+        return positions
+
+    def _apply_interpolated(self, positions: dict) -> None:
+        enemies = getattr(self.world, "_net_enemy_objs", [])
+        local_pid = self._predicted_pid()
+        for (kind, key), pos in positions.items():
+            if kind == "p":
+                if key == local_pid:
+                    continue  # local player tahminle çiziliyor
+                p = self.world.players.get(key)
+                if p is not None:
+                    p.rect.topleft = pos
+            elif key < len(enemies):
+                enemies[key].rect.topleft = pos
+                enemies[key]._target_px = pos
 
     def _apply_snapshot(self, snap: dict) -> None:
         ts = self.world.config.TILE_SIZE
+        local_pid = self._predicted_pid()
 
         # ---------------- PLAYERS ----------------
         for pid_str, pdata in snap.get("players", {}).items():
@@ -274,8 +301,15 @@ class PlayingState(GameState):
 
             p.invincible = bool(pdata.get("invincible", getattr(p, "invincible", False)))
             p.inv_timer = float(pdata.get("inv_timer", getattr(p, "inv_timer", 0.0)))
+            # Hız server'da (SpeedBoostState); local player'ın reconcile replay'i aynı hızla koşar
+            p.apply_speed_multiplier(float(pdata.get("speed", 1.0)))
 
 
+            # Prediction'daki local player'ın move_dir'i input'tur, anim için ezilmez
+            if pid == local_pid:
+                self._prev_pos[pid] = (new_x, new_y)
+                continue
+
             # Basit yürüyüş yönü (anim)
             if hasattr(p, "move_dir"):
                 if dx == 0 and dy == 0:
@@ -295,42 +329,43 @@ class PlayingState(GameState):
             self._prev_pos[pid] = (new_x, new_y)
 
         # ---------------- WALLS ----------------
-        def _parse_wall_type(s: str) -> WallType:
-            s = (s or "").upper()
-            if "UNBREAKABLE" in s:
-                return WallType.UNBREAKABLE
-            if "HARD" in s:
-                return WallType.HARD
-            return WallType.BREAKABLE
-
-        if not hasattr(self.world, "_net_wall_map"):
-            self.world._net_wall_map = {}  # (gx,gy) -> Wall
-
-        wall_map = self.world._net_wall_map
-        new_keys = set()
-
-        for w in snap.get("walls", []):
-            gx = int(w["gx"])
-            gy = int(w["gy"])
-            wt = _parse_wall_type(w.get("type", ""))
-
-            key = (gx, gy)
-            new_keys.add(key)
-
-            obj = wall_map.get(key)
-            if obj is None or getattr(obj, "wall_type", None) != wt:
-                obj = self.world.factory.create(
-                    "wall", x=gx, y=gy, wall_type=wt)
-                wall_map[key] = obj
-
-            if hasattr(obj, "hp"):
-                obj.hp = int(w.get("hp", getattr(obj, "hp", 1)))
-
-        for key in list(wall_map.keys()):
-            if key not in new_keys:
-                del wall_map[key]
-
-        self.world.walls = list(wall_map.values())
+        # "walls_removed" varsa snapshot duvarlarda artımlı: sadece değişen tile'lar gelir
+        world = self.world
+        walls_removed = snap.get("walls_removed")
+
+        if walls_removed is None:
+            # Tam liste (ilk snapshot / eski server): walls komple bir kez kurulur
+            walls = []
+            for w in snap.get("walls", []):
+                gx = int(w["gx"])
+                gy = int(w["gy"])
+                wt = _parse_wall_type(w.get("type", ""))
+                obj = world._get_wall_at(gx, gy)
+                if obj is None or getattr(obj, "wall_type", None) != wt:
+                    obj = world.factory.create("wall", x=gx, y=gy, wall_type=wt)
+                if hasattr(obj, "hp"):
+                    obj.hp = int(w.get("hp", getattr(obj, "hp", 1)))
+                walls.append(obj)
+            world.walls = walls
+            world.rebuild_wall_index()
+        else:
+            for gx, gy in walls_removed:
+                obj = world._get_wall_at(int(gx), int(gy))
+                if obj is not None:
+                    world._remove_wall(obj)
+
+            for w in snap.get("walls", []):
+                gx = int(w["gx"])
+                gy = int(w["gy"])
+                wt = _parse_wall_type(w.get("type", ""))
+                obj = world._get_wall_at(gx, gy)
+                if obj is not None and getattr(obj, "wall_type", None) != wt:
+                    world._remove_wall(obj)
+                    obj = None
+                if obj is None:
+                    obj = world._add_wall(gx, gy, wt)
+                if hasattr(obj, "hp"):
+                    obj.hp = int(w.get("hp", getattr(obj, "hp", 1)))
 
         # ---------------- ENEMIES (KRİTİK DÜZELTME) ----------------
         enemies_data = snap.get("enemies", [])
@@ -416,7 +451,8 @@ class PlayingState(GameState):
             key = (x, y)
             if key in self.world._net_expl_seen:
                 continue
-            self.world.explosions_fx.append(ExplosionFX(x, y, ts))
+            self.world.explosions_fx.append(
+                ExplosionFX(x, y, ts, rate=self.world.tick_rate))
             self.world._net_expl_seen.add(key)
 
         
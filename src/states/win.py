@@ -18,11 +18,6 @@ class WinState(GameState):
 
     def enter(self):
         print("[WinState] enter")
-        if getattr(self.game, "mode", "") == "server" and self.game.server:
-            snap = self.game.current_state._make_snapshot() if hasattr(self.game.current_state, "_make_snapshot") else {}
-            snap["win"] = True
-            for _ in range(10):
-                self.game.server.broadcast({"type": "SNAPSHOT", "data": snap})
 
         user_id = getattr(self.game, "current_user_id", None) or getattr(self.game, "active_user_id", None)
         score = getattr(self.game, "score", 0)
@@ -49,7 +44,9 @@ class WinState(GameState):
                 return
 
     def update(self, dt: float):
-        pass
+        # server: win snapshot'ı client'lar ACK'leyene kadar yeniden gönderilir
+        if getattr(self.game, "mode", "") == "server" and self.game.server:
+            self.game.server.pump()
 
     def render(self, surface: pygame.Surface):
         surface.fill((10, 10, 14))
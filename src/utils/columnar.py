@@ -0,0 +1,57 @@
+# src/utils/columnar.py
+"""
+Küçük, bağımlılıksız kolon bazlı dosya formatı (self-play sonuçları vb.).
+
+Düzen:
+    MAGIC | header uzunluğu (uint32 LE) | JSON header | kolon 0 byte'ları | kolon 1 ...
+Header: {"byteorder": "little", "rows": N, "columns": [{"name", "type"}, ...]}
+Her kolon tek tip bir array.array (typecode = "type"), satırlar sırayla.
+"""
+from __future__ import annotations
+
+import json
+import struct
+import sys
+from array import array
+from typing import Mapping
+
+MAGIC = b"BMCOL1\n"
+
+
+def write_columns(path: str, columns: Mapping[str, array]) -> None:
+    rows = {len(col) for col in columns.values()}
+    if len(rows) > 1:
+        raise ValueError(f"Columns have different lengths: {sorted(rows)}")
+
+    header = {
+        "byteorder": sys.byteorder,
+        "rows": rows.pop() if rows else 0,
+        "columns": [{"name": name, "type": col.typecode} for name, col in columns.items()],
+    }
+    raw = json.dumps(header, separators=(",", ":")).encode("utf-8")
+
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(raw)))
+        f.write(raw)
+        for col in columns.values():
+            col.tofile(f)
+
+
+def read_columns(path: str) -> dict[str, array]:
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"Not a columnar file: {path}")
+        (size,) = struct.unpack("<I", f.read(4))
+        header = json.loads(f.read(size).decode("utf-8"))
+
+        rows = header["rows"]
+        swap = header["byteorder"] != sys.byteorder
+        out: dict[str, array] = {}
+        for spec in header["columns"]:
+            col = array(spec["type"])
+            col.fromfile(f, rows)
+            if swap:
+                col.byteswap()
+            out[spec["name"]] = col
+    return out